@@ -0,0 +1,263 @@
+"""Suíte de benchmarks dos geradores do quantum_manifestation_engine
+
+Mede tempo de parede, tempo de CPU e pico de memória (tracemalloc) de cada
+método público de SacredGeometryGenerator, AudioFrequencyGenerator,
+VisualizationEngine, GnosticStateInducer e de process_manifestation_data,
+em vários tamanhos de imagem e durações de áudio. Sementes e relógio são
+fixos e os pantáculos vêm do caminho offline (fallback ou pacote local),
+então a suíte roda sem rede.
+
+Uso:
+    python modules/manifestation_benchmark.py --output bench.json
+    python modules/manifestation_benchmark.py --baseline baseline.json --max-regression 20
+    python modules/manifestation_benchmark.py --filter torus --baseline baseline.json --allow-missing
+
+O pico de memória cobre as alocações rastreadas pelo tracemalloc (Python e
+NumPy); buffers internos do PIL não aparecem nele.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DEFAULT_SIZES = (400, 800, 2000)
+DEFAULT_DURATIONS = (10, 60, 180)
+DEFAULT_REPEAT = 3
+DEFAULT_MAX_REGRESSION = 20.0
+# Diferenças absolutas abaixo disso são ruído de medição, não regressão
+MIN_DELTA = {'wall_s': 0.005, 'cpu_s': 0.005, 'peak_bytes': 64 * 1024}
+
+FIXED_NOW = datetime.datetime(2024, 3, 21, 12, 0, 0)
+FIXED_SEED = 1618
+SAMPLE_NAME = 'João Silva'
+SAMPLE_BIRTH_DATE = '15/08/1990'
+SAMPLE_INTENTION = 'Eu sou próspero e abundante'
+
+def _prepare_offline_pantacles(bundle_dir=None):
+    """Força o armazém padrão de pantáculos para o modo offline antes do primeiro uso"""
+    os.environ['PANTACLE_OFFLINE'] = '1'
+    if bundle_dir:
+        os.environ['PANTACLE_BUNDLE_DIR'] = bundle_dir
+    else:
+        os.environ.pop('PANTACLE_BUNDLE_DIR', None)
+    os.environ.pop('PANTACLE_CACHE_DIR', None)
+
+def _reset_seeds():
+    random.seed(FIXED_SEED)
+    try:
+        import numpy
+        numpy.random.seed(FIXED_SEED)
+    except ImportError:
+        pass
+
+def build_cases(sizes=DEFAULT_SIZES, durations=DEFAULT_DURATIONS, bundle_dir=None):
+    """Lista de (identificador, função sem argumentos) com todos os casos da suíte"""
+    import quantum_manifestation_engine as qme
+
+    engine = qme.QuantumManifestationEngine()
+    numerology = engine.calculate_advanced_numerology(SAMPLE_NAME, SAMPLE_BIRTH_DATE)
+    quantum_code = engine.generate_quantum_code(SAMPLE_INTENTION, SAMPLE_NAME, SAMPLE_BIRTH_DATE,
+                                                now=FIXED_NOW)
+    encrypted = engine.encrypt_manifestation_data({'intention': SAMPLE_INTENTION}, quantum_code)
+    pantacle_store = qme.PantacleStore(bundle_dir=bundle_dir, offline=True)
+    frequencies = qme.energy_frequencies(FIXED_NOW)
+
+    def geometry():
+        return qme.SacredGeometryGenerator(pantacle_store=pantacle_store)
+
+    cases = []
+    for size in sizes:
+        dims = (size, size)
+        for method in ('generate_flower_of_life', 'generate_merkaba', 'generate_sri_yantra',
+                       'generate_metatron_star', 'generate_torus'):
+            cases.append((f'SacredGeometryGenerator.{method}[size={size}]',
+                          lambda method=method, dims=dims: getattr(geometry(), method)(size=dims)))
+        cases.append((f'SacredGeometryGenerator.generate_pantacle[size={size}]',
+                      lambda dims=dims: geometry().generate_pantacle('abundance', size=dims)))
+        cases.append((f'VisualizationEngine.render_quantum_field_image[size={size}]',
+                      lambda size=size: qme.VisualizationEngine().render_quantum_field_image(quantum_code, size)))
+        cases.append((f'VisualizationEngine.create_quantum_field_visualization[size={size}]',
+                      lambda dims=dims: qme.VisualizationEngine().create_quantum_field_visualization(
+                          quantum_code, size=dims, output_path='quantum_field.png')))
+        cases.append((f'VisualizationEngine.render_scalar_energy_pattern[size={size}]',
+                      lambda size=size: qme.VisualizationEngine().render_scalar_energy_pattern(
+                          frequencies['scalar_pairs'], t=frequencies['timestamp'] * 0.001, resolution=size)))
+        cases.append((f'VisualizationEngine.create_energy_mandala[size={size}]',
+                      lambda dims=dims: qme.VisualizationEngine().create_energy_mandala(numerology, size=dims)))
+        cases.append((f'GnosticStateInducer.generate_visual_stimulus[size={size}]',
+                      lambda dims=dims: qme.GnosticStateInducer(qme.AudioFrequencyGenerator())
+                      .generate_visual_stimulus(size=dims)))
+    for duration in durations:
+        audio_cases = {
+            'generate_solfeggio_sequence': lambda audio, d: audio.generate_solfeggio_sequence(duration=d),
+            'generate_energy_mix': lambda audio, d: audio.generate_energy_mix(frequencies, duration=d),
+            'generate_binaural_beats': lambda audio, d: audio.generate_binaural_beats(duration=d),
+            'generate_scalar_waves': lambda audio, d: audio.generate_scalar_waves(qme.SCALAR_TESLA_PAIRS,
+                                                                                  duration=d),
+            'generate_quantum_pulse': lambda audio, d: audio.generate_quantum_pulse(quantum_code, duration=d),
+            'save_audio_wav': lambda audio, d: audio.save_audio_wav(audio.generate_binaural_beats(duration=d),
+                                                                    'benchmark.wav'),
+        }
+        for method, run in audio_cases.items():
+            cases.append((f'AudioFrequencyGenerator.{method}[duration={duration}]',
+                          lambda run=run, d=duration: run(qme.AudioFrequencyGenerator(), d)))
+        cases.append((f'GnosticStateInducer.generate_theta_state_audio[duration={duration}]',
+                      lambda d=duration: qme.GnosticStateInducer(qme.AudioFrequencyGenerator())
+                      .generate_theta_state_audio(duration=d)))
+    cases.append(('process_manifestation_data',
+                  lambda: qme.process_manifestation_data(encrypted, quantum_code)))
+    return cases
+
+def measure(func, repeat=DEFAULT_REPEAT):
+    """Pico do tracemalloc numa primeira execução e melhor tempo de parede/CPU em ``repeat`` execuções
+
+    A execução com tracemalloc (mais lenta) serve também de aquecimento:
+    imports tardios e caches de processo não entram nos tempos.
+    """
+    _reset_seeds()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        peak -= baseline
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    wall_times = []
+    cpu_times = []
+    for _ in range(repeat):
+        _reset_seeds()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func()
+        wall_times.append(time.perf_counter() - wall_start)
+        cpu_times.append(time.process_time() - cpu_start)
+    return {'wall_s': min(wall_times), 'cpu_s': min(cpu_times), 'peak_bytes': peak}
+
+def run_suite(sizes=DEFAULT_SIZES, durations=DEFAULT_DURATIONS, repeat=DEFAULT_REPEAT,
+              pattern=None, bundle_dir=None, verbose=True):
+    """Executa a suíte num diretório temporário e retorna o relatório (dict serializável em JSON)"""
+    bundle_dir = bundle_dir and os.path.abspath(bundle_dir)
+    _prepare_offline_pantacles(bundle_dir)
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    selector = re.compile(pattern) if pattern else None
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix='manifestation_benchmark_')
+    previous_dir = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        for case_id, func in build_cases(sizes, durations, bundle_dir):
+            if selector and not selector.search(case_id):
+                continue
+            # Mensagens dos geradores (ex.: fallback de pantáculo) não poluem o relatório
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[case_id] = measure(func, repeat)
+            if verbose:
+                r = results[case_id]
+                print(f"{case_id:<75} {r['wall_s'] * 1000:10.1f} ms  cpu {r['cpu_s'] * 1000:10.1f} ms  "
+                      f"pico {r['peak_bytes'] / 2**20:8.1f} MiB")
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': numpy_version,
+            'platform': platform.platform(),
+            'created': datetime.datetime.now().isoformat(),
+            'repeat': repeat,
+            'seed': FIXED_SEED,
+            'clock': FIXED_NOW.isoformat()
+        },
+        'results': results
+    }
+
+def compare_reports(current, baseline, max_regression=DEFAULT_MAX_REGRESSION,
+                    metrics=('wall_s', 'cpu_s', 'peak_bytes')):
+    """Compara dois relatórios; retorna a lista de regressões acima de ``max_regression`` %
+
+    Casos da referência ausentes no relatório atual (removidos ou
+    renomeados) entram na lista com ``metric='missing'``.
+    """
+    regressions = []
+    for case_id, base in baseline['results'].items():
+        result = current['results'].get(case_id)
+        if result is None:
+            regressions.append({'case': case_id, 'metric': 'missing', 'baseline': None,
+                                'current': None, 'change_pct': None})
+            continue
+        for metric in metrics:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None or new - old <= MIN_DELTA.get(metric, 0):
+                continue
+            change = (new - old) / old * 100
+            if change > max_regression:
+                regressions.append({'case': case_id, 'metric': metric, 'baseline': old,
+                                    'current': new, 'change_pct': round(change, 1)})
+    return regressions
+
+def _int_list(value):
+    return tuple(int(item) for item in value.split(',') if item)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks dos geradores de manifestação')
+    parser.add_argument('--output', help='Arquivo JSON para gravar os resultados')
+    parser.add_argument('--baseline', help='Relatório JSON de referência para comparação')
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+                        help='Regressão máxima tolerada em %% (padrão: %(default)s)')
+    parser.add_argument('--metrics', default='wall_s,cpu_s,peak_bytes',
+                        help='Métricas comparadas com a referência, separadas por vírgula')
+    parser.add_argument('--sizes', type=_int_list, default=DEFAULT_SIZES, help='Tamanhos de imagem em px')
+    parser.add_argument('--durations', type=_int_list, default=DEFAULT_DURATIONS, help='Durações de áudio em s')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--filter', help='Expressão regular sobre o identificador do caso')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='Casos da referência ausentes nesta execução viram aviso, não falha')
+    parser.add_argument('--pantacle-bundle', help='Diretório com pantáculos locais (senão usa o fallback)')
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.durations, args.repeat, args.filter, args.pantacle_bundle)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Resultados gravados em {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.max_regression, args.metrics.split(','))
+        missing = [item for item in regressions if item['metric'] == 'missing']
+        for item in missing:
+            print(f"{'⚠️' if args.allow_missing else '❌'} {item['case']}: ausente nesta execução")
+        if args.allow_missing:
+            regressions = [item for item in regressions if item['metric'] != 'missing']
+        for item in regressions:
+            if item['metric'] != 'missing':
+                print(f"❌ {item['case']} {item['metric']}: {item['baseline']:.4g} -> {item['current']:.4g} "
+                      f"(+{item['change_pct']}%)")
+        if regressions:
+            return 1
+        print(f"✅ Nenhuma regressão acima de {args.max_regression}%")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Intake em lote de pedidos de manifestação a partir de JSONL, retomável
+
+Cada linha do arquivo de entrada é um pedido no formato do formulário do
+site (``intent``, ``name``, ``birthDate`` e opcionais ``location``, ``mode``,
+``frequency``, ``pantacleType``, ``id``; aceita também ``intention`` e
+``birth_date``). Os pedidos passam, em fluxo, por numerologia, emissão do
+código quântico (sem repetição, via QuantumCodeMinter), criptografia e
+process_manifestation_data, e cada resultado vira uma linha do JSONL de
+saída, na ordem da entrada.
+
+A leitura é preguiçosa e no máximo ``max_in_flight`` pedidos ficam em
+processamento, então a memória não cresce com o tamanho da entrada. O
+checkpoint guarda o offset em bytes da entrada já concluída e o tamanho da
+saída correspondente: uma execução interrompida retoma do ponto em que
+parou, descartando linhas de saída gravadas depois do último checkpoint.
+Cada código emitido também vai para o checkpoint antes do processamento,
+de modo que os pedidos refeitos na retomada recebem o mesmo código (e os
+mesmos artefatos) da execução interrompida.
+
+Uso:
+    python modules/manifestation_intake.py pedidos.jsonl --output resultados.jsonl --output-dir artefatos
+    python modules/manifestation_intake.py pedidos.jsonl --output resultados.jsonl --workers 0 --limit 10
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import sys
+from collections import deque
+
+DEFAULT_CHECKPOINT_EVERY = 16
+DEFAULT_OUTPUT_DIR = 'artefatos'
+
+def _engine():
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    import quantum_manifestation_engine as qme
+    return qme
+
+def iter_lines(path, offset=0):
+    """Gera (início, fim, bytes) de cada linha não vazia a partir do offset em bytes"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        start = offset
+        for raw in f:
+            end = start + len(raw)
+            if raw.strip():
+                yield start, end, raw
+            start = end
+
+def iter_requests(lines):
+    """Decodifica as linhas em pedidos; gera (início, fim, pedido, erro)"""
+    for start, end, raw in lines:
+        try:
+            record = json.loads(raw)
+            if not isinstance(record, dict):
+                raise ValueError('a linha não é um objeto JSON')
+        except ValueError as e:
+            yield start, end, None, f'JSON inválido: {e}'
+            continue
+        yield start, end, record, None
+
+def normalize_request(record):
+    """Campos do pedido com os nomes do formulário; ValueError se faltar algum obrigatório"""
+    request = dict(record)
+    request['intent'] = record.get('intent') or record.get('intention')
+    request['name'] = record.get('name')
+    request['birthDate'] = record.get('birthDate') or record.get('birth_date')
+    missing = [field for field in ('intent', 'name', 'birthDate') if not request.get(field)]
+    if missing:
+        raise ValueError(f"Campos obrigatórios ausentes: {', '.join(missing)}")
+    request.pop('intention', None)
+    request.pop('birth_date', None)
+    return request
+
+def iter_prepared(requests, minter, checkpoint=None):
+    """Numerologia, código quântico e dados criptografados de cada pedido
+
+    Gera (início, fim, preparado, resultado); ``resultado`` só vem preenchido
+    quando o pedido falhou antes do processamento dos artefatos. Com
+    ``checkpoint`` (IntakeCheckpoint) o código de um pedido já emitido numa
+    execução anterior é reaproveitado, e os novos são gravados nele.
+    """
+    engine = minter.engine
+    for start, end, record, error in requests:
+        record_id = record and (record.get('id') or record.get('request_id'))
+        base = {'offset': start, 'id': record_id}
+        if error is not None:
+            yield start, end, None, dict(base, status='failed', error=error)
+            continue
+        try:
+            request = normalize_request(record)
+            numerology = engine.calculate_advanced_numerology(request['name'], request['birthDate'])
+            quantum_code = checkpoint and checkpoint.minted(start)
+            if not quantum_code:
+                quantum_code = minter.mint(request['intent'], request['name'], request['birthDate'])
+                if checkpoint is not None:
+                    checkpoint.record_mint(start, quantum_code)
+            payload = {key: value for key, value in request.items() if key not in ('id', 'request_id')}
+            payload['quantumCode'] = quantum_code
+            encrypted = engine.encrypt_manifestation_data(payload, quantum_code, ensure_ascii=True)
+        except Exception as e:
+            yield start, end, None, dict(base, status='failed', error=str(e))
+            continue
+        prepared = dict(base, quantum_code=quantum_code, numerology=numerology, encrypted_data=encrypted)
+        yield start, end, prepared, None
+
+def _finish(prepared, run):
+    """Executa ``run()`` para um pedido preparado e monta a linha de resultado"""
+    try:
+        result = run()
+    except Exception as e:
+        return dict(prepared, status='failed', error=str(e))
+    return dict(prepared, status='done', artifacts=result)
+
+def _process_inline(encrypted_data, quantum_code, output_dir, visual_format, build_index):
+    qme = _engine()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = qme.process_manifestation_data(encrypted_data, quantum_code, visual_format=visual_format,
+                                                sink=qme.DirectorySink(output_dir), build_index=build_index)
+    for key in ('visual_artifacts', 'audio_artifacts'):
+        result[key] = [os.path.abspath(path) for path in result[key]]
+    return result
+
+def iter_processed(prepared_items, executor=None, max_in_flight=8, output_dir=DEFAULT_OUTPUT_DIR,
+                   visual_format='png', build_index=None):
+    """Processa os artefatos com no máximo ``max_in_flight`` pedidos pendentes; gera (início, fim, resultado) em ordem
+
+    Sem ``executor`` o processamento é feito no próprio processo.
+    """
+    pending = deque()
+    for start, end, prepared, failed in prepared_items:
+        if failed is not None:
+            pending.append((start, end, None, failed))
+        elif executor is None:
+            pending.append((start, end, None, _finish(prepared, lambda: _process_inline(
+                prepared['encrypted_data'], prepared['quantum_code'], output_dir, visual_format, build_index))))
+        else:
+            future = executor.submit(_run_job, prepared['encrypted_data'], prepared['quantum_code'], visual_format)
+            pending.append((start, end, (prepared, future), None))
+        while pending and (len(pending) >= max_in_flight or pending[0][2] is None):
+            yield _settle(pending.popleft())
+    while pending:
+        yield _settle(pending.popleft())
+
+def _settle(item):
+    start, end, submitted, result = item
+    if submitted is not None:
+        prepared, future = submitted
+        result = _finish(prepared, future.result)
+    return start, end, result
+
+def _run_job(encrypted_data, quantum_code, visual_format='png'):
+    from manifestation_server import _run_job as run_job
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_job(encrypted_data, quantum_code, visual_format)
+
+class IntakeCheckpoint:
+    """Progresso da intake: offset de entrada concluído e tamanho da saída correspondente
+
+    ``minted`` guarda os códigos já emitidos para pedidos além do offset
+    (offset da linha -> código). Gravado de forma atômica (arquivo
+    temporário + os.replace).
+    """
+    def __init__(self, path):
+        self.path = path
+        self.state = {'offset': 0, 'output_size': 0, 'done': 0, 'failed': 0, 'minted': {}}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.state.update(json.load(f))
+
+    def minted(self, offset):
+        """Código já emitido para o pedido que começa em ``offset`` (None se não houver)"""
+        return self.state['minted'].get(str(offset))
+
+    def record_mint(self, offset, quantum_code):
+        """Grava o código do pedido antes do processamento, para que a retomada o reaproveite"""
+        self.state['minted'][str(offset)] = quantum_code
+        self.save()
+
+    def save(self, **state):
+        self.state.update(state, updated=datetime.datetime.now().isoformat())
+        # Pedidos antes do offset concluído não serão refeitos
+        self.state['minted'] = {key: code for key, code in self.state['minted'].items()
+                                if int(key) >= self.state['offset']}
+        if not self.path:
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+def run_intake(input_path, output_path, checkpoint_path=None, output_dir=DEFAULT_OUTPUT_DIR, max_workers=None,
+               max_in_flight=None, checkpoint_every=DEFAULT_CHECKPOINT_EVERY, visual_format='png',
+               code_index=None, build_index=None, clock=None, limit=None, verbose=True):
+    """Consome ``input_path`` a partir do checkpoint e acrescenta os resultados a ``output_path``
+
+    ``max_workers=0`` processa no próprio processo. ``code_index`` (arquivo
+    de CodeIndex) e ``build_index`` (arquivo de BuildIndex) tornam os
+    códigos únicos e os artefatos incrementais entre execuções. Retorna o
+    estado final do checkpoint.
+    """
+    qme = _engine()
+    checkpoint_path = checkpoint_path or f'{output_path}.checkpoint'
+    checkpoint = IntakeCheckpoint(checkpoint_path)
+    offset = checkpoint.state['offset']
+    if offset > os.path.getsize(input_path):
+        raise ValueError(f"Checkpoint em {offset} bytes, além do fim de {input_path}")
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    minter = qme.QuantumCodeMinter(clock=clock, index=qme.CodeIndex(code_index))
+    done, failed = checkpoint.state['done'], checkpoint.state['failed']
+    with contextlib.ExitStack() as stack:
+        output = stack.enter_context(open(output_path, 'ab'))
+        # Linhas gravadas depois do último checkpoint serão refeitas
+        output.truncate(checkpoint.state['output_size'])
+        executor = None
+        index = None
+        if max_workers == 0:
+            if build_index:
+                index = stack.enter_context(qme.BuildIndex(build_index))
+        else:
+            import manifestation_server
+            from concurrent.futures import ProcessPoolExecutor
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=max_workers, initializer=manifestation_server._init_worker,
+                initargs=(output_dir, build_index and os.path.abspath(build_index))))
+        limit_in_flight = max_in_flight or 2 * (max_workers or os.cpu_count() or 1)
+        lines = iter_lines(input_path, offset)
+        if limit is not None:
+            import itertools
+            lines = itertools.islice(lines, limit)
+        results = iter_processed(iter_prepared(iter_requests(lines), minter, checkpoint), executor, limit_in_flight,
+                                 output_dir, visual_format, index)
+        since_checkpoint = 0
+        for start, end, result in results:
+            output.write(json.dumps(result, ensure_ascii=False).encode() + b'\n')
+            if result['status'] == 'done':
+                done += 1
+            else:
+                failed += 1
+            if verbose:
+                mark = '✅' if result['status'] == 'done' else '❌'
+                print(f"{mark} byte {start}: {result.get('quantum_code') or result.get('error')}")
+            offset = end
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.save(offset=offset, output_size=output.tell(), done=done, failed=failed)
+                since_checkpoint = 0
+        output.flush()
+        os.fsync(output.fileno())
+        checkpoint.save(offset=offset, output_size=output.tell(), done=done, failed=failed)
+    return checkpoint.state
+
+def _parse_now(value):
+    if not value:
+        return None
+    now = datetime.datetime.fromisoformat(value)
+    return lambda: now
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Intake retomável de pedidos de manifestação em JSONL')
+    parser.add_argument('input', help='JSONL com um pedido por linha')
+    parser.add_argument('--output', required=True, help='JSONL de resultados (acrescentado)')
+    parser.add_argument('--checkpoint', help='Arquivo de checkpoint (padrão: <output>.checkpoint)')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help='Diretório dos artefatos')
+    parser.add_argument('--workers', type=int, help='Processos do pool (0 processa no próprio processo)')
+    parser.add_argument('--max-in-flight', type=int, help='Pedidos pendentes no máximo (padrão: 2 x workers)')
+    parser.add_argument('--checkpoint-every', type=int, default=DEFAULT_CHECKPOINT_EVERY)
+    parser.add_argument('--format', choices=('png', 'svg'), default='png')
+    parser.add_argument('--code-index', help='Log de códigos já emitidos (evita repetição entre execuções)')
+    parser.add_argument('--build-index', help='Índice SQLite para pular artefatos já gerados')
+    parser.add_argument('--now', help='Data/hora ISO 8601 fixa para a emissão dos códigos')
+    parser.add_argument('--limit', type=int, help='Processa no máximo N pedidos nesta execução')
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    state = run_intake(args.input, args.output, args.checkpoint, args.output_dir, args.workers,
+                       args.max_in_flight, args.checkpoint_every, args.format, args.code_index,
+                       args.build_index, _parse_now(args.now), args.limit, not args.quiet)
+    print(f"📋 {state['done']} concluído(s), {state['failed']} com falha; offset {state['offset']}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,467 @@
+"""Servidor local de jobs de manifestação (asyncio)
+
+Recebe jobs por HTTP (TCP ou socket Unix), enfileira com backpressure e os
+executa num pool de processos que mantém o motor importado e os caches
+(geometria, tabelas do banco de osciladores) aquecidos entre jobs.
+
+API (JSON):
+    POST /jobs               {"quantum_code": "...", "encrypted_data": "...", "visual_format": "png"|"svg"} -> 202
+                             (503 + Retry-After com a fila cheia ou em drenagem)
+    GET  /jobs/<código>      estado atual do job
+    GET  /jobs/<código>/events  eventos de estado em NDJSON, em streaming até o fim do job
+    GET  /health             tamanho da fila, jobs em execução, drenagem
+    POST /drain              para de aceitar jobs e encerra após concluir a fila
+
+Jobs são deduplicados pelo código quântico: reenviar um código em fila, em
+execução ou concluído devolve o job existente. Jobs concluídos ficam nessa
+janela de deduplicação por ``--finished-ttl`` segundos (padrão: 1 h), e no
+máximo ``--max-finished`` deles são mantidos (os mais antigos saem
+primeiro); depois disso o código pode ser executado de novo.
+
+Uso:
+    python modules/manifestation_server.py --port 8765 --concurrency 2 --output-dir saida
+    python modules/manifestation_server.py --unix /tmp/manifestation.sock
+    python modules/manifestation_server.py --fake-feed 6   # teste local com issues simuladas
+    python modules/manifestation_server.py --build-index saida/.manifestation_build.sqlite  # incremental
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import re
+import signal
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_FINISHED_TTL = 3600
+# Formato emitido pelo QuantumCodeMinter; o código vira nome de arquivo e rota
+QUANTUM_CODE_PATTERN = re.compile(r'[0-9]{4}-[0-9]{4}-[0-9]{4}')
+DEFAULT_MAX_FINISHED = 1024
+TERMINAL_STATUSES = ('done', 'failed')
+HTTP_REASONS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 503: 'Service Unavailable'}
+
+# Estado de cada processo do pool, criado uma vez no inicializador
+_worker_geometry = None
+_worker_build_index = None
+
+def _init_worker(output_dir, build_index_path=None):
+    """Inicializa um processo do pool: diretório de saída, motor importado e caches quentes"""
+    global _worker_geometry, _worker_build_index
+    os.chdir(output_dir)
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    import quantum_manifestation_engine as qme
+    _worker_geometry = qme.SacredGeometryGenerator(cache=qme.ArtifactCache())
+    if build_index_path:
+        _worker_build_index = qme.BuildIndex(build_index_path)
+    # Síntese curta para preencher as tabelas de fasores do banco compartilhado
+    audio = qme.AudioFrequencyGenerator()
+    qme.GnosticStateInducer(audio).generate_theta_state_audio(duration=1, stereo=True)
+    audio.generate_scalar_waves(qme.SCALAR_TESLA_PAIRS, duration=1)
+
+def _run_job(encrypted_data, quantum_code, visual_format='png'):
+    """Executa o pipeline num processo do pool e devolve o resumo com caminhos absolutos"""
+    import quantum_manifestation_engine as qme
+    result = qme.process_manifestation_data(encrypted_data, quantum_code, geometry=_worker_geometry,
+                                            visual_format=visual_format, build_index=_worker_build_index)
+    for key in ('visual_artifacts', 'audio_artifacts'):
+        result[key] = [os.path.abspath(path) for path in result[key]]
+    return result
+
+def job_from_issue(issue):
+    """Extrai (código quântico, dados criptografados) do corpo de uma issue de manifestação"""
+    body = issue.get('body') or ''
+    code_match = re.search(r'\*\*Código Quântico:\*\*\s*`([\d-]+)`', body)
+    data_match = re.search(r'## Dados Criptografados\s*```\s*\n(.*?)\n\s*```', body, re.S)
+    if not code_match or not data_match:
+        raise ValueError(f"Issue #{issue.get('number')} sem código quântico ou dados criptografados")
+    return {'quantum_code': code_match.group(1), 'encrypted_data': data_match.group(1).strip(),
+            'issue': issue.get('number')}
+
+class ManifestationJob:
+    """Job de manifestação com histórico de eventos para o streaming de estado"""
+    def __init__(self, quantum_code, encrypted_data, issue=None, visual_format='png'):
+        self.quantum_code = quantum_code
+        self.encrypted_data = encrypted_data
+        self.issue = issue
+        self.visual_format = visual_format
+        self.status = None
+        self.result = None
+        self.error = None
+        self.events = []
+        self.changed = asyncio.Condition()
+
+    async def set_status(self, status, **details):
+        self.status = status
+        event = {'job': self.quantum_code, 'status': status,
+                 'time': datetime.datetime.now().isoformat(), **details}
+        async with self.changed:
+            self.events.append(event)
+            self.changed.notify_all()
+
+    def snapshot(self):
+        return {'job': self.quantum_code, 'status': self.status, 'issue': self.issue,
+                'result': self.result, 'error': self.error}
+
+class ManifestationJobServer:
+    """Fila com backpressure + pool de processos aquecido + API HTTP mínima"""
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, queue_size=DEFAULT_QUEUE_SIZE, output_dir='.',
+                 build_index=None, finished_ttl=DEFAULT_FINISHED_TTL, max_finished=DEFAULT_MAX_FINISHED):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.output_dir = os.path.abspath(output_dir)
+        self.build_index = build_index and os.path.abspath(build_index)
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self.jobs = {}
+        # Código -> instante de conclusão, do mais antigo para o mais recente
+        self._finished = OrderedDict()
+        self.running = 0
+        self.draining = False
+        self._queue = None
+        self._executor = None
+        self._workers = []
+        self._servers = []
+        self._drained = None
+
+    async def start(self, host=None, port=None, unix_path=None):
+        """Inicia pool, despachantes e o listener (TCP e/ou socket Unix)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._drained = asyncio.Event()
+        self._executor = ProcessPoolExecutor(max_workers=self.concurrency, initializer=_init_worker,
+                                             initargs=(self.output_dir, self.build_index))
+        # Cria os processos já no início para que o aquecimento não atrase o primeiro job
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, os.getpid)
+                               for _ in range(self.concurrency)))
+        self._workers = [asyncio.create_task(self._dispatch()) for _ in range(self.concurrency)]
+        if port is not None:
+            self._servers.append(await asyncio.start_server(self._handle_connection, host or '127.0.0.1', port))
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            self._servers.append(await asyncio.start_unix_server(self._handle_connection, unix_path))
+        return self
+
+    @property
+    def addresses(self):
+        return [sock.getsockname() for server in self._servers for sock in server.sockets]
+
+    def submit(self, quantum_code, encrypted_data, issue=None, visual_format='png'):
+        """Enfileira um job; retorna (job, deduplicado). Levanta asyncio.QueueFull com a fila cheia"""
+        if self.draining:
+            raise asyncio.QueueFull('servidor em drenagem')
+        self._evict_finished()
+        existing = self.jobs.get(quantum_code)
+        if existing is not None and existing.status != 'failed':
+            return existing, True
+        job = ManifestationJob(quantum_code, encrypted_data, issue, visual_format)
+        self._queue.put_nowait(job)
+        self.jobs[quantum_code] = job
+        self._finished.pop(quantum_code, None)
+        job.status = 'queued'
+        job.events.append({'job': quantum_code, 'status': 'queued',
+                           'time': datetime.datetime.now().isoformat()})
+        return job, False
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+            try:
+                await job.set_status('running')
+                job.result = await loop.run_in_executor(self._executor, _run_job, job.encrypted_data,
+                                                        job.quantum_code, job.visual_format)
+                await job.set_status('done', artifacts=job.result['visual_artifacts'] + job.result['audio_artifacts'])
+            except Exception as e:
+                job.error = f'{type(e).__name__}: {e}'
+                await job.set_status('failed', error=job.error)
+            finally:
+                self.running -= 1
+                self._finished[job.quantum_code] = time.monotonic()
+                self._finished.move_to_end(job.quantum_code)
+                self._evict_finished()
+                self._queue.task_done()
+
+    def _evict_finished(self):
+        """Esquece jobs concluídos fora da janela de deduplicação (idade ou quantidade)"""
+        deadline = time.monotonic() - self.finished_ttl
+        while self._finished:
+            code, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_finished and finished_at > deadline:
+                break
+            del self._finished[code]
+            job = self.jobs.get(code)
+            if job is not None and job.status in TERMINAL_STATUSES:
+                del self.jobs[code]
+
+    async def drain(self):
+        """Para de aceitar jobs, conclui a fila e os jobs em execução e encerra o pool"""
+        if self.draining:
+            await self._drained.wait()
+            return
+        self.draining = True
+        print(f"🌙 Drenando: {self._queue.qsize()} job(s) na fila, {self.running} em execução")
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._executor.shutdown(wait=True)
+        self._drained.set()
+
+    async def wait_drained(self):
+        await self._drained.wait()
+
+    def health(self):
+        return {'queued': self._queue.qsize(), 'running': self.running, 'draining': self.draining,
+                'jobs': len(self.jobs), 'concurrency': self.concurrency, 'queue_size': self.queue_size}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            if not request_line:
+                return
+            method, path, _ = request_line.split(' ', 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0) or 0))
+            await self._route(method, path, body, writer)
+        except (ValueError, json.JSONDecodeError) as e:
+            await _respond(writer, 400, {'error': str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body, writer):
+        parts = [part for part in path.split('?', 1)[0].split('/') if part]
+        if parts == ['health'] and method == 'GET':
+            await _respond(writer, 200, self.health())
+        elif parts == ['drain'] and method == 'POST':
+            asyncio.get_running_loop().create_task(self.drain())
+            await _respond(writer, 202, {'draining': True})
+        elif parts == ['jobs'] and method == 'POST':
+            payload = json.loads(body or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError('o corpo deve ser um objeto JSON')
+            if not isinstance(payload.get('quantum_code'), str) or not isinstance(payload.get('encrypted_data'), str):
+                raise ValueError('quantum_code e encrypted_data são obrigatórios')
+            if not QUANTUM_CODE_PATTERN.fullmatch(payload['quantum_code']):
+                raise ValueError('quantum_code deve ter o formato 0000-0000-0000')
+            if payload.get('visual_format', 'png') not in ('png', 'svg'):
+                raise ValueError("visual_format deve ser 'png' ou 'svg'")
+            try:
+                job, deduplicated = self.submit(payload['quantum_code'], payload['encrypted_data'],
+                                                payload.get('issue'), payload.get('visual_format', 'png'))
+            except asyncio.QueueFull as e:
+                await _respond(writer, 503, {'error': str(e) or 'fila cheia'}, {'Retry-After': '1'})
+                return
+            await _respond(writer, 202, {**job.snapshot(), 'deduplicated': deduplicated})
+        elif len(parts) in (2, 3) and parts[0] == 'jobs' and method == 'GET':
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await _respond(writer, 404, {'error': f'job {parts[1]} desconhecido'})
+            elif len(parts) == 2:
+                await _respond(writer, 200, job.snapshot())
+            elif parts[2] == 'events':
+                await self._stream_events(job, writer)
+            else:
+                await _respond(writer, 404, {'error': path})
+        else:
+            await _respond(writer, 404 if method in ('GET', 'POST') else 405, {'error': path})
+
+    async def _stream_events(self, job, writer):
+        """Envia os eventos do job em NDJSON (chunked) até o estado terminal"""
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n'
+                     b'Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n')
+        sent = 0
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.events) > sent)
+                pending = job.events[sent:]
+            for event in pending:
+                chunk = (json.dumps(event, ensure_ascii=False) + '\n').encode()
+                writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            sent += len(pending)
+            await writer.drain()
+            if pending[-1]['status'] in TERMINAL_STATUSES:
+                break
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+async def _respond(writer, status, payload, extra_headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    headers = [f'HTTP/1.1 {status} {HTTP_REASONS.get(status, "")}', 'Content-Type: application/json',
+               f'Content-Length: {len(body)}', 'Connection: close']
+    headers += [f'{key}: {value}' for key, value in (extra_headers or {}).items()]
+    writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode() + body)
+    await writer.drain()
+
+class ManifestationClient:
+    """Cliente HTTP mínimo (asyncio) para o servidor, por TCP ou socket Unix"""
+    def __init__(self, host='127.0.0.1', port=None, unix_path=None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+
+    async def _open(self):
+        if self.unix_path:
+            return await asyncio.open_unix_connection(self.unix_path)
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _request(self, method, path, payload=None):
+        reader, writer = await self._open()
+        body = json.dumps(payload).encode() if payload is not None else b''
+        writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            key, _, value = line.partition(':')
+            headers[key.strip().lower()] = value.strip()
+        return status, headers, reader, writer
+
+    async def call(self, method, path, payload=None):
+        status, _, reader, writer = await self._request(method, path, payload)
+        data = await reader.read()
+        writer.close()
+        return status, json.loads(data or b'null')
+
+    async def submit(self, job, max_wait=60.0):
+        """Envia um job, respeitando o Retry-After enquanto a fila estiver cheia"""
+        waited = 0.0
+        while True:
+            status, headers, reader, writer = await self._request('POST', '/jobs', job)
+            data = json.loads(await reader.read() or b'null')
+            writer.close()
+            if status != 503 or waited >= max_wait or data.get('error') == 'servidor em drenagem':
+                return status, data
+            delay = float(headers.get('retry-after', 1))
+            await asyncio.sleep(delay)
+            waited += delay
+
+    async def events(self, quantum_code):
+        """Itera sobre os eventos de estado do job até o fim"""
+        status, headers, reader, writer = await self._request('GET', f'/jobs/{quantum_code}/events')
+        try:
+            if status != 200:
+                raise RuntimeError(f'job {quantum_code}: HTTP {status}')
+            while True:
+                size = int((await reader.readline()).strip(), 16)
+                if size == 0:
+                    break
+                chunk = await reader.readexactly(size + 2)
+                yield json.loads(chunk[:-2])
+        finally:
+            writer.close()
+
+class FakeIssueFeed:
+    """Gera issues no formato criado pelo index.html, para testes locais sem a API do GitHub
+
+    A cada ``duplicate_every`` issues uma delas repete um código anterior,
+    exercitando a deduplicação do servidor.
+    """
+    def __init__(self, count=6, duplicate_every=3, seed_time=datetime.datetime(2024, 3, 21, 12, 0, 0)):
+        self.count = count
+        self.duplicate_every = duplicate_every
+        self.seed_time = seed_time
+
+    def issues(self):
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+        if module_dir not in sys.path:
+            sys.path.insert(0, module_dir)
+        import quantum_manifestation_engine as qme
+        engine = qme.QuantumManifestationEngine()
+        minter = qme.QuantumCodeMinter(engine, clock=lambda: self.seed_time)
+        previous = None
+        for number in range(1, self.count + 1):
+            if previous and self.duplicate_every and number % self.duplicate_every == 0:
+                quantum_code, encrypted = previous
+            else:
+                data = {'intent': f'Intenção simulada {number}', 'name': f'Pessoa {number}',
+                        'birthDate': '1990-08-15'}
+                quantum_code = minter.mint(data['intent'], data['name'], data['birthDate'])
+                encrypted = engine.encrypt_manifestation_data(data, quantum_code)
+                previous = (quantum_code, encrypted)
+            body = (f"# 🌌 Registro de Manifestação Quântica\n**Código Quântico:** `{quantum_code}`\n"
+                    f"**Status:** Ativo\n## Dados Criptografados\n```\n{encrypted}\n```\n")
+            yield {'number': number, 'title': f'Manifestação Quântica: {quantum_code}', 'body': body,
+                   'labels': [{'name': 'manifestacao-ativa'}]}
+
+async def feed_issues(client, issues):
+    """Envia as issues ao servidor e acompanha os eventos de cada job até o fim"""
+    async def follow(job):
+        status, data = await client.submit(job)
+        print(f"📨 Issue #{job['issue']} -> {job['quantum_code']}: HTTP {status}"
+              f"{' (deduplicado)' if data.get('deduplicated') else ''}")
+        if status != 202:
+            return data
+        last = None
+        async for event in client.events(job['quantum_code']):
+            last = event
+        return last
+    return await asyncio.gather(*(follow(job_from_issue(issue)) for issue in issues))
+
+async def _serve(args):
+    server = await ManifestationJobServer(args.concurrency, args.queue_size, args.output_dir,
+                                          args.build_index, args.finished_ttl,
+                                          args.max_finished).start(args.host, args.port, args.unix)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: loop.create_task(server.drain()))
+    print(f"🌌 Servidor de manifestação ouvindo em {server.addresses} "
+          f"(concorrência {args.concurrency}, fila {args.queue_size})")
+    if args.fake_feed:
+        client = ManifestationClient(args.host, server.addresses[0][1] if args.port is not None else None,
+                                     args.unix)
+        results = await feed_issues(client, FakeIssueFeed(args.fake_feed).issues())
+        for event in results:
+            print(f"✨ {event['job']}: {event['status']}")
+        await server.drain()
+    await server.wait_drained()
+    print("✅ Servidor encerrado")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor local de jobs de manifestação')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='Porta TCP (0 escolhe uma livre)')
+    parser.add_argument('--unix', help='Caminho do socket Unix')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--build-index', help='Índice SQLite para pular artefatos já gerados com as mesmas entradas')
+    parser.add_argument('--finished-ttl', type=float, default=DEFAULT_FINISHED_TTL,
+                        help='Segundos em que um job concluído continua deduplicando o seu código')
+    parser.add_argument('--max-finished', type=int, default=DEFAULT_MAX_FINISHED,
+                        help='Jobs concluídos mantidos no máximo (os mais antigos saem primeiro)')
+    parser.add_argument('--fake-feed', type=int, default=0, metavar='N',
+                        help='Envia N issues simuladas, espera os jobs e encerra')
+    args = parser.parse_args(argv)
+    if args.port is None and not args.unix:
+        args.port = 0 if args.fake_feed else 8765
+    asyncio.run(_serve(args))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
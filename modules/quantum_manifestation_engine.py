@@ -3,21 +3,285 @@
 Sistema Avançado de Tecnomagia Quântica
 Módulos Python para processamento de manifestações
 """
-import numpy as np
-import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import json
 import hashlib
 import datetime
+import functools
+import importlib
+import inspect
+import itertools
 import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import unicodedata
 import wave
 import struct
-from scipy import signal
-import requests
 import base64
+import codecs
 import re  # <!-- NOVO: Import para regex -->
-import cairosvg  # <!-- NOVO: Import para SVG -->
 from io import BytesIO
+from collections import OrderedDict
+
+class MissingDependencyError(ImportError):
+    """Dependência opcional ausente para o recurso solicitado"""
+
+class _LazyModule:
+    """Importa um módulo pesado apenas no primeiro uso
+
+    Na primeira leitura de atributo o módulo real é importado e substitui o
+    proxy no namespace deste arquivo, de modo que os acessos seguintes não
+    têm custo extra.
+    """
+    def __init__(self, alias, module_name, package, feature):
+        self._alias = alias
+        self._module_name = module_name
+        self._package = package
+        self._feature = feature
+
+    def _load(self):
+        try:
+            module = importlib.import_module(self._module_name)
+        except (ImportError, OSError) as e:
+            # OSError: pacote instalado mas sem a biblioteca nativa (ex.: libcairo)
+            raise MissingDependencyError(
+                f"{self._feature} requer o pacote opcional '{self._package}' "
+                f"(pip install {self._package}): {e}"
+            ) from e
+        globals()[self._alias] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+# Dependências carregadas sob demanda: numerologia e códigos quânticos não as usam
+np = _LazyModule('np', 'numpy', 'numpy', 'A síntese de áudio e imagens')
+plt = _LazyModule('plt', 'matplotlib.pyplot', 'matplotlib', "O backend 'matplotlib' da visualização")
+Image = _LazyModule('Image', 'PIL.Image', 'pillow', 'A geração de imagens')
+ImageDraw = _LazyModule('ImageDraw', 'PIL.ImageDraw', 'pillow', 'A geração de imagens')
+ImageFont = _LazyModule('ImageFont', 'PIL.ImageFont', 'pillow', 'A geração de imagens')
+requests = _LazyModule('requests', 'requests', 'requests', 'O download de pantáculos')
+cairosvg = _LazyModule('cairosvg', 'cairosvg', 'cairosvg', 'A rasterização de pantáculos SVG')
+
+IMPORT_BUDGET_MS = 50
+
+def measure_import_time(module_name='quantum_manifestation_engine', python=None):
+    """Mede com ``python -X importtime`` o custo de importar o módulo num interpretador limpo
+
+    Uma primeira importação aquece o cache de bytecode, de modo que a medida
+    reflete o custo de um worker já implantado e não a compilação do fonte.
+    Retorna o tempo cumulativo em ms e os módulos com maior custo próprio.
+    """
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [module_dir, env.get('PYTHONPATH')]))
+    command = [python or sys.executable, '-X', 'importtime', '-c', f'import {module_name}']
+    subprocess.run(command, capture_output=True, env=env, check=True)
+    completed = subprocess.run(command, capture_output=True, text=True, env=env, check=True)
+    total_us = None
+    entries = []
+    subtree = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len('import time:'):].split('|')
+        name = raw_name.strip()
+        # Os filhos aparecem antes do pai; uma linha sem recuo fecha a subárvore
+        if len(raw_name) - len(raw_name.lstrip()) > 1:
+            subtree.append((name, int(self_us)))
+            continue
+        if name == module_name:
+            total_us = int(cumulative_us)
+            entries = subtree + [(name, int(self_us))]
+            break
+        subtree = []
+    if total_us is None:
+        raise RuntimeError(f"Módulo {module_name} não apareceu na saída de -X importtime")
+    heaviest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:10]
+    return {
+        'module': module_name,
+        'total_ms': total_us / 1000,
+        'heaviest': [{'module': name, 'self_ms': self_us / 1000} for name, self_us in heaviest]
+    }
+
+def check_import_budget(budget_ms=IMPORT_BUDGET_MS, module_name='quantum_manifestation_engine', attempts=1):
+    """Falha (RuntimeError) se o import puro do módulo exceder o orçamento em ms
+
+    Mede até ``attempts`` vezes e fica com a medida mais rápida: ruído da
+    máquina só aumenta o tempo, então uma única medida dentro do orçamento
+    basta.
+    """
+    report = None
+    for _ in range(max(1, attempts)):
+        measured = measure_import_time(module_name)
+        if report is None or measured['total_ms'] < report['total_ms']:
+            report = measured
+        if report['total_ms'] <= budget_ms:
+            break
+    report['budget_ms'] = budget_ms
+    if report['total_ms'] > budget_ms:
+        offenders = ', '.join(f"{entry['module']} ({entry['self_ms']:.1f} ms)" for entry in report['heaviest'][:5])
+        raise RuntimeError(
+            f"Import de {module_name} levou {report['total_ms']:.1f} ms "
+            f"(orçamento: {budget_ms} ms). Maiores custos: {offenders}"
+        )
+    return report
+
+PANTACLE_URLS = {
+    'abundance': 'https://upload.wikimedia.org/wikipedia/commons/4/48/Seal_of_Jupiter.svg',
+    'love': 'https://upload.wikimedia.org/wikipedia/commons/5/5c/Seal_of_Venus.svg',
+    'protection': 'https://upload.wikimedia.org/wikipedia/commons/3/3d/Seal_of_Saturn.svg',
+    'wisdom': 'https://upload.wikimedia.org/wikipedia/commons/0/0f/Seal_of_Mercury.svg',
+    'healing': 'https://upload.wikimedia.org/wikipedia/commons/1/1f/Seal_of_the_Sun.svg',
+    'power': 'https://upload.wikimedia.org/wikipedia/commons/6/6d/Seal_of_Mars.svg'
+}
+
+NUMEROLOGY_LETTER_VALUES = {
+    'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6, 'g': 7, 'h': 8, 'i': 9,
+    'j': 1, 'k': 2, 'l': 3, 'm': 4, 'n': 5, 'o': 6, 'p': 7, 'q': 8, 'r': 9,
+    's': 1, 't': 2, 'u': 3, 'v': 4, 'w': 5, 'x': 6, 'y': 7, 'z': 8
+}
+
+def _value_table(letters):
+    """Tabela para bytes.translate: cada letra (maiúscula ou minúscula) vira o byte do seu valor, o resto vira 0"""
+    table = bytearray(256)
+    for c in letters:
+        table[ord(c)] = table[ord(c.upper())] = NUMEROLOGY_LETTER_VALUES[c]
+    return bytes(table)
+
+_NAME_VALUE_TABLE = _value_table(NUMEROLOGY_LETTER_VALUES)
+_SOUL_VALUE_TABLE = _value_table('aeiou')
+
+def _letter_values(normalized_name, table):
+    """Bytes com o valor de cada caractere; não-ASCII vira '?' e portanto 0"""
+    return normalized_name.encode('ascii', 'replace').translate(table)
+
+def _normalize_name(name):
+    """Decompõe acentos (João -> Joa + til + o) para que as letras base sejam contadas
+
+    Maiúsculas, espaços e marcas combinantes não precisam ser removidos: as
+    tabelas de tradução dão valor às letras a-z/A-Z e zero ao restante.
+    """
+    if name.isascii():
+        return name
+    return unicodedata.normalize('NFKD', name)
+
+def _birth_date_value(birth_date):
+    """Soma dia + mês + ano de 'dd/mm/aaaa' ou, fora desse formato, dos códigos dos caracteres"""
+    try:
+        day, month, year = map(int, birth_date.split('/'))
+        return day + month + year
+    except:
+        return sum(ord(c) for c in birth_date)
+
+def _reduce_number(n):
+    """Raiz digital (1-9) em forma fechada; 0 vira 9"""
+    return 9 if n == 0 else 1 + (n - 1) % 9
+
+def _digital_root(values):
+    """Versão vetorizada de _reduce_number"""
+    return np.where(values == 0, 9, 1 + (values - 1) % 9)
+
+@functools.lru_cache(maxsize=4096)
+def _cipher_shift(quantum_code):
+    """Deslocamento da cifra derivado dos dígitos do código quântico"""
+    key_sum = sum(ord(c) for c in quantum_code if c.isdigit())
+    return key_sum % 26
+
+class _CipherTable(dict):
+    """Tabela de str.translate para a cifra: cada letra é deslocada como no algoritmo original
+
+    Letras fora de A-Z/a-z (ex.: acentuadas) seguem a mesma fórmula e são
+    calculadas e memorizadas no primeiro uso.
+    """
+    def __init__(self, shift):
+        super().__init__()
+        self.shift = shift
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char.isalpha():
+            ascii_offset = 65 if char.isupper() else 97
+            mapped = chr((codepoint - ascii_offset + self.shift) % 26 + ascii_offset)
+        else:
+            mapped = char
+        self[codepoint] = mapped
+        return mapped
+
+@functools.lru_cache(maxsize=26)
+def _cipher_table(shift):
+    return _CipherTable(shift)
+
+@functools.lru_cache(maxsize=26)
+def _decipher_table(shift):
+    lower = 'abcdefghijklmnopqrstuvwxyz'
+    upper = lower.upper()
+    return str.maketrans(lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift], lower + upper)
+
+def iter_encrypt_text(text_chunks, quantum_code, chunk_size=65536):
+    """Cifra um fluxo de pedaços de JSON e gera o base64 correspondente em pedaços
+
+    O base64 é emitido em múltiplos de 3 bytes, de modo que a concatenação é
+    idêntica à codificação do texto inteiro.
+    """
+    table = _cipher_table(_cipher_shift(quantum_code))
+    pending = bytearray()
+    for text in text_chunks:
+        pending += text.translate(table).encode()
+        if len(pending) >= chunk_size:
+            ready = len(pending) - len(pending) % 3
+            yield base64.b64encode(pending[:ready]).decode()
+            del pending[:ready]
+    if pending:
+        yield base64.b64encode(pending).decode()
+
+def iter_decrypt_text(encrypted_chunks, quantum_code):
+    """Decifra um fluxo de pedaços base64 e gera pedaços do JSON original"""
+    table = _decipher_table(_cipher_shift(quantum_code))
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = ''
+    for chunk in encrypted_chunks:
+        pending += ''.join(chunk.split())
+        ready = len(pending) - len(pending) % 4
+        if ready:
+            text = decoder.decode(base64.b64decode(pending[:ready]))
+            pending = pending[ready:]
+            if text:
+                yield text.translate(table)
+    text = decoder.decode(base64.b64decode(pending) if pending else b'', final=True)
+    if text:
+        yield text.translate(table)
+
+@functools.lru_cache(maxsize=366)
+def _lunar_phase_for_day(year, month, day):
+    """Fase lunar em graus para um dia do calendário (memorizada: muda só uma vez por dia)"""
+    r = year % 100
+    r %= 19
+    if r > 9:
+        r -= 19
+    r = ((r * 11) % 30) + month + day
+    if month < 3:
+        r += 2
+    phase = (r + 8) % 30
+    phase_degrees = (phase / 30.0) * 360
+    if phase_degrees < 0:
+        phase_degrees += 360
+    return phase_degrees
+
+def _quantum_code_from(data_string, lunar_phase):
+    """Código XXXX-XXXX-XXXX a partir do hash dos dados modulado pela fase lunar"""
+    hash_object = hashlib.sha256(data_string.encode())
+    hex_dig = hash_object.hexdigest()
+    base_number = int(hex_dig[:12], 16)
+    modulated_number = (base_number + int(lunar_phase * 1000)) % (10**12)
+    code_str = f"{modulated_number:012d}"
+    return f"{code_str[:4]}-{code_str[4:8]}-{code_str[8:12]}"
 
 class QuantumManifestationEngine:
     """Motor principal de processamento quântico"""
@@ -29,91 +293,123 @@ class QuantumManifestationEngine:
         self.phi = 1.618033988749895  # Golden ratio
         self.tesla_numbers = [3, 6, 9]
         # <!-- NOVO: URLs dos Pantáculos centralizadas -->
-        self.pantacle_urls = {
-            'abundance': 'https://upload.wikimedia.org/wikipedia/commons/4/48/Seal_of_Jupiter.svg',
-            'love': 'https://upload.wikimedia.org/wikipedia/commons/5/5c/Seal_of_Venus.svg',
-            'protection': 'https://upload.wikimedia.org/wikipedia/commons/3/3d/Seal_of_Saturn.svg',
-            'wisdom': 'https://upload.wikimedia.org/wikipedia/commons/0/0f/Seal_of_Mercury.svg',
-            'healing': 'https://upload.wikimedia.org/wikipedia/commons/1/1f/Seal_of_the_Sun.svg',
-            'power': 'https://upload.wikimedia.org/wikipedia/commons/6/6d/Seal_of_Mars.svg'
-        }
+        self.pantacle_urls = dict(PANTACLE_URLS)
 
     def calculate_advanced_numerology(self, name, birth_date):
         """Calcula numerologia avançada com sistema cabalístico"""
-        letter_values = {
-            'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6, 'g': 7, 'h': 8, 'i': 9,
-            'j': 1, 'k': 2, 'l': 3, 'm': 4, 'n': 5, 'o': 6, 'p': 7, 'q': 8, 'r': 9,
-            's': 1, 't': 2, 'u': 3, 'v': 4, 'w': 5, 'x': 6, 'y': 7, 'z': 8
-        }
-        name_clean = ''.join(c.lower() for c in name if c.isalpha())
-        name_value = sum(letter_values.get(c, 0) for c in name_clean)
-        vowels = [c for c in name_clean if c in 'aeiou']
-        consonants = [c for c in name_clean if c not in 'aeiou' and c.isalpha()]
-        soul_number = sum(letter_values.get(v, 0) for v in vowels)
-        personality_number = sum(letter_values.get(c, 0) for c in consonants)
-        def reduce_number(n):
-            while n > 9:
-                n = sum(int(digit) for digit in str(n))
-            return n if n != 0 else 9
-        try:
-            day, month, year = map(int, birth_date.split('/'))
-            date_value = day + month + year
-        except:
-            date_value = sum(ord(c) for c in birth_date)
+        name_clean = _normalize_name(name)
+        name_value = sum(_letter_values(name_clean, _NAME_VALUE_TABLE))
+        soul_number = sum(_letter_values(name_clean, _SOUL_VALUE_TABLE))
+        personality_number = name_value - soul_number
+        date_value = _birth_date_value(birth_date)
         destiny_raw = (name_value * date_value) % 108
-        destiny_number = reduce_number(destiny_raw)
+        destiny_number = _reduce_number(destiny_raw)
         return {
             'destiny_number': destiny_number,
-            'soul_number': reduce_number(soul_number),
-            'personality_number': reduce_number(personality_number),
-            'expression_number': reduce_number(soul_number + personality_number),
+            'soul_number': _reduce_number(soul_number),
+            'personality_number': _reduce_number(personality_number),
+            'expression_number': _reduce_number(soul_number + personality_number),
+            'name_value': name_value,
+            'date_value': date_value,
+            'raw_destiny': destiny_raw
+        }
+
+    def calculate_numerology_bulk(self, rows):
+        """Numerologia em lote para linhas (nome, data de nascimento)
+
+        Retorna um dict de arrays int64 com as mesmas chaves e valores de
+        ``calculate_advanced_numerology`` para cada linha. Os nomes são
+        normalizados uma única vez, concatenados e convertidos em dígitos por
+        tabelas de tradução; as somas por nome saem de uma soma acumulada.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        names = [name if name.isascii() else _normalize_name(name) for name, _ in rows]
+        # Datas se repetem muito numa base de clientes: cada formato é analisado uma vez
+        parsed_dates = {}
+        date_values = []
+        for _, birth_date in rows:
+            value = parsed_dates.get(birth_date)
+            if value is None:
+                value = parsed_dates[birth_date] = _birth_date_value(birth_date)
+            date_values.append(value)
+        lengths = np.fromiter((len(name) for name in names), dtype=np.int64, count=len(names))
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        joined = ''.join(names)
+        def row_sums(table):
+            digits = np.frombuffer(_letter_values(joined, table), dtype=np.uint8)
+            cumulative = np.zeros(len(digits) + 1, dtype=np.int64)
+            np.cumsum(digits, out=cumulative[1:])
+            return cumulative[ends] - cumulative[starts]
+        name_value = row_sums(_NAME_VALUE_TABLE)
+        soul_number = row_sums(_SOUL_VALUE_TABLE)
+        personality_number = name_value - soul_number
+        date_value = np.array(date_values, dtype=np.int64)
+        destiny_raw = (name_value * date_value) % 108
+        return {
+            'destiny_number': _digital_root(destiny_raw),
+            'soul_number': _digital_root(soul_number),
+            'personality_number': _digital_root(personality_number),
+            'expression_number': _digital_root(soul_number + personality_number),
             'name_value': name_value,
             'date_value': date_value,
             'raw_destiny': destiny_raw
         }
 
-    def generate_quantum_code(self, intention, name, birth_date):
+    def generate_quantum_code(self, intention, name, birth_date, now=None):
         """Gera código quântico único baseado nos dados"""
-        data_string = f"{intention}{name}{birth_date}{datetime.datetime.now().isoformat()}"
-        hash_object = hashlib.sha256(data_string.encode())
-        hex_dig = hash_object.hexdigest()
-        base_number = int(hex_dig[:12], 16)
-        lunar_phase = self.calculate_lunar_phase()
-        modulated_number = (base_number + int(lunar_phase * 1000)) % (10**12)
-        code_str = f"{modulated_number:012d}"
-        return f"{code_str[:4]}-{code_str[4:8]}-{code_str[8:12]}"
-
-    def calculate_lunar_phase(self):
+        now = now or datetime.datetime.now()
+        data_string = f"{intention}{name}{birth_date}{now.isoformat()}"
+        return _quantum_code_from(data_string, self.calculate_lunar_phase(now))
+
+    def calculate_lunar_phase(self, now=None):
         """Calcula a fase lunar atual com precisão"""
-        now = datetime.datetime.now()
-        year, month, day = now.year, now.month, now.day
-        r = year % 100
-        r %= 19
-        if r > 9:
-            r -= 19
-        r = ((r * 11) % 30) + month + day
-        if month < 3:
-            r += 2
-        phase = (r + 8) % 30
-        phase_degrees = (phase / 30.0) * 360
-        if phase_degrees < 0:
-            phase_degrees += 360
-        return phase_degrees
-
-    def encrypt_manifestation_data(self, data, quantum_code):
-        """Criptografia simples para os dados de manifestação"""
-        data_json = json.dumps(data, ensure_ascii=False)
-        key_sum = sum(ord(c) for c in quantum_code if c.isdigit())
-        shift = key_sum % 26
-        encrypted = ""
-        for char in data_json:
-            if char.isalpha():
-                ascii_offset = 65 if char.isupper() else 97
-                encrypted += chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
-            else:
-                encrypted += char
+        now = now or datetime.datetime.now()
+        return _lunar_phase_for_day(now.year, now.month, now.day)
+
+    def encrypt_manifestation_data(self, data, quantum_code, ensure_ascii=False):
+        """Criptografia simples para os dados de manifestação
+
+        Com ``ensure_ascii=True`` os caracteres não-ASCII viram escapes ``\\uXXXX``
+        antes da cifra, o que torna a decifragem exata para qualquer texto.
+        """
+        data_json = json.dumps(data, ensure_ascii=ensure_ascii)
+        encrypted = data_json.translate(_cipher_table(_cipher_shift(quantum_code)))
         return base64.b64encode(encrypted.encode()).decode()
 
+    def decrypt_manifestation_data(self, encrypted_data, quantum_code):
+        """Inverso de encrypt_manifestation_data
+
+        Exato quando as letras do JSON cifrado eram ASCII (sempre, com
+        ``ensure_ascii=True``); letras acentuadas cifradas no modo padrão não
+        são recuperáveis.
+        """
+        data_json = base64.b64decode(encrypted_data).decode()
+        return json.loads(data_json.translate(_decipher_table(_cipher_shift(quantum_code))))
+
+    def iter_encrypt_manifestation_data(self, data, quantum_code, ensure_ascii=False, chunk_size=65536):
+        """Versão em fluxo de encrypt_manifestation_data: gera pedaços de texto base64
+
+        O JSON é serializado incrementalmente (``JSONEncoder.iterencode``) e a
+        concatenação dos pedaços é idêntica ao resultado de uma só vez.
+        """
+        text_chunks = json.JSONEncoder(ensure_ascii=ensure_ascii).iterencode(data)
+        return iter_encrypt_text(text_chunks, quantum_code, chunk_size)
+
+    def iter_decrypt_manifestation_data(self, encrypted_chunks, quantum_code):
+        """Versão em fluxo da decifragem: recebe pedaços base64 e gera pedaços do JSON original"""
+        return iter_decrypt_text(encrypted_chunks, quantum_code)
+
+    def encrypt_manifestation_batch(self, records, ensure_ascii=False):
+        """Cifra vários pares (dados, código quântico), reaproveitando chaves e tabelas por código"""
+        return [self.encrypt_manifestation_data(data, quantum_code, ensure_ascii)
+                for data, quantum_code in records]
+
+    def decrypt_manifestation_batch(self, records):
+        """Decifra vários pares (dados cifrados, código quântico)"""
+        return [self.decrypt_manifestation_data(encrypted_data, quantum_code)
+                for encrypted_data, quantum_code in records]
+
     # <!-- NOVO: Método para gerar Sigilo Austin Osman Spare (CORRIGIDO) -->
     def generate_austin_spare_sigil(self, intent):
         """Gera um sigilo usando o método de Austin Osman Spare"""
@@ -130,15 +426,838 @@ class QuantumManifestationEngine:
         }
     # <!-- FIM NOVO -->
 
+class CodeIndex:
+    """Índice exato de códigos emitidos (conjunto de inteiros), opcionalmente persistido em disco
+
+    O arquivo é um log de um código por linha, carregado na criação e
+    acrescido a cada ``flush``.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self._codes = set()
+        self._unflushed = []
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._codes.update(int(line) for line in f if line.strip())
+
+    @staticmethod
+    def _as_int(code):
+        return int(code.replace('-', ''))
+
+    def __contains__(self, code):
+        return self._as_int(code) in self._codes
+
+    def __len__(self):
+        return len(self._codes)
+
+    def add(self, code):
+        value = self._as_int(code)
+        self._codes.add(value)
+        if self.path:
+            self._unflushed.append(value)
+
+    def flush(self):
+        """Grava no log os códigos adicionados desde o último flush"""
+        if self.path and self._unflushed:
+            with open(self.path, 'a') as f:
+                f.write(''.join(f'{value:012d}\n' for value in self._unflushed))
+            self._unflushed = []
+
+class BloomCodeIndex:
+    """Índice probabilístico (filtro de Bloom) para bases muito grandes de códigos
+
+    Falsos positivos apenas provocam uma nova emissão; nunca há falso negativo.
+    Persistido como arquivo binário (cabeçalho com m e k seguido dos bits).
+    """
+    def __init__(self, capacity=1_000_000, error_rate=0.001, path=None):
+        self.path = path
+        self.bit_count = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.bit_count, self.hash_count, self.count = struct.unpack('<QII', f.read(16))
+                self._bits = bytearray(f.read())
+
+    def _positions(self, code):
+        digest = hashlib.blake2b(code.replace('-', '').encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
+
+    def __contains__(self, code):
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(code))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, code):
+        for p in self._positions(code):
+            self._bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def flush(self):
+        """Grava o filtro inteiro de forma atômica"""
+        if self.path:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(struct.pack('<QII', self.bit_count, self.hash_count, self.count))
+                f.write(self._bits)
+            os.replace(tmp_path, self.path)
+
+class QuantumCodeMinter:
+    """Emite códigos quânticos em lote, sem repetição, com relógio injetável
+
+    O relógio é lido uma vez por lote e a fase lunar vem do cache diário;
+    com um relógio fixo a sequência emitida é reprodutível. Uma colisão no
+    índice é resolvida re-emitindo o código com um contador de tentativa
+    acrescentado aos dados.
+    """
+    def __init__(self, engine=None, clock=None, index=None, max_attempts=64):
+        self.engine = engine or QuantumManifestationEngine()
+        self.clock = clock or datetime.datetime.now
+        self.index = CodeIndex() if index is None else index
+        self.max_attempts = max_attempts
+        self.collisions = 0
+
+    def mint(self, intention, name, birth_date):
+        """Emite um único código"""
+        return self.mint_batch([(intention, name, birth_date)])[0]
+
+    def mint_batch(self, items):
+        """Emite um código para cada (intenção, nome, data de nascimento)
+
+        Os códigos já emitidos são gravados no índice mesmo que o lote falhe
+        no meio.
+        """
+        now = self.clock()
+        timestamp = now.isoformat()
+        lunar_phase = self.engine.calculate_lunar_phase(now)
+        codes = []
+        try:
+            for intention, name, birth_date in items:
+                data_string = f"{intention}{name}{birth_date}{timestamp}"
+                code = _quantum_code_from(data_string, lunar_phase)
+                attempt = 0
+                while code in self.index:
+                    attempt += 1
+                    self.collisions += 1
+                    if attempt > self.max_attempts:
+                        raise RuntimeError(f"Não foi possível emitir um código único para {name!r}")
+                    code = _quantum_code_from(f"{data_string}#{attempt}", lunar_phase)
+                self.index.add(code)
+                codes.append(code)
+        finally:
+            self.index.flush()
+        return codes
+
+class _NullStage:
+    """Etapa sem instrumentação: todos os registros são descartados"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def record_bytes(self, count):
+        pass
+
+    def record_file(self, path):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class NullTracer:
+    """Tracer padrão: não mede nada e não aloca nada por etapa"""
+    enabled = False
+
+    def stage(self, name, **attrs):
+        return _NULL_STAGE
+
+    def run(self, name, **attrs):
+        return _NULL_STAGE
+
+    def close(self):
+        pass
+
+class JsonLinesExporter:
+    """Grava cada registro de etapa como uma linha JSON (arquivo aberto em modo append)"""
+    def __init__(self, target):
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self._file = open(target, 'a', encoding='utf-8') if self._owns_file else target
+        self._lock = threading.Lock()
+
+    def export(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+class _TracedStage:
+    """Etapa medida: duração, CPU, bytes gravados e pico de alocação (tracemalloc)"""
+    def __init__(self, tracer, name, attrs, profile=False, run_id=None):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.profile = profile
+        self.run_id = run_id
+        self.bytes_written = 0
+        self.record = None
+        self._max_peak = 0
+
+    def record_bytes(self, count):
+        self.bytes_written += count
+
+    def record_file(self, path):
+        try:
+            self.bytes_written += os.path.getsize(path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.parent = stack[-1] if stack else None
+        if self.run_id is None and self.parent is not None:
+            # A execução pertence ao escopo (pilha da thread), não ao tracer compartilhado
+            self.run_id = self.parent.run_id
+        if self.tracer.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                # O pico do pai até aqui é preservado antes de reiniciar a medição
+                self.parent._max_peak = max(self.parent._max_peak, peak)
+            tracemalloc.reset_peak()
+            self._base_memory = current
+        stack.append(self)
+        self._profiler = None
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started_at = datetime.datetime.now().isoformat()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter() - self._wall_start
+        cpu_time = time.process_time() - self._cpu_start
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.tracer._stack().pop()
+        peak_bytes = None
+        if self.tracer.track_memory:
+            self._max_peak = max(self._max_peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = max(0, self._max_peak - self._base_memory)
+            if self.parent is not None:
+                self.parent._max_peak = max(self.parent._max_peak, self._max_peak)
+        self.record = {
+            'run': self.run_id,
+            'stage': self.name,
+            'parent': self.parent.name if self.parent is not None else None,
+            'started_at': self._started_at,
+            'duration_s': duration,
+            'cpu_s': cpu_time,
+            'bytes_written': self.bytes_written,
+            'peak_bytes': peak_bytes,
+            'error': exc_type.__name__ if exc_type else None
+        }
+        if self.attrs:
+            self.record['attrs'] = self.attrs
+        if self._profiler is not None:
+            self.record['profile'] = self.tracer._dump_profile(self._profiler, self.run_id)
+        if self.parent is not None:
+            self.parent.bytes_written += self.bytes_written
+        self.tracer._emit(self.record)
+        return False
+
+class StageTracer:
+    """Tracer que mede cada etapa e entrega os registros ao exportador
+
+    ``run`` delimita uma execução completa (ex.: um process_manifestation_data)
+    e ``stage`` as etapas internas, que podem ser aninhadas. Com
+    ``profile=True`` cada execução também é capturada com cProfile e gravada
+    em ``profile_dir/<run>.prof``. Sem exportador, os registros ficam em
+    ``records``. O identificador da execução vive no escopo do ``run`` (a
+    pilha de etapas de cada thread), então execuções simultâneas em threads
+    diferentes com o mesmo tracer não se misturam.
+    """
+    enabled = True
+
+    def __init__(self, exporter=None, track_memory=True, profile=False, profile_dir='.'):
+        self.exporter = exporter
+        self.track_memory = track_memory
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.records = []
+        self._local = threading.local()
+        self._run_counter = itertools.count(1)
+        self._started_tracemalloc = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _emit(self, record):
+        if self.exporter is not None:
+            self.exporter.export(record)
+        else:
+            self.records.append(record)
+
+    def _dump_profile(self, profiler, run_id):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f'{run_id}.prof')
+        profiler.dump_stats(path)
+        return path
+
+    def stage(self, name, **attrs):
+        return _TracedStage(self, name, attrs)
+
+    def run(self, name, **attrs):
+        run_id = f"{name}-{datetime.datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{next(self._run_counter)}"
+        return _TracedStage(self, name, attrs, profile=self.profile, run_id=run_id)
+
+    def close(self):
+        if self.exporter is not None:
+            self.exporter.close()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+_tracer = NullTracer()
+
+def get_tracer():
+    """Tracer ativo no processo (NullTracer por padrão)"""
+    return _tracer
+
+def set_tracer(tracer):
+    """Instala um tracer para o processo; ``None`` volta ao NullTracer. Retorna o anterior"""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer if tracer is not None else NullTracer()
+    return previous
+
+def _traced(method):
+    """Mede o método como uma etapa do tracer ativo (sem custo com o NullTracer)"""
+    stage_name = method.__qualname__
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not _tracer.enabled:
+            return method(*args, **kwargs)
+        with _tracer.stage(stage_name):
+            return method(*args, **kwargs)
+    return wrapper
+
+class ImagePostProcessor:
+    """Estágio de pós-processamento vetorizado (NumPy) para imagens RGBA
+
+    Os passos são encadeados e aplicados sobre um único array (H, W, 4),
+    sem objetos Python por pixel::
+
+        post = ImagePostProcessor().threshold_key(200, feather=20).tint((255, 215, 0), 0.3)
+        img = post(img)
+    """
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+
+    def threshold_key(self, threshold=200, feather=0, replace=(255, 255, 255)):
+        """Torna transparentes os pixels com todos os canais RGB acima do limiar"""
+        self.steps.append(functools.partial(threshold_key_array, threshold=threshold,
+                                            feather=feather, replace=replace))
+        return self
+
+    def chroma_key(self, color, tolerance=40, feather=0, replace=None):
+        """Torna transparentes os pixels próximos de uma cor-chave"""
+        self.steps.append(functools.partial(chroma_key_array, color=color, tolerance=tolerance,
+                                            feather=feather, replace=replace))
+        return self
+
+    def tint(self, color, strength=0.5):
+        """Mistura o RGB com uma cor, preservando o alfa"""
+        self.steps.append(functools.partial(tint_array, color=color, strength=strength))
+        return self
+
+    def apply_array(self, arr):
+        """Aplica os passos in-place sobre um array RGBA uint8"""
+        for step in self.steps:
+            step(arr)
+        return arr
+
+    def __call__(self, img):
+        if not self.steps:
+            return img
+        arr = np.array(img.convert('RGBA'))
+        return Image.fromarray(self.apply_array(arr), 'RGBA')
+
+def _feathered_alpha(arr, distance, cutoff, feather):
+    """Multiplica o alfa por uma rampa linear de ``cutoff`` até ``cutoff + feather``"""
+    alpha = arr[..., 3]
+    if feather <= 0:
+        alpha[distance <= cutoff] = 0
+        return
+    ramp = distance.astype(np.float32)
+    ramp -= cutoff
+    ramp /= feather
+    np.clip(ramp, 0.0, 1.0, out=ramp)
+    ramp *= alpha
+    np.rint(ramp, out=ramp)
+    alpha[...] = ramp
+
+def threshold_key_array(arr, threshold=200, feather=0, replace=(255, 255, 255)):
+    """Keying por limiar: pixels com min(R, G, B) > threshold ficam transparentes"""
+    darkest = np.minimum(arr[..., 0], arr[..., 1])
+    np.minimum(darkest, arr[..., 2], out=darkest)
+    # Distância ao limiar: 0 para pixels keyed, crescendo conforme escurecem
+    distance = threshold - darkest.astype(np.int16)
+    keyed = distance < 0
+    _feathered_alpha(arr, distance, -1, feather)
+    if replace is not None:
+        arr[keyed, :3] = replace
+    return arr
+
+def chroma_key_array(arr, color, tolerance=40, feather=0, replace=None):
+    """Keying por cor: distância de Chebyshev em RGB até ``color`` abaixo da tolerância"""
+    distance = np.zeros(arr.shape[:2], dtype=np.int16)
+    for channel in range(3):
+        diff = np.abs(arr[..., channel].astype(np.int16) - color[channel])
+        np.maximum(distance, diff, out=distance)
+    keyed = distance <= tolerance
+    _feathered_alpha(arr, distance, tolerance, feather)
+    if replace is not None:
+        arr[keyed, :3] = replace
+    return arr
+
+def tint_array(arr, color, strength=0.5):
+    """Mistura linear do RGB com ``color`` na proporção ``strength``"""
+    rgb = arr[..., :3].astype(np.float32)
+    rgb *= 1.0 - strength
+    rgb += np.asarray(color, dtype=np.float32) * strength
+    np.rint(rgb, out=rgb)
+    arr[..., :3] = rgb
+    return arr
+
+def composite_layers(layers, opacities=None):
+    """Compõe várias camadas RGBA de mesmo tamanho (operador "over"), da base ao topo"""
+    layers = list(layers)
+    if not layers:
+        raise ValueError("Nenhuma camada para compor")
+    size = layers[0].size
+    if any(layer.size != size for layer in layers):
+        raise ValueError("Todas as camadas devem ter o mesmo tamanho")
+    opacities = opacities or [1.0] * len(layers)
+    # Acumula em RGB pré-multiplicado para evitar divisões por camada
+    out_rgb = np.zeros((size[1], size[0], 3), dtype=np.float32)
+    out_alpha = np.zeros((size[1], size[0], 1), dtype=np.float32)
+    for layer, opacity in zip(layers, opacities):
+        src = np.asarray(layer.convert('RGBA'), dtype=np.float32) / 255.0
+        src_alpha = src[..., 3:4] * opacity
+        inverse = 1.0 - src_alpha
+        out_rgb *= inverse
+        out_rgb += src[..., :3] * src_alpha
+        out_alpha *= inverse
+        out_alpha += src_alpha
+    np.divide(out_rgb, out_alpha, out=out_rgb, where=out_alpha > 0)
+    result = np.empty((size[1], size[0], 4), dtype=np.uint8)
+    result[..., :3] = np.rint(np.clip(out_rgb, 0.0, 1.0) * 255)
+    result[..., 3:] = np.rint(out_alpha * 255)
+    return Image.fromarray(result, 'RGBA')
+
+def _post_processed(method):
+    """Aplica o ImagePostProcessor opcional da instância ao resultado do gerador"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        img = method(self, *args, **kwargs)
+        if self.post_processor is not None:
+            img = self.post_processor(img)
+        return img
+    return wrapper
+
+class ArtifactCache:
+    """Cache LRU de artefatos de imagem limitado por bytes, com camada opcional em disco
+
+    As chaves são tuplas ``(método, parâmetros)``; no disco cada artefato é
+    gravado como PNG com o nome igual ao SHA-256 da chave e da impressão
+    digital do motor (ver engine_fingerprint), de modo que o diretório
+    sobrevive a reinícios e pode ser compartilhado entre workers, mas uma
+    mudança no código de desenho nunca serve imagens antigas.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None, fingerprint=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.fingerprint = fingerprint or (engine_fingerprint() if disk_dir else None)
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(method_name, params):
+        """Monta uma chave estável a partir do método e dos parâmetros"""
+        normalized = tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in params.items()
+        ))
+        return (method_name, normalized)
+
+    @staticmethod
+    def _image_bytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(repr((self.fingerprint, key)).encode()).hexdigest()
+        return os.path.join(self.disk_dir, f'{digest}.png')
+
+    def _store(self, key, img):
+        size = self._image_bytes(img)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._image_bytes(self._entries.pop(key))
+            self._entries[key] = img
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= self._image_bytes(evicted)
+                self.evictions += 1
+
+    def get(self, key):
+        """Retorna uma cópia do artefato em cache ou None"""
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img.copy()
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                try:
+                    with Image.open(path) as stored:
+                        img = stored.copy()
+                except OSError as e:
+                    print(f"⚠️ Artefato em cache corrompido {path}: {e}")
+                else:
+                    self._store(key, img)
+                    with self._lock:
+                        self.hits += 1
+                        self.disk_hits += 1
+                    return img.copy()
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, img):
+        """Armazena o artefato na memória e, se configurado, no disco"""
+        self._store(key, img.copy())
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if not os.path.exists(path):
+                fd, tmp_path = tempfile.mkstemp(suffix='.png', dir=self.disk_dir)
+                with os.fdopen(fd, 'wb') as tmp_file:
+                    img.save(tmp_file, format='PNG')
+                os.replace(tmp_path, path)
+
+    def get_or_create(self, key, factory):
+        """Retorna o artefato em cache ou gera, armazena e retorna um novo"""
+        img = self.get(key)
+        if img is None:
+            img = factory()
+            self.put(key, img)
+        return img
+
+    def clear(self):
+        """Esvazia a camada em memória (o diretório em disco é preservado)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Contadores de uso do cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+def _cached_artifact(method):
+    """Decora um gerador puro para consultar o ArtifactCache da instância"""
+    signature = inspect.signature(method)
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None:
+            return method(self, *args, **kwargs)
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        params.pop('self')
+        key = ArtifactCache.make_key(method.__name__, params)
+        return self.cache.get_or_create(key, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+class PantacleStore:
+    """Armazém local dos pantáculos: baixa, persiste e rasteriza cada fonte uma única vez
+
+    Layout de ``cache_dir`` (e de ``bundle_dir``, que usa o mesmo formato):
+    ``<nome>.svg`` ou ``<nome>.png`` com a fonte original e
+    ``<nome>_<largura>x<altura>.png`` com o raster já redimensionado.
+    Em modo ``offline`` nada é baixado: as fontes vêm apenas do
+    ``bundle_dir`` e do ``cache_dir``.
+    """
+    USER_AGENT = 'tecnomagia-servidor-do-caos/2.0 (pantacle store)'
+
+    def __init__(self, cache_dir=None, urls=None, bundle_dir=None, offline=False,
+                 timeout=10, pool_size=6):
+        self.urls = dict(PANTACLE_URLS if urls is None else urls)
+        self.cache_dir = cache_dir
+        self.bundle_dir = bundle_dir
+        self.offline = offline
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session = None
+        self._sources = {}
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_session(self):
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size,
+                                                        pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers['User-Agent'] = self.USER_AGENT
+                self._session = session
+            return self._session
+
+    def _search_dirs(self):
+        return [d for d in (self.bundle_dir, self.cache_dir) if d]
+
+    def _find_local(self, filename):
+        for directory in self._search_dirs():
+            path = os.path.join(directory, filename)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _write_atomic(self, path, payload):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(payload)
+        os.replace(tmp_path, path)
+
+    def _fetch(self, name):
+        url = self.urls[name]
+        response = self._get_session().get(url, timeout=self.timeout)
+        response.raise_for_status()
+        is_svg = url.endswith('.svg') or 'svg' in response.headers.get('Content-Type', '').lower()
+        kind = 'svg' if is_svg else 'png'
+        if self.cache_dir:
+            self._write_atomic(os.path.join(self.cache_dir, f'{name}.{kind}'), response.content)
+        return response.content, kind
+
+    @_traced
+    def load_source(self, name):
+        """Retorna (bytes, tipo) da fonte do pantáculo, baixando apenas se necessário"""
+        with self._lock:
+            if name in self._sources:
+                return self._sources[name]
+        source = None
+        for kind in ('svg', 'png'):
+            path = self._find_local(f'{name}.{kind}')
+            if path:
+                with open(path, 'rb') as f:
+                    source = (f.read(), kind)
+                break
+        if source is None:
+            if self.offline:
+                raise FileNotFoundError(f"Pantáculo {name} ausente do pacote offline")
+            if name not in self.urls:
+                raise KeyError(f"Tipo de pantáculo desconhecido: {name}")
+            source = self._fetch(name)
+        with self._lock:
+            self._sources[name] = source
+        return source
+
+    def prefetch(self, names=None):
+        """Baixa em paralelo todas as fontes ainda ausentes; retorna {nome: sucesso}"""
+        names = list(self.urls if names is None else names)
+        def fetch_one(name):
+            try:
+                self.load_source(name)
+                return True
+            except Exception as e:
+                print(f"⚠️ Falha ao pré-carregar pantáculo {name}: {e}")
+                return False
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, min(self.pool_size, len(names) or 1))) as executor:
+            return dict(zip(names, executor.map(fetch_one, names)))
+
+    @_traced
+    def get_image(self, name, size=(800, 800)):
+        """Retorna o pantáculo rasterizado em RGBA no tamanho pedido"""
+        raster_name = f'{name}_{size[0]}x{size[1]}.png'
+        path = self._find_local(raster_name)
+        if path:
+            with Image.open(path) as stored:
+                return stored.convert('RGBA')
+        content, kind = self.load_source(name)
+        if kind == 'svg':
+            png_bytes = cairosvg.svg2png(bytestring=content)
+            img = Image.open(BytesIO(png_bytes)).convert('RGBA')
+        else:
+            img = Image.open(BytesIO(content)).convert('RGBA')
+        img = img.resize(tuple(size), Image.LANCZOS)
+        if self.cache_dir:
+            buffer = BytesIO()
+            img.save(buffer, format='PNG')
+            self._write_atomic(os.path.join(self.cache_dir, raster_name), buffer.getvalue())
+        return img
+
+_default_pantacle_store = None
+
+def get_default_pantacle_store():
+    """Armazém de pantáculos compartilhado pelo processo (PANTACLE_CACHE_DIR / PANTACLE_BUNDLE_DIR)"""
+    global _default_pantacle_store
+    if _default_pantacle_store is None:
+        bundle_dir = os.environ.get('PANTACLE_BUNDLE_DIR')
+        _default_pantacle_store = PantacleStore(
+            cache_dir=os.environ.get('PANTACLE_CACHE_DIR'),
+            bundle_dir=bundle_dir,
+            offline=os.environ.get('PANTACLE_OFFLINE', '') == '1'
+        )
+    return _default_pantacle_store
+
+def _svg_number(value):
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+def _svg_paint(attribute, color):
+    """Atributos SVG para uma cor RGB/RGBA do PIL (None = sem pintura)"""
+    if color is None:
+        return f'{attribute}="none"'
+    paint = f'{attribute}="#{color[0]:02x}{color[1]:02x}{color[2]:02x}"'
+    if len(color) > 3 and color[3] < 255:
+        paint += f' {attribute}-opacity="{_svg_number(color[3] / 255)}"'
+    return paint
+
+class GeometryDescription:
+    """Descrição vetorial (independente de tamanho) de um padrão geométrico
+
+    Registra as mesmas primitivas da API do ImageDraw (``ellipse``,
+    ``polygon``, ``line``) em coordenadas do tamanho de referência e as
+    reproduz como raster PIL em qualquer tamanho (``rasterize``) ou como
+    texto SVG compacto (``to_svg``). No tamanho de referência o raster é
+    idêntico, pixel a pixel, ao desenho direto com ImageDraw.
+    """
+    def __init__(self, size, background=None):
+        self.size = tuple(size)
+        self.background = background
+        self.primitives = []
+
+    @staticmethod
+    def _points(xy):
+        xy = list(xy)
+        if xy and not isinstance(xy[0], (tuple, list)):
+            xy = list(zip(xy[0::2], xy[1::2]))
+        return [tuple(point) for point in xy]
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self.primitives.append(('ellipse', self._points(xy), fill, outline, width))
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self.primitives.append(('polygon', self._points(xy), fill, outline, width))
+
+    def line(self, xy, fill=None, width=0):
+        self.primitives.append(('line', self._points(xy), fill, None, width))
+
+    def rasterize(self, size=None):
+        """Desenha as primitivas numa imagem RGBA do tamanho pedido"""
+        size = tuple(size or self.size)
+        img = Image.new('RGBA', size, self.background or (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        scale_x = size[0] / self.size[0]
+        scale_y = size[1] / self.size[1]
+        scaled = (scale_x, scale_y) != (1, 1)
+        stroke_scale = min(scale_x, scale_y)
+        for kind, points, fill, outline, width in self.primitives:
+            if scaled:
+                points = [(x * scale_x, y * scale_y) for x, y in points]
+                width = max(1, round(width * stroke_scale)) if width else width
+            if kind == 'ellipse':
+                draw.ellipse([points[0], points[1]], fill=fill, outline=outline, width=width)
+            elif kind == 'polygon':
+                draw.polygon(points, fill=fill, outline=outline, width=width)
+            else:
+                draw.line(points, fill=fill, width=width)
+        return img
+
+    def to_svg(self, size=None):
+        """Serializa as primitivas como documento SVG (``size`` define width/height; o viewBox é fixo)"""
+        width, height = size or self.size
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                 f'viewBox="0 0 {self.size[0]} {self.size[1]}">']
+        if self.background:
+            parts.append(f'<rect width="100%" height="100%" {_svg_paint("fill", self.background)}/>')
+        for kind, points, fill, outline, stroke_width in self.primitives:
+            stroke = ''
+            if kind == 'line':
+                fill, outline = None, fill
+                stroke_width = stroke_width or 1
+            if outline is not None:
+                stroke = f' {_svg_paint("stroke", outline)} stroke-width="{stroke_width}"'
+            paint = _svg_paint('fill', fill) + stroke
+            if kind == 'ellipse':
+                (x0, y0), (x1, y1) = points
+                # O contorno do PIL fica dentro da caixa; no SVG o traço é centrado no raio
+                inset = stroke_width / 2 if outline is not None and fill is None else 0
+                parts.append(f'<ellipse cx="{_svg_number((x0 + x1) / 2)}" cy="{_svg_number((y0 + y1) / 2)}" '
+                             f'rx="{_svg_number((x1 - x0) / 2 - inset)}" ry="{_svg_number((y1 - y0) / 2 - inset)}" '
+                             f'{paint}/>')
+            else:
+                tag = 'polygon' if kind == 'polygon' else 'polyline'
+                coords = ' '.join(f'{_svg_number(x)},{_svg_number(y)}' for x, y in points)
+                parts.append(f'<{tag} points="{coords}" {paint}/>')
+        parts.append('</svg>')
+        return ''.join(parts)
+
+    def save_svg(self, path, size=None):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_svg(size))
+        return path
+
 class SacredGeometryGenerator:
     """Gerador de padrões de geometria sagrada"""
-    def __init__(self):
+    def __init__(self, cache=None, pantacle_store=None, post_processor=None):
         self.phi = 1.618033988749895
+        self.cache = cache
+        self.post_processor = post_processor
+        self.pantacle_store = pantacle_store
+        self.pantacle_urls = dict(PANTACLE_URLS if pantacle_store is None else pantacle_store.urls)
 
-    def generate_flower_of_life(self, size=(800, 800), circles=19):
-        """Gera padrão da Flor da Vida"""
-        img = Image.new('RGBA', size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    def flower_of_life_geometry(self, size=(800, 800), circles=19):
+        """Primitivas vetoriais da Flor da Vida (ver GeometryDescription)"""
+        draw = GeometryDescription(size)
         center_x, center_y = size[0] // 2, size[1] // 2
         radius = min(size) // 6
         positions = [(center_x, center_y)]
@@ -162,12 +1281,18 @@ class SacredGeometryGenerator:
             draw.ellipse([x - radius//3, y - radius//3, 
                          x + radius//3, y + radius//3], 
                         outline=color[:3] + (100,), width=1)
-        return img
+        return draw
 
-    def generate_merkaba(self, size=(800, 800)):
-        """Gera estrela tetraédrica (Merkaba)"""
-        img = Image.new('RGBA', size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    @_traced
+    @_post_processed
+    @_cached_artifact
+    def generate_flower_of_life(self, size=(800, 800), circles=19):
+        """Gera padrão da Flor da Vida"""
+        return self.flower_of_life_geometry(size, circles).rasterize()
+
+    def merkaba_geometry(self, size=(800, 800)):
+        """Primitivas vetoriais da Merkaba (ver GeometryDescription)"""
+        draw = GeometryDescription(size)
         center_x, center_y = size[0] // 2, size[1] // 2
         radius = min(size) // 3
         triangle_up = [
@@ -189,12 +1314,18 @@ class SacredGeometryGenerator:
         draw.ellipse([center_x - radius, center_y - radius,
                      center_x + radius, center_y + radius],
                     outline=(255, 255, 0, 100), width=2)
-        return img
+        return draw
 
-    def generate_sri_yantra(self, size=(800, 800)):
-        """Gera padrão Sri Yantra simplificado"""
-        img = Image.new('RGBA', size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    @_traced
+    @_post_processed
+    @_cached_artifact
+    def generate_merkaba(self, size=(800, 800)):
+        """Gera estrela tetraédrica (Merkaba)"""
+        return self.merkaba_geometry(size).rasterize()
+
+    def sri_yantra_geometry(self, size=(800, 800)):
+        """Primitivas vetoriais da Sri Yantra (ver GeometryDescription)"""
+        draw = GeometryDescription(size)
         center_x, center_y = size[0] // 2, size[1] // 2
         base_size = min(size) // 3
         up_triangles = []
@@ -225,12 +1356,18 @@ class SacredGeometryGenerator:
             draw.polygon(triangle, outline=color[:3] + (255,), width=3)
         draw.ellipse([center_x - 5, center_y - 5, center_x + 5, center_y + 5],
                     fill=(255, 255, 255, 255))
-        return img
+        return draw
 
-    def generate_metatron_star(self, size=(800, 800)):
-        """Gera padrão da Estrela de Metatron"""
-        img = Image.new('RGBA', size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    @_traced
+    @_post_processed
+    @_cached_artifact
+    def generate_sri_yantra(self, size=(800, 800)):
+        """Gera padrão Sri Yantra simplificado"""
+        return self.sri_yantra_geometry(size).rasterize()
+
+    def metatron_star_geometry(self, size=(800, 800)):
+        """Primitivas vetoriais da Estrela de Metatron (ver GeometryDescription)"""
+        draw = GeometryDescription(size)
         center_x, center_y = size[0] // 2, size[1] // 2
         radius = min(size) // 4
         centers = []
@@ -259,36 +1396,60 @@ class SacredGeometryGenerator:
                 x1, y1 = centers[i]
                 x2, y2 = centers[j]
                 draw.line([x1, y1, x2, y2], fill=(255, 255, 255, 50), width=1)
-        return img
+        return draw
+
+    @_traced
+    @_post_processed
+    @_cached_artifact
+    def generate_metatron_star(self, size=(800, 800)):
+        """Gera padrão da Estrela de Metatron"""
+        return self.metatron_star_geometry(size).rasterize()
+
+    def torus_geometry(self, size=(800, 800)):
+        """Primitivas vetoriais do Campo Toroidal (ver GeometryDescription)"""
+        draw = GeometryDescription(size)
+        center_x, center_y = size[0] // 2, size[1] // 2
+        unit = min(size) // 3
+        # Anéis do toro vistos de cima, mais opacos conforme a fase
+        for k in range(0, 20, 3):
+            p = 2 * math.pi * k / 19
+            ring = unit * (1 + 0.3 * math.cos(p))
+            alpha = int(255 * (0.2 + 0.6 * p / (2 * math.pi)))
+            draw.ellipse([center_x - ring, center_y - ring, center_x + ring, center_y + ring],
+                         outline=(0, 255, 255, alpha), width=2)
+        # Meridianos achatados em perspectiva
+        for k in range(0, 50, 5):
+            t = 2 * math.pi * k / 49
+            points = []
+            for j in range(30):
+                phi = 2 * math.pi * j / 29
+                radius = unit * (1 + 0.3 * math.cos(phi))
+                points.append((center_x + radius * math.cos(t),
+                               center_y - radius * math.sin(t) * 0.3 * math.sin(phi)))
+            draw.line(points, fill=(255, 0, 255, 102), width=1)
+        return draw
+
+    @_traced
+    @_post_processed
+    @_cached_artifact
+    def generate_torus(self, size=(800, 800)):
+        """Gera o Campo Toroidal"""
+        return self.torus_geometry(size).rasterize()
 
     # <!-- NOVO: Gerador de Pantáculos (CORRIGIDO) -->
+    _pantacle_keying = ImagePostProcessor().threshold_key(threshold=200)
+
+    @_traced
+    @_post_processed
     def generate_pantacle(self, pantacle_type, size=(800, 800)):
         """Gera ou baixa um pantáculo arquetípico (CORRIGIDO)"""
         try:
             if pantacle_type in self.pantacle_urls:  # <-- Usa self.pantacle_urls
-                url = self.pantacle_urls[pantacle_type]  # <-- Centralizado
-                response = requests.get(url)
-                if response.status_code == 200:
-                    # <!-- CORRIGIDO: Tratamento de SVG -->
-                    if url.endswith('.svg') or 'svg' in response.headers.get('Content-Type', '').lower():
-                        png_bytes = cairosvg.svg2png(bytestring=response.content)
-                        img = Image.open(BytesIO(png_bytes)).convert('RGBA')
-                    else:
-                        img = Image.open(BytesIO(response.content)).convert('RGBA')
-                    # Redimensionar
-                    img = img.resize(size, Image.LANCZOS)
-                    # Tornar fundo branco transparente
-                    datas = img.getdata()
-                    newData = []
-                    for item in datas:
-                        if len(item) >= 3 and item[0] > 200 and item[1] > 200 and item[2] > 200:
-                            newData.append((255, 255, 255, 0))
-                        else:
-                            newData.append(item)
-                    img.putdata(newData)
-                    return img
-                else:
-                    print(f"⚠️ Falha ao baixar pantáculo {pantacle_type}")
+                store = self.pantacle_store or get_default_pantacle_store()
+                # Fonte e raster vêm do armazém local (download único, sessão com pool)
+                img = store.get_image(pantacle_type, size)
+                # Tornar fundo branco transparente
+                return self._pantacle_keying(img)
             else:
                 print(f"⚠️ Tipo de pantáculo desconhecido: {pantacle_type}")
         except Exception as e:
@@ -312,110 +1473,698 @@ class SacredGeometryGenerator:
         return img
     # <!-- FIM NOVO -->
 
+class OscillatorBank:
+    """Banco de osciladores por fasores em blocos para síntese aditiva em lote
+
+    Cada parcial ``a·sin(2π·f·t + φ)`` na grade ``t = n·step`` é escrita como
+    ``Im(a·e^{iφ}·e^{iω·b·B}·e^{iω·m})`` com ``n = b·B + m``. A linha
+    intra-bloco de fasores de cada frequência fica em cache por ``(f, step)``
+    e é reaproveitada entre chamadas; os fasores de início de bloco são
+    calculados só para a janela pedida, de modo que renderizar em segmentos
+    custa o mesmo que de uma vez e a memória não cresce com a duração. Todas
+    as parciais de uma faixa são somadas numa única multiplicação matricial
+    real ``(blocos × 2K)·(2K × B)``.
+
+    Tolerância medida contra a avaliação direta com ``np.sin`` (erro absoluto
+    para pico de amplitude 1): float32 < 1e-5; float64 < 1e-9 nos primeiros
+    15 minutos de sinal e < 1e-8 até 2 horas. Em float64 o erro cresce com a
+    fase absoluta (arredondamento de argumentos da ordem de 1e7 rad, que
+    afeta também o próprio ``np.sin``).
+
+    No máximo ``max_tables`` pares ``(f, step)`` ficam em cache (LRU), para
+    que processos longos com frequências sempre novas não cresçam sem limite.
+    """
+    def __init__(self, block_size=1024, dtype="float64", max_tables=256):
+        self.block_size = block_size
+        self.dtype = np.dtype(dtype)
+        self.max_tables = max_tables
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _intra_table(self, frequency, step):
+        key = (frequency, step)
+        with self._lock:
+            intra = self._tables.get(key)
+            if intra is not None:
+                self._tables.move_to_end(key)
+                return intra
+        omega = 2 * np.pi * frequency * step
+        intra = np.exp(1j * omega * np.arange(self.block_size))
+        with self._lock:
+            self._tables[key] = intra
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        return intra
+
+    def render(self, partials, step, start, count):
+        """Soma as parciais ``(freq, amplitude, fase)`` nas amostras [start, start + count)"""
+        block = self.block_size
+        first = start // block
+        last = -(-(start + count) // block)
+        partials = list(partials)
+        k = len(partials)
+        left = np.empty((last - first, 2 * k), dtype=self.dtype)
+        right = np.empty((2 * k, block), dtype=self.dtype)
+        for i, (frequency, amplitude, phase) in enumerate(partials):
+            intra = self._intra_table(frequency, step)
+            omega = 2 * np.pi * frequency * step
+            starts = np.exp(1j * (omega * block) * np.arange(first, last))
+            coeffs = starts * (amplitude * np.exp(1j * phase))
+            # Im(c·q) = Re(c)·Im(q) + Im(c)·Re(q)
+            left[:, i] = coeffs.real
+            left[:, k + i] = coeffs.imag
+            right[i] = intra.imag
+            right[k + i] = intra.real
+        offset = start - first * block
+        return (left @ right).ravel()[offset:offset + count]
+
+    def clear(self):
+        """Descarta as tabelas de fasores em cache"""
+        with self._lock:
+            self._tables.clear()
+
+_shared_oscillator_banks = {}
+
+def get_oscillator_bank(dtype="float64"):
+    """Banco de osciladores compartilhado pelo processo para o dtype pedido"""
+    key = np.dtype(dtype).name
+    if key not in _shared_oscillator_banks:
+        _shared_oscillator_banks[key] = OscillatorBank(dtype=dtype)
+    return _shared_oscillator_banks[key]
+
 class AudioFrequencyGenerator:
-    """Gerador de frequências de áudio para manifestação"""
-    def __init__(self, sample_rate=44100):
+    """Gerador de frequências de áudio para manifestação
+
+    ``synthesis='bank'`` usa o OscillatorBank compartilhado (ver a tolerância
+    documentada lá); ``synthesis='direct'`` avalia ``np.sin`` por parcial.
+    ``dtype=np.float32`` reduz memória e tempo pela metade.
+    """
+    DEFAULT_BLOCK_SIZE = 65536
+
+    def __init__(self, sample_rate=44100, synthesis='bank', dtype="float64"):
         self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype)
         self.solfeggio_frequencies = {
             'UT': 396, 'RE': 417, 'MI': 528, 'FA': 639,
             'SOL': 741, 'LA': 852, 'SI': 963, 'OM': 432
         }
+        if synthesis == 'bank':
+            self.oscillator_bank = get_oscillator_bank(self.dtype)
+        elif synthesis == 'direct':
+            self.oscillator_bank = None
+        else:
+            raise ValueError(f"Modo de síntese desconhecido: {synthesis}")
 
-    def generate_solfeggio_sequence(self, duration=30):
-        """Gera sequência completa de frequências Solfeggio"""
+    def _timeline(self, duration):
+        """Linha do tempo completa como um único segmento (início, t, passo)"""
         total_samples = int(self.sample_rate * duration)
-        audio_data = np.zeros(total_samples)
-        t = np.linspace(0, duration, total_samples)
-        for freq_name, frequency in self.solfeggio_frequencies.items():
-            wave = 0.1 * np.sin(2 * np.pi * frequency * t)
-            modulation_freq = frequency / 1.618033988749895
-            modulation = 0.05 * np.sin(2 * np.pi * modulation_freq * t)
-            envelope = np.exp(-0.1 * np.abs(t - duration/2))
-            audio_data += wave * (1 + modulation) * envelope
-        audio_data = audio_data / np.max(np.abs(audio_data)) * 0.7
-        return audio_data
+        step = duration / (total_samples - 1) if total_samples > 1 else 0.0
+        return (0, np.linspace(0, duration, total_samples), step)
 
-    def generate_binaural_beats(self, base_freq=200, beat_freq=4, duration=10):
-        """Gera batimentos binaurais para sincronização cerebral (estado theta)"""
-        total_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, total_samples)
-        left_channel = 0.5 * np.sin(2 * np.pi * base_freq * t)
-        right_channel = 0.5 * np.sin(2 * np.pi * (base_freq + beat_freq) * t)
-        binaural = (left_channel + right_channel) / 2
-        return binaural
+    def _iter_timeline(self, duration, block_size=None):
+        """Percorre em blocos a mesma linha do tempo de np.linspace(0, duration, N)
 
-    def generate_scalar_waves(self, frequency_pairs, duration=20):
-        """Gera ondas escalares baseadas nas patentes de Tesla (frequências em fase oposta)"""
+        Cada instante é calculado a partir do índice absoluto da amostra, o que
+        garante continuidade de fase entre blocos.
+        """
+        block_size = block_size or self.DEFAULT_BLOCK_SIZE
         total_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, total_samples)
-        audio_data = np.zeros(total_samples)
-        for pair in frequency_pairs:
-            wave1 = 0.2 * np.sin(2 * np.pi * pair['freq1'] * t)
-            wave2 = 0.2 * np.sin(2 * np.pi * pair['freq2'] * t + np.pi)
-            scalar_wave = (wave1 + wave2) / 2
-            audio_data += scalar_wave
+        step = duration / (total_samples - 1) if total_samples > 1 else 0.0
+        offsets = np.arange(block_size, dtype=np.float64)
+        for start in range(0, total_samples, block_size):
+            count = min(block_size, total_samples - start)
+            t = offsets[:count] + start
+            t *= step
+            yield (start, t, step)
+
+    def _iter_normalized(self, make_blocks, peak_level):
+        """Normaliza um fluxo de blocos pelo pico global em duas passagens"""
+        peak = 0.0
+        for block in make_blocks():
+            peak = max(peak, float(np.max(np.abs(block))))
+        for block in make_blocks():
+            if peak > 0:
+                block /= peak
+            block *= peak_level
+            yield block
+
+    def _render_partials(self, partials, segment):
+        """Soma parciais (freq, amplitude, fase) sobre um segmento da linha do tempo"""
+        start, t, step = segment
+        if self.oscillator_bank is not None:
+            return self.oscillator_bank.render(partials, step, start, len(t))
+        audio_data = np.zeros(len(t), dtype=self.dtype)
+        for frequency, amplitude, phase in partials:
+            audio_data += amplitude * np.sin(2 * np.pi * frequency * t + phase)
         return audio_data
 
-    def generate_quantum_pulse(self, quantum_code, duration=20):
-        """Gera pulso de áudio baseado no código quântico"""
-        numbers = [int(c) for c in quantum_code if c.isdigit()]
-        total_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, total_samples)
-        audio_data = np.zeros(total_samples)
+    def _solfeggio_partials(self):
+        partials = []
+        for frequency in self.solfeggio_frequencies.values():
+            modulation_freq = frequency / 1.618033988749895
+            # 0.1·sin(ωt)·(1 + 0.05·sin(μt)) = 0.1·sin(ωt) + 0.0025·[cos((ω−μ)t) − cos((ω+μ)t)]
+            partials.append((frequency, 0.1, 0.0))
+            partials.append((frequency - modulation_freq, 0.0025, np.pi / 2))
+            partials.append((frequency + modulation_freq, 0.0025, -np.pi / 2))
+        return partials
+
+    def _binaural_partials(self, base_freq, beat_freq):
+        return [(base_freq, 0.25, 0.0), (base_freq + beat_freq, 0.25, 0.0)]
+
+    def _scalar_partials(self, frequency_pairs):
+        partials = []
+        for pair in frequency_pairs:
+            partials.append((pair['freq1'], 0.1, 0.0))
+            partials.append((pair['freq2'], 0.1, np.pi))
+        return partials
+
+    def _quantum_pulse_partials(self, numbers):
+        partials = []
         for i, num in enumerate(numbers[:8]):
             if num > 0:
                 freq = 200 + num * 200
                 amplitude = 0.1 / (i + 1)
-                wave = amplitude * np.sin(2 * np.pi * freq * t)
-                phase_mod = 0.1 * np.sin(2 * np.pi * (freq / 10) * t)
-                wave = wave * (1 + phase_mod)
-                audio_data += wave
-        base_wave = 0.2 * np.sin(2 * np.pi * 528 * t)
-        audio_data += base_wave
-        envelope = np.exp(-t / duration)
-        audio_data = audio_data * envelope
-        audio_data = audio_data / np.max(np.abs(audio_data)) * 0.8
+                # a·sin(ωt)·(1 + 0.1·sin(ωt/10)) = a·sin(ωt) + 0.05a·[cos(0.9ωt) − cos(1.1ωt)]
+                partials.append((freq, amplitude, 0.0))
+                partials.append((freq * 0.9, 0.05 * amplitude, np.pi / 2))
+                partials.append((freq * 1.1, 0.05 * amplitude, -np.pi / 2))
+        partials.append((528, 0.2, 0.0))
+        return partials
+
+    def _solfeggio_block(self, segment, duration):
+        audio_data = self._render_partials(self._solfeggio_partials(), segment)
+        # Envelope comum a todas as frequências, calculado uma única vez
+        audio_data *= np.exp(-0.1 * np.abs(segment[1] - duration/2)).astype(self.dtype, copy=False)
         return audio_data
 
-    def save_audio_wav(self, audio_data, filename):
-        """Salva dados de áudio em arquivo WAV"""
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-        with wave.open(filename, 'w') as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_int16.tobytes())
+    def _binaural_block(self, segment, base_freq, beat_freq, stereo=False):
+        if not stereo:
+            return self._render_partials(self._binaural_partials(base_freq, beat_freq), segment)
+        # Cada ouvido recebe só a sua portadora; a diferença gera o batimento
+        left, right = self._binaural_partials(base_freq, beat_freq)
+        audio_data = np.empty((len(segment[1]), 2), dtype=self.dtype)
+        audio_data[:, 0] = self._render_partials([(left[0], 0.5, left[2])], segment)
+        audio_data[:, 1] = self._render_partials([(right[0], 0.5, right[2])], segment)
+        return audio_data
 
-class VisualizationEngine:
-    """Motor de visualizações avançadas"""
-    def __init__(self):
-        self.phi = 1.618033988749895
+    def _scalar_block(self, segment, frequency_pairs):
+        return self._render_partials(self._scalar_partials(frequency_pairs), segment)
 
-    def create_quantum_field_visualization(self, quantum_code, size=(1024, 1024)):
-        """Cria visualização do campo quântico"""
-        numbers = [int(c) for c in quantum_code if c.isdigit()]
-        if not numbers:
-            numbers = [5, 2, 8]
-        x = np.linspace(-2, 2, size[0] // 4)
-        y = np.linspace(-2, 2, size[1] // 4)
-        X, Y = np.meshgrid(x, y)
-        Z = np.zeros_like(X)
-        for i, num in enumerate(numbers[:6]):
-            if num > 0:
-                frequency = num * 0.5
-                amplitude = 1.0 / (i + 1)
+    def _quantum_pulse_block(self, segment, numbers, duration):
+        audio_data = self._render_partials(self._quantum_pulse_partials(numbers), segment)
+        audio_data *= np.exp(-segment[1] / duration).astype(self.dtype, copy=False)
+        return audio_data
+
+    @_traced
+    def generate_energy_mix(self, frequencies, duration=30):
+        """Mistura do workflow: Solfeggio com envelope + batimento binaural mono + pares escalares
+
+        ``frequencies`` segue o formato de energy_frequencies(); o resultado é
+        normalizado em 0.7, como o áudio solfeggio_binaural_scalar.wav.
+        """
+        segment = self._timeline(duration)
+        audio_data = self._solfeggio_block(segment, duration)
+        binaural = frequencies['binaural']
+        partials = [(binaural['base'], 0.1, 0.0), (binaural['base'] + binaural['beat'], 0.1, 0.0)]
+        for pair in frequencies['scalar_pairs']:
+            partials.append((pair['freq1'], 0.075, 0.0))
+            partials.append((pair['freq2'], 0.075, np.pi))
+        audio_data += self._render_partials(partials, segment)
+        audio_data = audio_data / np.max(np.abs(audio_data)) * 0.7
+        return audio_data
+
+    @_traced
+    def generate_solfeggio_sequence(self, duration=30):
+        """Gera sequência completa de frequências Solfeggio"""
+        audio_data = self._solfeggio_block(self._timeline(duration), duration)
+        audio_data = audio_data / np.max(np.abs(audio_data)) * 0.7
+        return audio_data
+
+    @_traced
+    def generate_binaural_beats(self, base_freq=200, beat_freq=4, duration=10, stereo=False):
+        """Gera batimentos binaurais para sincronização cerebral (estado theta)
+
+        Com ``stereo=True`` retorna um array (amostras, 2) com uma portadora por
+        canal; caso contrário, a média mono dos dois canais.
+        """
+        return self._binaural_block(self._timeline(duration), base_freq, beat_freq, stereo)
+
+    @_traced
+    def generate_scalar_waves(self, frequency_pairs, duration=20):
+        """Gera ondas escalares baseadas nas patentes de Tesla (frequências em fase oposta)"""
+        return self._scalar_block(self._timeline(duration), frequency_pairs)
+
+    @_traced
+    def generate_quantum_pulse(self, quantum_code, duration=20):
+        """Gera pulso de áudio baseado no código quântico"""
+        numbers = [int(c) for c in quantum_code if c.isdigit()]
+        audio_data = self._quantum_pulse_block(self._timeline(duration), numbers, duration)
+        audio_data = audio_data / np.max(np.abs(audio_data)) * 0.8
+        return audio_data
+
+    def iter_solfeggio_sequence(self, duration=30, block_size=None):
+        """Versão em blocos de generate_solfeggio_sequence (memória limitada ao bloco)"""
+        return self._iter_normalized(
+            lambda: (self._solfeggio_block(segment, duration)
+                     for segment in self._iter_timeline(duration, block_size)),
+            0.7)
+
+    def iter_binaural_beats(self, base_freq=200, beat_freq=4, duration=10, block_size=None, stereo=False):
+        """Versão em blocos de generate_binaural_beats"""
+        for segment in self._iter_timeline(duration, block_size):
+            yield self._binaural_block(segment, base_freq, beat_freq, stereo)
+
+    def iter_scalar_waves(self, frequency_pairs, duration=20, block_size=None):
+        """Versão em blocos de generate_scalar_waves"""
+        for segment in self._iter_timeline(duration, block_size):
+            yield self._scalar_block(segment, frequency_pairs)
+
+    def iter_quantum_pulse(self, quantum_code, duration=20, block_size=None):
+        """Versão em blocos de generate_quantum_pulse"""
+        numbers = [int(c) for c in quantum_code if c.isdigit()]
+        return self._iter_normalized(
+            lambda: (self._quantum_pulse_block(segment, numbers, duration)
+                     for segment in self._iter_timeline(duration, block_size)),
+            0.8)
+
+    @_traced
+    def save_audio_wav(self, audio_data, filename, sample_format='int16', dither=False, total_frames=None):
+        """Salva dados de áudio em arquivo WAV
+
+        ``audio_data`` pode ser um array (amostras,) ou (amostras, canais) ou um
+        iterável de blocos nesses formatos; ``filename`` pode ser um caminho ou
+        um arquivo binário aberto. Formatos: 'int16', 'int24' e 'float32'.
+        Para gravar blocos num destino sem seek (entrada de ZipSink, pipe),
+        informe ``total_frames``.
+        """
+        if isinstance(audio_data, np.ndarray):
+            blocks = [audio_data]
+            total_frames = len(audio_data)
+        else:
+            blocks = iter(audio_data)
+        writer = None
+        try:
+            for block in blocks:
+                block = np.asarray(block)
+                if writer is None:
+                    channels = 1 if block.ndim == 1 else block.shape[1]
+                    writer = WavWriter(filename, self.sample_rate, channels=channels,
+                                       sample_format=sample_format, dither=dither,
+                                       total_frames=total_frames)
+                writer.write(block)
+            if writer is None:
+                writer = WavWriter(filename, self.sample_rate, sample_format=sample_format, total_frames=0)
+        finally:
+            if writer is not None:
+                writer.close()
+        return filename
+
+    def save_audio_wav_stream(self, blocks, filename, sample_format='int16', dither=False, total_frames=None):
+        """Salva em WAV um iterável de blocos (memória limitada ao bloco)"""
+        return self.save_audio_wav(iter(blocks), filename, sample_format, dither, total_frames)
+
+class WavWriter:
+    """Escritor WAV incremental para PCM int16/int24 ou float32, mono ou multicanal
+
+    As amostras são convertidas em buffers pré-alocados de ``block_frames``
+    quadros, sem cópias intermediárias do tamanho do áudio. Sem dither, a
+    conversão inteira trunca como ``(x * escala).astype(...)``; com dither, soma
+    ruído TPDF de ±1 LSB, arredonda e satura. O cabeçalho é corrigido no
+    ``close()`` (arquivo com seek) ou escrito já com ``total_frames``.
+
+    int16 mono/estéreo usa o ``fmt`` PCM clássico; int24 e mais de 2 canais
+    usam WAVE_FORMAT_EXTENSIBLE (com máscara de canais padrão), e float32
+    leva o chunk ``fact`` exigido para formatos não-PCM.
+    """
+    FORMATS = {
+        # formato: (bytes por amostra, tag WAVE, escala inteira)
+        'int16': (2, 1, 32767.0),
+        'int24': (3, 1, 8388607.0),
+        'float32': (4, 3, None)
+    }
+    FORMAT_EXTENSIBLE = 0xFFFE
+    # Sufixo comum dos GUIDs KSDATAFORMAT_SUBTYPE_* (o prefixo é a tag WAVE)
+    SUBFORMAT_SUFFIX = b'\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+    CHANNEL_MASKS = {1: 0x4, 2: 0x3, 3: 0x7, 4: 0x33, 5: 0x37, 6: 0x3F, 7: 0x13F, 8: 0x63F}
+
+    def __init__(self, target, sample_rate, channels=1, sample_format='int16', dither=False,
+                 total_frames=None, block_frames=65536, seed=None):
+        if sample_format not in self.FORMATS:
+            raise ValueError(f"Formato de amostra desconhecido: {sample_format}")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_format = sample_format
+        self.sample_width, self.format_tag, self.scale = self.FORMATS[sample_format]
+        self.dither = dither and self.scale is not None
+        self.block_frames = block_frames
+        self.frames_written = 0
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self._file = open(target, 'wb') if self._owns_file else target
+        self._header_frames = total_frames
+        self._rng = np.random.default_rng(seed)
+        self._header_pos = self._file.tell() if self._file.seekable() else None
+        shape = (block_frames, channels)
+        if self.scale is None:
+            self._out = np.empty(shape, dtype='<f4')
+        else:
+            self._scaled = np.empty(shape, dtype=np.float64)
+            self._out = np.empty(shape, dtype='<i2' if self.sample_width == 2 else '<i4')
+            if self.sample_width == 3:
+                self._packed = np.empty((block_frames * channels, 3), dtype=np.uint8)
+            if self.dither:
+                self._noise = np.empty(shape, dtype=np.float64)
+                self._noise_b = np.empty(shape, dtype=np.float64)
+        self._write_header(total_frames or 0)
+
+    def _write_header(self, frames):
+        data_size = frames * self.channels * self.sample_width
+        block_align = self.channels * self.sample_width
+        bits = self.sample_width * 8
+        extensible = self.channels > 2 or self.sample_width == 3
+        if extensible:
+            fmt = struct.pack('<HHIIHHHHI', self.FORMAT_EXTENSIBLE, self.channels, self.sample_rate,
+                              self.sample_rate * block_align, block_align, bits, 22, bits,
+                              self.CHANNEL_MASKS.get(self.channels, 0))
+            fmt += struct.pack('<I', self.format_tag) + self.SUBFORMAT_SUFFIX
+        else:
+            fmt = struct.pack('<HHIIHH', self.format_tag, self.channels, self.sample_rate,
+                              self.sample_rate * block_align, block_align, bits)
+            if self.format_tag != 1:
+                fmt += struct.pack('<H', 0)
+        chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+        if self.format_tag != 1:
+            chunks += b'fact' + struct.pack('<II', 4, frames)
+        header = b'RIFF' + struct.pack('<I', 4 + len(chunks) + 8 + data_size + (data_size & 1)) + b'WAVE'
+        self._file.write(header + chunks + b'data' + struct.pack('<I', data_size))
+
+    def _convert(self, chunk, count):
+        """Converte ``count`` quadros para o formato de saída nos buffers pré-alocados"""
+        if self.scale is None:
+            np.copyto(self._out[:count], chunk, casting='same_kind')
+            return self._out[:count]
+        scaled = self._scaled[:count]
+        np.multiply(chunk, self.scale, out=scaled)
+        if self.dither:
+            noise = self._noise[:count]
+            self._rng.random(out=noise)
+            noise -= self._rng.random(out=self._noise_b[:count])
+            scaled += noise
+            np.rint(scaled, out=scaled)
+            np.clip(scaled, -self.scale - 1, self.scale, out=scaled)
+        np.copyto(self._out[:count], scaled, casting='unsafe')
+        if self.sample_width != 3:
+            return self._out[:count]
+        # int24: os 3 bytes menos significativos de cada int32 little-endian
+        samples = count * self.channels
+        packed = self._packed[:samples]
+        np.copyto(packed, self._out[:count].reshape(-1).view(np.uint8).reshape(-1, 4)[:, :3])
+        return packed
+
+    def write(self, block):
+        """Escreve um bloco (quadros,) ou (quadros, canais)"""
+        block = np.asarray(block)
+        if block.ndim == 1:
+            block = block[:, None]
+        if block.shape[1] != self.channels:
+            raise ValueError(f"Esperados {self.channels} canais, recebidos {block.shape[1]}")
+        for start in range(0, len(block), self.block_frames):
+            chunk = block[start:start + self.block_frames]
+            self._file.write(self._convert(chunk, len(chunk)).data)
+            self.frames_written += len(chunk)
+
+    def close(self):
+        """Finaliza o arquivo, corrigindo o cabeçalho se necessário"""
+        if self._file is None:
+            return
+        data_size = self.frames_written * self.channels * self.sample_width
+        if data_size & 1:
+            self._file.write(b'\x00')
+        if self.frames_written != (self._header_frames or 0):
+            if self._header_pos is None:
+                raise ValueError("Destino sem seek: informe total_frames ao criar o WavWriter")
+            end = self._file.tell()
+            self._file.seek(self._header_pos)
+            self._write_header(self.frames_written)
+            self._file.seek(end)
+        if self._owns_file:
+            self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class AudioNode:
+    """Nó de um grafo de áudio, avaliado sob demanda e no máximo uma vez por execução"""
+    produces_view = False
+
+    def __init__(self, *inputs):
+        self.inputs = inputs
+
+    def compute(self, arrays, owned):
+        """Calcula a saída a partir das entradas; ``owned[i]`` indica se a entrada i pode ser alterada in-place"""
+        raise NotImplementedError
+
+class SourceNode(AudioNode):
+    """Fonte de áudio: chama ``factory()`` apenas quando algum sink depende dela"""
+    def __init__(self, factory, name=None):
+        super().__init__()
+        self.factory = factory
+        self.name = name
+
+    def compute(self, arrays, owned):
+        return self.factory()
+
+class GainNode(AudioNode):
+    """Multiplica o sinal por um ganho constante"""
+    def __init__(self, node, gain):
+        super().__init__(node)
+        self.gain = gain
+
+    def compute(self, arrays, owned):
+        if owned[0]:
+            arrays[0] *= self.gain
+            return arrays[0]
+        return arrays[0] * self.gain
+
+class SliceNode(AudioNode):
+    """Recorte [start:stop] do sinal (sem cópia)"""
+    produces_view = True
+
+    def __init__(self, node, start=0, stop=None):
+        super().__init__(node)
+        self.start = start
+        self.stop = stop
+
+    def compute(self, arrays, owned):
+        return arrays[0][self.start:self.stop]
+
+class EnvelopeNode(AudioNode):
+    """Aplica um envelope; ``envelope`` é um array ou uma função do número de amostras"""
+    def __init__(self, node, envelope):
+        super().__init__(node)
+        self.envelope = envelope
+
+    def compute(self, arrays, owned):
+        data = arrays[0]
+        envelope = self.envelope(len(data)) if callable(self.envelope) else self.envelope
+        if owned[0]:
+            data *= envelope
+            return data
+        return data * envelope
+
+class MixNode(AudioNode):
+    """Soma as entradas; as mais curtas entram com zeros no final e as mono em todos os canais"""
+    def __init__(self, *nodes, length=None):
+        super().__init__(*nodes)
+        self.length = length
+
+    def compute(self, arrays, owned):
+        length = self.length or max(len(data) for data in arrays)
+        channels = max(1 if data.ndim == 1 else data.shape[1] for data in arrays)
+        shape = (length,) if channels == 1 else (length, channels)
+        base = None
+        # Reaproveita o buffer de uma entrada descartável com o formato final
+        for i, data in enumerate(arrays):
+            if owned[i] and data.shape == shape:
+                base = i
+                break
+        if base is None:
+            mixed = np.zeros(shape, dtype=np.result_type(*arrays))
+        else:
+            mixed = arrays[base]
+        for i, data in enumerate(arrays):
+            if i != base:
+                count = min(len(data), length)
+                if data.ndim == 1 and channels > 1:
+                    mixed[:count] += data[:count, None]
+                else:
+                    mixed[:count] += data[:count]
+        return mixed
+
+class AudioGraph:
+    """Executa um grafo de AudioNode alimentando vários sinks numa única passagem
+
+    Cada nó é avaliado no máximo uma vez; sua saída é liberada assim que o
+    último consumidor (nó ou sink) a utiliza, e um consumidor final pode
+    modificá-la in-place em vez de alocar outro array do mesmo tamanho.
+    """
+    def __init__(self):
+        self.sinks = []
+
+    def sink(self, node, callback):
+        """Registra ``callback(array)`` para a saída de ``node`` (o array não deve ser retido)"""
+        self.sinks.append((node, callback))
+        return self
+
+    def _topological_order(self):
+        order = []
+        visited = set()
+        for root, _ in self.sinks:
+            stack = [(root, False)]
+            while stack:
+                node, expanded = stack.pop()
+                if expanded:
+                    order.append(node)
+                    continue
+                if id(node) in visited:
+                    continue
+                visited.add(id(node))
+                stack.append((node, True))
+                for child in reversed(node.inputs):
+                    if id(child) not in visited:
+                        stack.append((child, False))
+        return order
+
+    def run(self):
+        """Avalia o grafo e entrega cada saída aos sinks registrados"""
+        order = self._topological_order()
+        pending = {id(node): 0 for node in order}
+        sinks_by_node = {}
+        for node in order:
+            for child in node.inputs:
+                pending[id(child)] += 1
+        for node, callback in self.sinks:
+            sinks_by_node.setdefault(id(node), []).append(callback)
+        outputs = {}
+        for node in order:
+            arrays = [outputs[id(child)] for child in node.inputs]
+            owned = [pending[id(child)] == 1 and not child.produces_view for child in node.inputs]
+            # Uma mesma entrada repetida nunca é alterada in-place
+            if len({id(child) for child in node.inputs}) != len(node.inputs):
+                owned = [False] * len(owned)
+            result = node.compute(arrays, owned)
+            del arrays
+            for child in node.inputs:
+                pending[id(child)] -= 1
+                if pending[id(child)] == 0:
+                    del outputs[id(child)]
+            for callback in sinks_by_node.get(id(node), []):
+                callback(result)
+            if pending[id(node)] > 0:
+                outputs[id(node)] = result
+        return self
+
+# Pontos de controle da paleta "plasma" (matplotlib), interpolados numa LUT de 256 cores
+PLASMA_ANCHORS = [
+    (0.0, (13, 8, 135)), (0.125, (75, 3, 161)), (0.25, (125, 3, 168)),
+    (0.375, (168, 34, 150)), (0.5, (203, 70, 121)), (0.625, (229, 107, 93)),
+    (0.75, (248, 148, 65)), (0.875, (253, 195, 40)), (1.0, (240, 249, 33))
+]
+
+@functools.lru_cache(maxsize=1)
+def _plasma_lut():
+    """LUT (256, 3) uint8 da paleta plasma, calculada uma única vez"""
+    positions = [position for position, _ in PLASMA_ANCHORS]
+    samples = np.linspace(0, 1, 256)
+    lut = np.empty((256, 3), dtype=np.uint8)
+    for channel in range(3):
+        values = [color[channel] for _, color in PLASMA_ANCHORS]
+        lut[:, channel] = np.rint(np.interp(samples, positions, values))
+    return lut
+
+def _contour_rgb(Z, levels):
+    """Quantiza o campo em ``levels - 1`` faixas (como o contourf) e colore pela LUT plasma com alpha 0.8 sobre preto"""
+    z_min, z_max = float(Z.min()), float(Z.max())
+    bands = levels - 1
+    span = (z_max - z_min) or 1.0
+    band_index = ((Z - z_min) * (bands / span)).astype(np.int32)
+    np.clip(band_index, 0, bands - 1, out=band_index)
+    lut = _plasma_lut()
+    band_colors = lut[np.rint((np.arange(bands) + 0.5) / bands * 255).astype(np.int32)]
+    band_colors = np.rint(band_colors * 0.8).astype(np.uint8)
+    # Linha 0 do array é y = +2 (topo da imagem)
+    return band_colors[band_index[::-1]]
+
+def _draw_header_title(img, title, header):
+    """Escreve o título centralizado na faixa superior da imagem"""
+    try:
+        font = ImageFont.load_default(size=header // 2)
+    except TypeError:
+        font = ImageFont.load_default()
+    ImageDraw.Draw(img).text((img.size[0] // 2, header // 2), title, fill=(255, 255, 255), font=font, anchor='mm')
+
+class VisualizationEngine:
+    """Motor de visualizações avançadas"""
+    def __init__(self, post_processor=None):
+        self.phi = 1.618033988749895
+        self.post_processor = post_processor
+
+    def _quantum_field(self, quantum_code, width, height):
+        """Calcula o campo Z do código quântico numa grade width x height sobre [-2, 2]²"""
+        numbers = [int(c) for c in quantum_code if c.isdigit()]
+        if not numbers:
+            numbers = [5, 2, 8]
+        x = np.linspace(-2, 2, width)
+        y = np.linspace(-2, 2, height)
+        X, Y = np.meshgrid(x, y)
+        Z = np.zeros_like(X)
+        r = np.sqrt(X**2 + Y**2)
+        theta = np.arctan2(Y, X)
+        radial_decay = np.exp(-0.3 * r)
+        for i, num in enumerate(numbers[:6]):
+            if num > 0:
+                frequency = num * 0.5
+                amplitude = 1.0 / (i + 1)
                 phase = num * np.pi / 9
-                r = np.sqrt(X**2 + Y**2)
-                theta = np.arctan2(Y, X)
                 component = amplitude * np.sin(frequency * r + theta * num + phase)
-                component *= np.exp(-0.3 * r)
+                component *= radial_decay
                 Z += component
+        return X, Y, Z
+
+    @_traced
+    def create_quantum_field_visualization(self, quantum_code, size=(1024, 1024), backend='raster',
+                                           output_path=None, resolution=None, sink=None, compress_level=6):
+        """Cria visualização do campo quântico
+
+        ``backend='raster'`` (padrão) usa NumPy + PIL na resolução pedida
+        (``resolution``, padrão ``size[0]``); ``backend='matplotlib'`` gera a
+        versão de publicação (figura de 12" a 300 dpi, bem mais lenta).
+        Com ``sink`` (ArtifactSink) o PNG é gravado nele com o nome
+        ``output_path`` e o retorno é a referência do sink.
+        """
+        if output_path is None:
+            output_path = f'quantum_field_{quantum_code.replace("-", "_")}.png'
+        if backend == 'raster':
+            img = self.render_quantum_field_image(quantum_code, resolution or size[0])
+            if sink is not None:
+                sink.write_bytes(output_path, encode_png(img, compress_level))
+                return sink.location(output_path)
+            img.save(output_path, compress_level=compress_level)
+            return output_path
+        if backend != 'matplotlib':
+            raise ValueError(f"Backend de visualização desconhecido: {backend}")
+        X, Y, Z = self._quantum_field(quantum_code, size[0] // 4, size[1] // 4)
         fig, ax = plt.subplots(figsize=(12, 12), facecolor='black')
         ax.set_facecolor('black')
         levels = np.linspace(Z.min(), Z.max(), 30)
         contour = ax.contourf(X, Y, Z, levels=levels, cmap='plasma', alpha=0.8)
         dx, dy = np.gradient(Z)
-        ax.streamplot(X, Y, dx, dy, color='white', density=0.5, alpha=0.3, arrowsize=1.5)
+        stream = ax.streamplot(X, Y, dx, dy, color='white', density=0.5, arrowsize=1.5)
+        stream.lines.set_alpha(0.3)
         colors = ['cyan', 'magenta', 'yellow']
         for i in range(7):
             if i == 0:
@@ -440,15 +2189,110 @@ class VisualizationEngine:
         ax.text(0, 2.3, f'Campo Quântico - Código: {quantum_code}', 
                 ha='center', va='center', color='white', fontsize=16, fontweight='bold')
         plt.tight_layout()
-        plt.savefig(f'quantum_field_{quantum_code.replace("-", "_")}.png', 
-                   dpi=300, bbox_inches='tight', facecolor='black', edgecolor='none')
+        if sink is not None:
+            with sink.open(output_path) as f:
+                plt.savefig(f, format='png', dpi=300, bbox_inches='tight', facecolor='black', edgecolor='none')
+            plt.close()
+            return sink.location(output_path)
+        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='black', edgecolor='none')
         plt.close()
-        return f'quantum_field_{quantum_code.replace("-", "_")}.png'
+        return output_path
 
-    def create_energy_mandala(self, numerology_data, size=(1000, 1000)):
-        """Cria mandala energética baseada nos dados numerológicos"""
-        img = Image.new('RGBA', size, (0, 0, 0, 255))
-        draw = ImageDraw.Draw(img)
+    @_traced
+    def render_quantum_field_image(self, quantum_code, resolution=1024, levels=30):
+        """Renderiza o campo quântico em memória (RGB), sem matplotlib
+
+        O campo é quantizado em faixas como no ``contourf`` e colorido por uma
+        LUT da paleta plasma; o gradiente vira segmentos de fluxo e os anéis
+        da Flor da Vida e os pontos de Metatron são desenhados com PIL.
+        """
+        header = max(resolution // 16, 12)
+        X, Y, Z = self._quantum_field(quantum_code, resolution, resolution)
+        img = Image.new('RGB', (resolution, resolution + header), (0, 0, 0))
+        img.paste(Image.fromarray(_contour_rgb(Z, levels), 'RGB'), (0, header))
+        overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        scale = resolution / 4.0
+        def to_px(x, y):
+            return ((x + 2) * scale, header + (2 - y) * scale)
+        # Segmentos de fluxo ao longo do gradiente numa grade esparsa
+        dy, dx = np.gradient(Z)
+        stride = max(resolution // 40, 1)
+        gx = dx[::stride, ::stride]
+        gy = dy[::stride, ::stride]
+        magnitude = np.hypot(gx, gy)
+        magnitude[magnitude == 0] = 1.0
+        length = 0.4 * stride / scale
+        x0 = X[::stride, ::stride]
+        y0 = Y[::stride, ::stride]
+        x1 = x0 + gx / magnitude * length
+        y1 = y0 + gy / magnitude * length
+        line_width = max(resolution // 512, 1)
+        for xa, ya, xb, yb in zip(x0.ravel(), y0.ravel(), x1.ravel(), y1.ravel()):
+            draw.line([to_px(xa, ya), to_px(xb, yb)], fill=(255, 255, 255, 77), width=line_width)
+        colors = [(0, 255, 255), (255, 0, 255), (255, 255, 0)]
+        ring_width = max(resolution // 256, 1)
+        for i in range(7):
+            if i == 0:
+                cx, cy = 0.0, 0.0
+            else:
+                angle = 2 * np.pi * (i-1) / 6
+                cx, cy = 0.5 * np.cos(angle), 0.5 * np.sin(angle)
+            (left, top), (right, bottom) = to_px(cx - 0.5, cy + 0.5), to_px(cx + 0.5, cy - 0.5)
+            draw.ellipse([left, top, right, bottom], outline=colors[i % len(colors)] + (179,), width=ring_width)
+        metatron_radius = 0.5 * 2.618
+        for i in range(13):
+            angle = 2 * np.pi * i / 13
+            cx, cy = metatron_radius * np.cos(angle), metatron_radius * np.sin(angle)
+            (left, top), (right, bottom) = to_px(cx - 0.1, cy + 0.1), to_px(cx + 0.1, cy - 0.1)
+            draw.ellipse([left, top, right, bottom], fill=(255, 255, 0, 204))
+        img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+        _draw_header_title(img, f'Campo Quântico - Código: {quantum_code}', header)
+        return img
+
+    @_traced
+    def render_scalar_energy_pattern(self, scalar_pairs, t=0.0, resolution=1000, levels=20):
+        """Padrão de energia escalar do workflow (campo + Flor da Vida, Metatron e Merkaba), sem matplotlib"""
+        header = max(resolution // 16, 12)
+        coords = np.linspace(-2, 2, resolution)
+        X, Y = np.meshgrid(coords, coords)
+        r = np.sqrt(X**2 + Y**2)
+        decay = np.exp(-0.3 * r)
+        Z = np.zeros_like(X)
+        for pair in scalar_pairs:
+            Z += (np.sin(pair['freq1'] * 0.01 * r + t) + np.sin(pair['freq2'] * 0.01 * r + t + np.pi)) * decay
+        img = Image.new('RGB', (resolution, resolution + header), (0, 0, 0))
+        img.paste(Image.fromarray(_contour_rgb(Z, levels), 'RGB'), (0, header))
+        overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        scale = resolution / 4.0
+        def to_px(x, y):
+            return ((x + 2) * scale, header + (2 - y) * scale)
+        def circle(cx, cy, radius, color, width):
+            (left, top), (right, bottom) = to_px(cx - radius, cy + radius), to_px(cx + radius, cy - radius)
+            draw.ellipse([left, top, right, bottom], outline=color, width=width)
+        colors = [(0, 255, 255), (255, 0, 255), (255, 255, 0), (0, 255, 0)]
+        ring_width = max(resolution // 400, 1)
+        for i in range(7):
+            angle = 2 * np.pi * (i - 1) / 6
+            cx, cy = (0.0, 0.0) if i == 0 else (0.3 * np.cos(angle), 0.3 * np.sin(angle))
+            circle(cx, cy, 0.3, colors[i % len(colors)] + (179,), ring_width)
+        metatron_radius = 0.3 * 2.618
+        for i in range(13):
+            angle = 2 * np.pi * i / 13
+            circle(metatron_radius * np.cos(angle), metatron_radius * np.sin(angle), 0.15, (255, 255, 0, 204),
+                   max(resolution // 600, 1))
+        merkaba = [(0, 0.5), (0.433, -0.25), (-0.433, -0.25), (0, 0.5),
+                   (0, -0.5), (0.433, 0.25), (-0.433, 0.25), (0, -0.5)]
+        for triangle in (merkaba[:4], merkaba[4:]):
+            draw.line([to_px(x, y) for x, y in triangle], fill=(255, 255, 255, 230), width=max(resolution // 300, 1))
+        img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+        _draw_header_title(img, 'Quantum Scalar Field Activation', header)
+        return img
+
+    def energy_mandala_geometry(self, numerology_data, size=(1000, 1000)):
+        """Primitivas vetoriais da mandala energética (ver GeometryDescription)"""
+        draw = GeometryDescription(size, background=(0, 0, 0, 255))
         center_x, center_y = size[0] // 2, size[1] // 2
         max_radius = min(size) // 2 - 50
         colors = [
@@ -481,17 +2325,36 @@ class VisualizationEngine:
         draw.ellipse([center_x - 10, center_y - 10,
                      center_x + 10, center_y + 10],
                     fill=(255, 255, 255, 255))
-        return img
+        return draw
+
+    @_traced
+    @_post_processed
+    def create_energy_mandala(self, numerology_data, size=(1000, 1000)):
+        """Cria mandala energética baseada nos dados numerológicos"""
+        return self.energy_mandala_geometry(numerology_data, size).rasterize()
 
 class GnosticStateInducer:
     """Classe para induzir estados gnósticos usando áudio e visualização"""
     def __init__(self, audio_generator):
         self.audio_gen = audio_generator
 
-    def generate_theta_state_audio(self, duration=180):
+    @_traced
+    def generate_theta_state_audio(self, duration=180, stereo=False):
         """Gera áudio para induzir estado theta (4-7Hz) usando batimentos binaurais"""
-        return self.audio_gen.generate_binaural_beats(base_freq=200, beat_freq=4, duration=duration)
+        return self.audio_gen.generate_binaural_beats(base_freq=200, beat_freq=4, duration=duration,
+                                                      stereo=stereo)
+
+    def iter_theta_state_audio(self, duration=180, block_size=None, stereo=False):
+        """Versão em blocos de generate_theta_state_audio, para sessões longas"""
+        return self.audio_gen.iter_binaural_beats(base_freq=200, beat_freq=4, duration=duration,
+                                                  block_size=block_size, stereo=stereo)
+
+    def open_theta_stream(self, beat_freq=4, base_freq=200, max_block=1024, **kwargs):
+        """Sessão ao vivo: BinauralStream theta cujo batimento pode mudar durante a execução"""
+        return BinauralStream(base_freq=base_freq, beat_freq=beat_freq, sample_rate=self.audio_gen.sample_rate,
+                              max_block=max_block, **kwargs)
 
+    @_traced
     def generate_visual_stimulus(self, size=(800, 800)):
         """Gera estímulo visual para indução gnóstica (padrão de flicker suave)"""
         img = Image.new('RGBA', size, (0, 0, 0, 255))
@@ -506,68 +2369,1289 @@ class GnosticStateInducer:
                         outline=color, width=2)
         return img
 
+class BinauralStream:
+    """Batimentos binaurais em tempo real, por demanda: cada ``read`` produz o próximo bloco
+
+    Feito para callbacks de áudio (ex.: sounddevice): nenhum array é alocado
+    por bloco. Fases, rampas e saída usam buffers criados no construtor, e
+    ``read`` devolve uma view de um anel de ``ring_blocks`` blocos (válida
+    até o anel dar a volta); ``read_into`` escreve direto no buffer do
+    chamador. Mudanças via ``set_params`` viram rampas lineares de ``ramp_s``
+    segundos na frequência instantânea e no ganho, com fase contínua, sem
+    cliques. O canal esquerdo toca ``base_freq`` e o direito
+    ``base_freq + beat_freq``; o passo de tempo é ``1/sample_rate``.
+    """
+    CHANNELS = 2
+
+    def __init__(self, base_freq=200, beat_freq=4, gain=0.5, sample_rate=44100, max_block=1024,
+                 ring_blocks=4, ramp_s=0.05, dtype="float32"):
+        self.sample_rate = sample_rate
+        self.max_block = max_block
+        self.ramp_s = ramp_s
+        self.frames_rendered = 0
+        self._omega = [self._angular(base_freq), self._angular(base_freq + beat_freq)]
+        self._omega_slope = [0.0, 0.0]
+        self._phase = [0.0, 0.0]
+        self._gain = float(gain)
+        self._gain_slope = 0.0
+        self._ramp_left = 0
+        self._ramp_end = None
+        self._targets = (base_freq, beat_freq, float(gain))
+        self._pending = None
+        # j e j·(j-1)/2: fase de uma frequência em rampa linear, amostra a amostra
+        self._index = np.arange(max_block, dtype=np.float64)
+        self._triangle = self._index * (self._index - 1) / 2
+        self._phase_buf = np.empty(max_block, dtype=np.float64)
+        self._ramp_buf = np.empty(max_block, dtype=np.float64)
+        self._gain_buf = np.empty(max_block, dtype=np.float64)
+        self._ring = np.zeros((ring_blocks, max_block, self.CHANNELS), dtype=dtype)
+        self._slot = 0
+
+    def _angular(self, frequency):
+        return 2 * math.pi * frequency / self.sample_rate
+
+    @property
+    def params(self):
+        """Valores-alvo atuais (base_freq, beat_freq, gain)"""
+        base_freq, beat_freq, gain = self._targets
+        return {'base_freq': base_freq, 'beat_freq': beat_freq, 'gain': gain}
+
+    def set_params(self, base_freq=None, beat_freq=None, gain=None, ramp_s=None):
+        """Agenda novos valores; a rampa começa no próximo bloco (seguro a partir de outra thread)"""
+        current = self._targets
+        targets = (current[0] if base_freq is None else base_freq,
+                   current[1] if beat_freq is None else beat_freq,
+                   current[2] if gain is None else float(gain))
+        ramp_frames = max(1, int(round((self.ramp_s if ramp_s is None else ramp_s) * self.sample_rate)))
+        self._targets = targets
+        # Atribuição única de tupla: a thread de áudio nunca vê um estado pela metade
+        self._pending = (targets, ramp_frames)
+
+    def _start_ramp(self):
+        (base_freq, beat_freq, gain), ramp_frames = self._pending
+        self._pending = None
+        targets = [self._angular(base_freq), self._angular(base_freq + beat_freq)]
+        self._omega_slope = [(target - omega) / ramp_frames for target, omega in zip(targets, self._omega)]
+        self._gain_slope = (gain - self._gain) / ramp_frames
+        self._ramp_left = ramp_frames
+        # Alvo desta rampa: set_params pode trocar _targets durante um read_into
+        self._ramp_end = (targets, gain)
+
+    def _render_segment(self, out, count, ramping):
+        """Sintetiza ``count`` quadros com parâmetros constantes ou numa única rampa linear"""
+        phase = self._phase_buf[:count]
+        gain = self._gain_buf[:count]
+        if ramping:
+            np.multiply(self._index[:count], self._gain_slope, out=gain)
+            gain += self._gain
+        for channel in range(self.CHANNELS):
+            omega = self._omega[channel]
+            np.multiply(self._index[:count], omega, out=phase)
+            if ramping:
+                slope = self._omega_slope[channel]
+                np.multiply(self._triangle[:count], slope, out=self._ramp_buf[:count])
+                phase += self._ramp_buf[:count]
+            phase += self._phase[channel]
+            np.sin(phase, out=phase)
+            if ramping:
+                phase *= gain
+            else:
+                phase *= self._gain
+            out[:count, channel] = phase
+            advance = omega * count
+            if ramping:
+                advance += slope * count * (count - 1) / 2
+                self._omega[channel] = omega + slope * count
+            self._phase[channel] = (self._phase[channel] + advance) % (2 * math.pi)
+        if ramping:
+            self._gain += self._gain_slope * count
+            self._ramp_left -= count
+            if self._ramp_left == 0:
+                # Elimina o erro acumulado da rampa: termina exatamente no alvo dela
+                omegas, self._gain = self._ramp_end
+                self._omega = list(omegas)
+
+    def read_into(self, out):
+        """Preenche ``out`` (quadros, 2) com os próximos quadros e o devolve"""
+        if self._pending is not None:
+            self._start_ramp()
+        frames = len(out)
+        done = 0
+        while done < frames:
+            count = min(frames - done, self.max_block)
+            if self._ramp_left:
+                count = min(count, self._ramp_left)
+            self._render_segment(out[done:done + count], count, self._ramp_left > 0)
+            done += count
+        self.frames_rendered += frames
+        return out
+
+    def read(self, frames=None):
+        """Próximo bloco de ``frames`` (até ``max_block``) quadros, como view do anel pré-alocado"""
+        frames = self.max_block if frames is None else frames
+        if frames > self.max_block:
+            raise ValueError(f"Bloco de {frames} quadros excede max_block={self.max_block}")
+        block = self._ring[self._slot, :frames]
+        self._slot = (self._slot + 1) % len(self._ring)
+        return self.read_into(block)
+
+    def callback(self, outdata, frames, time_info, status):
+        """Callback no formato do sounddevice.OutputStream"""
+        self.read_into(outdata[:frames])
+
+def measure_stream_jitter(stream, block_frames=512, blocks=2000, changes=None, warmup=32,
+                          alloc_blocks=256, timer=time.perf_counter):
+    """Mede a produção de blocos de ``stream`` contra um relógio de áudio simulado (sem dispositivo)
+
+    O dispositivo virtual pede o bloco k no instante k·período; o produtor
+    começa quando o pedido chega (ou quando termina o bloco anterior) e leva
+    o tempo real medido de ``read``. Um bloco pronto depois do fim do seu
+    período conta como underrun. ``changes`` mapeia índice do bloco ->
+    kwargs de ``set_params``. ``max_step_ratio`` compara o maior salto entre
+    amostras consecutivas com o máximo teórico de uma senoide (cliques > 1);
+    ``alloc_peak_bytes`` é o pico do tracemalloc em ``alloc_blocks`` blocos.
+    """
+    changes = changes or {}
+    period = block_frames / stream.sample_rate
+    durations = np.empty(blocks)
+    max_step = 0.0
+    previous = None
+    virtual_free = 0.0
+    latencies = np.empty(blocks)
+    underruns = 0
+    # Rampas são lineares: os extremos de frequência e ganho caem nas bordas dos blocos
+    omega_max = max(stream._omega)
+    gain_max = stream._gain
+    for k in range(blocks):
+        if k in changes:
+            stream.set_params(**changes[k])
+        started = timer()
+        block = stream.read(block_frames)
+        durations[k] = timer() - started
+        start = max(k * period, virtual_free)
+        virtual_free = start + durations[k]
+        latencies[k] = virtual_free - k * period
+        if k >= warmup and latencies[k] > period:
+            underruns += 1
+        if previous is not None:
+            max_step = max(max_step, float(np.max(np.abs(block[0] - previous))))
+        max_step = max(max_step, float(np.max(np.abs(np.diff(block, axis=0)))))
+        previous = block[-1].copy()
+        omega_max = max(omega_max, *stream._omega)
+        gain_max = max(gain_max, stream._gain)
+    # Passo máximo de uma senoide amostrada: 2·a·sin(ω/2), com ω em radianos por amostra
+    sine_step = 2 * gain_max * math.sin(omega_max / 2)
+    # Não interrompe um rastreamento já ativo (ex.: StageTracer com track_memory)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(alloc_blocks):
+            stream.read(block_frames)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    steady = durations[warmup:] * 1000
+    return {
+        'block_frames': block_frames,
+        'blocks': blocks,
+        'period_ms': period * 1000,
+        'mean_ms': float(steady.mean()),
+        'p50_ms': float(np.percentile(steady, 50)),
+        'p99_ms': float(np.percentile(steady, 99)),
+        'max_ms': float(steady.max()),
+        'jitter_ms': float(steady.std()),
+        'max_latency_ms': float(latencies[warmup:].max() * 1000),
+        'underruns': underruns,
+        'max_step_ratio': max_step / sine_step if sine_step else 0.0,
+        'alloc_peak_bytes': peak - baseline
+    }
+
 # Funções auxiliares para integração com o workflow
-def process_manifestation_data(encrypted_data, quantum_code):
-    """Processa dados de manifestação para o workflow"""
-    engine = QuantumManifestationEngine()
-    geometry = SacredGeometryGenerator()
-    audio = AudioFrequencyGenerator()
-    viz = VisualizationEngine()
-    gnostic_inducer = GnosticStateInducer(audio)
+SCALAR_TESLA_PAIRS = [
+    {'freq1': 396, 'freq2': 576},
+    {'freq1': 528, 'freq2': 708},
+    {'freq1': 852, 'freq2': 1032}
+]
+
+# Pulso visual em 528 Hz (MI) descido sete oitavas: ~4,1 Hz, na faixa theta
+SOLFEGGIO_PULSE_HZ = 528 / 2 ** 7
+
+def solfeggio_motion(duration, fps=24, turns=1.0, pulse_hz=SOLFEGGIO_PULSE_HZ, pulse_depth=0.08):
+    """Trajetória por quadro (ângulo, escala, opacidade) sincronizada com generate_solfeggio_sequence
+
+    A escala pulsa em ``pulse_hz`` e, junto com a opacidade, segue o mesmo
+    envelope exp(-0.1·|t - duração/2|) da sequência Solfeggio; o padrão dá
+    ``turns`` voltas completas ao longo da duração.
+    """
+    t = np.arange(int(round(duration * fps))) / fps
+    envelope = np.exp(-0.1 * np.abs(t - duration / 2))
+    angles = 2 * np.pi * turns * t / duration
+    scales = 1 + pulse_depth * envelope * np.sin(2 * np.pi * pulse_hz * t)
+    opacities = 0.4 + 0.6 * envelope
+    return angles, scales, opacities
+
+class GeometryAnimator:
+    """Anima uma GeometryDescription com rotação/escala/opacidade por quadro
+
+    Os vértices são extraídos uma única vez para um array (N, 2) relativo ao
+    centro; as transformações de um lote de quadros são aplicadas de uma vez
+    com NumPy e cada quadro é desenhado num buffer RGBA reciclado.
+    Elipses são tratadas como centro + raios (rotacionam em torno do centro
+    da tela e apenas escalam).
+    """
+    def __init__(self, geometry, size=None, background=None):
+        self.size = tuple(size or geometry.size)
+        self.background = background or geometry.background or (0, 0, 0, 0)
+        scale_x = self.size[0] / geometry.size[0]
+        scale_y = self.size[1] / geometry.size[1]
+        self.stroke_scale = min(scale_x, scale_y)
+        self.center = np.array([self.size[0] / 2, self.size[1] / 2])
+        points = []
+        radii = []
+        self.primitives = []
+        for kind, xy, fill, outline, width in geometry.primitives:
+            xy = np.asarray(xy, dtype=np.float64) * (scale_x, scale_y)
+            if kind == 'ellipse':
+                self.primitives.append((kind, len(points), 1, len(radii), fill, outline, width))
+                points.append((xy[0] + xy[1]) / 2)
+                radii.append((xy[1] - xy[0]) / 2)
+            else:
+                self.primitives.append((kind, len(points), len(xy), None, fill, outline, width))
+                points.extend(xy)
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2) - self.center
+        self.radii = np.asarray(radii, dtype=np.float64).reshape(-1, 2)
+        self._buffer = None
+        self._draw = None
+
+    def transform(self, angles, scales):
+        """Vértices (F, N, 2) e raios (F, E, 2) de todos os quadros do lote"""
+        angles = np.asarray(angles, dtype=np.float64)
+        scales = np.asarray(scales, dtype=np.float64)
+        cos = (np.cos(angles) * scales)[:, None]
+        sin = (np.sin(angles) * scales)[:, None]
+        x, y = self.points[:, 0], self.points[:, 1]
+        points = np.empty((len(angles), len(self.points), 2))
+        points[..., 0] = x * cos - y * sin + self.center[0]
+        points[..., 1] = x * sin + y * cos + self.center[1]
+        return points, self.radii * scales[:, None, None]
+
+    @staticmethod
+    def _fade(color, opacity):
+        if color is None or opacity >= 1:
+            return color
+        alpha = color[3] if len(color) > 3 else 255
+        return tuple(color[:3]) + (int(alpha * opacity),)
+
+    def iter_frames(self, angles, scales, opacities=None):
+        """Desenha os quadros em sequência no mesmo buffer (cada quadro vale até o próximo)"""
+        if self._buffer is None:
+            self._buffer = Image.new('RGBA', self.size, self.background)
+            self._draw = ImageDraw.Draw(self._buffer)
+        draw = self._draw
+        points, radii = self.transform(angles, scales)
+        if opacities is None:
+            opacities = np.ones(len(points))
+        box = (0, 0) + self.size
+        for frame_points, frame_radii, scale, opacity in zip(points, radii, scales, opacities):
+            self._buffer.paste(self.background, box)
+            for kind, start, count, radius_index, fill, outline, width in self.primitives:
+                fill = self._fade(fill, opacity)
+                outline = self._fade(outline, opacity)
+                if width:
+                    width = max(1, round(width * self.stroke_scale))
+                if kind == 'ellipse':
+                    cx, cy = frame_points[start]
+                    rx, ry = frame_radii[radius_index]
+                    draw.ellipse([cx - rx, cy - ry, cx + rx, cy + ry], fill=fill, outline=outline, width=width)
+                else:
+                    xy = [tuple(point) for point in frame_points[start:start + count]]
+                    if kind == 'polygon':
+                        draw.polygon(xy, fill=fill, outline=outline, width=width)
+                    else:
+                        draw.line(xy, fill=fill, width=width)
+            yield self._buffer
+
+class PngFrameEncoder:
+    """Codifica um quadro como PNG completo (sequência de imagens)"""
+    def __init__(self, compress_level=6):
+        self.compress_level = compress_level
+
+    def __call__(self, frame):
+        buffer = BytesIO()
+        frame.save(buffer, format='PNG', compress_level=self.compress_level)
+        return buffer.getvalue()
+
+class ApngFrameEncoder:
+    """Codifica um quadro RGBA como dados zlib de PNG (filtro Up vetorizado) para o ApngStreamWriter"""
+    def __init__(self, compress_level=6):
+        self.compress_level = compress_level
+
+    def __call__(self, frame):
+        import zlib
+        rows = np.asarray(frame).reshape(frame.size[1], -1)
+        filtered = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 2
+        filtered[0, 1:] = rows[0]
+        np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+        return zlib.compress(filtered.tobytes(), self.compress_level)
+
+class GifFrameEncoder:
+    """Quantiza um quadro na paleta global e codifica o bloco GIF (LZW) do quadro"""
+    def __init__(self, palette, duration_ms):
+        self.palette = palette
+        self.duration_ms = duration_ms
+        self._palette_image = None
+
+    def __call__(self, frame):
+        from PIL import GifImagePlugin
+        if self._palette_image is None:
+            self._palette_image = Image.new('P', (1, 1))
+            self._palette_image.putpalette(self.palette)
+        quantized = frame.convert('RGB').quantize(palette=self._palette_image, dither=Image.Dither.NONE)
+        return b''.join(GifImagePlugin.getdata(quantized, duration=self.duration_ms))
+
+class FrameSequenceWriter:
+    """Grava cada quadro como ``<diretório>/frame_00000.png``"""
+    background = None
+
+    def __init__(self, directory, pattern='frame_{:05d}.png', compress_level=6):
+        self.directory = directory
+        self.pattern = pattern
+        self.encoder = PngFrameEncoder(compress_level)
+        self.paths = []
+        os.makedirs(directory, exist_ok=True)
+
+    def prepare(self, sample_frames, frame_count):
+        pass
+
+    def write(self, payload):
+        path = os.path.join(self.directory, self.pattern.format(len(self.paths)))
+        with open(path, 'wb') as f:
+            f.write(payload)
+        self.paths.append(path)
+
+    def close(self):
+        return self.paths
+
+class ApngStreamWriter:
+    """Escreve um PNG animado quadro a quadro, sem manter os quadros em memória"""
+    background = None
+
+    def __init__(self, path, size, fps=24, loops=0, compress_level=6):
+        self.path = path
+        self.size = tuple(size)
+        self.fps = fps
+        self.loops = loops
+        self.encoder = ApngFrameEncoder(compress_level)
+        self._file = None
+        self._frame_count = None
+        self._frames = 0
+        self._sequence = 0
+
+    def _chunk(self, kind, data):
+        import zlib
+        self._file.write(struct.pack('>I', len(data)) + kind + data +
+                         struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    def prepare(self, sample_frames, frame_count):
+        self._frame_count = frame_count
+        self._file = open(self.path, 'wb')
+        self._file.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', self.size[0], self.size[1], 8, 6, 0, 0, 0))
+        self._chunk(b'acTL', struct.pack('>II', frame_count, self.loops))
+
+    def write(self, payload):
+        self._chunk(b'fcTL', struct.pack('>IIIIIHHBB', self._sequence, self.size[0], self.size[1], 0, 0,
+                                         int(round(1000 / self.fps)), 1000, 0, 0))
+        self._sequence += 1
+        if self._frames == 0:
+            self._chunk(b'IDAT', payload)
+        else:
+            self._chunk(b'fdAT', struct.pack('>I', self._sequence) + payload)
+            self._sequence += 1
+        self._frames += 1
+
+    def close(self):
+        self._chunk(b'IEND', b'')
+        self._file.close()
+        if self._frames != self._frame_count:
+            raise ValueError(f"APNG declarou {self._frame_count} quadros mas recebeu {self._frames}")
+        return self.path
+
+class GifStreamWriter:
+    """Escreve um GIF animado quadro a quadro com paleta global tirada de quadros de amostra"""
+    background = (0, 0, 0, 255)
+
+    def __init__(self, path, fps=24, loop=0):
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+        self.encoder = None
+        self._file = None
+        self._frame_count = None
+        self._frames = 0
+
+    def prepare(self, sample_frames, frame_count):
+        from PIL import GifImagePlugin
+        self._frame_count = frame_count
+        width, height = sample_frames[0].size
+        montage = Image.new('RGB', (width, height * len(sample_frames)))
+        for i, frame in enumerate(sample_frames):
+            montage.paste(frame.convert('RGB'), (0, i * height))
+        palette_image = montage.quantize(256)
+        palette = palette_image.getpalette()
+        duration_ms = int(round(1000 / self.fps))
+        self.encoder = GifFrameEncoder(palette, duration_ms)
+        first = palette_image.crop((0, 0, width, height))
+        header, _ = GifImagePlugin.getheader(first, info={'loop': self.loop, 'duration': duration_ms})
+        self._file = open(self.path, 'wb')
+        self._file.write(b''.join(header))
+
+    def write(self, payload):
+        self._file.write(payload)
+        self._frames += 1
+
+    def close(self):
+        self._file.write(b';')
+        self._file.close()
+        if self._frames != self._frame_count:
+            raise ValueError(f"GIF declarou {self._frame_count} quadros mas recebeu {self._frames}")
+        return self.path
+
+# Estado de cada processo do pool de animação
+_animation_worker = None
+
+def _init_animation_worker(geometry, size, background, encoder):
+    global _animation_worker
+    _animation_worker = (GeometryAnimator(geometry, size, background), encoder)
+
+def _render_animation_chunk(angles, scales, opacities):
+    """Desenha e codifica um lote de quadros no processo do pool"""
+    animator, encoder = _animation_worker
+    return [encoder(frame) for frame in animator.iter_frames(angles, scales, opacities)]
+
+def render_animation(geometry, writer, duration=10, fps=24, size=None, motion=None,
+                     max_workers=None, chunk_frames=12, max_in_flight=None):
+    """Renderiza a animação de uma GeometryDescription para um escritor de quadros
+
+    ``motion`` é (ângulos, escalas, opacidades) por quadro; por padrão
+    ``solfeggio_motion(duration, fps)``. Os lotes de ``chunk_frames`` quadros
+    são desenhados e codificados num pool de processos e gravados em ordem;
+    no máximo ``max_in_flight`` lotes ficam pendentes, o que limita a memória.
+    ``max_workers=0`` desenha tudo no processo atual.
+    """
+    angles, scales, opacities = motion if motion is not None else solfeggio_motion(duration, fps)
+    frame_count = len(angles)
+    size = tuple(size or geometry.size)
+    background = writer.background
+    sampler = GeometryAnimator(geometry, size, background)
+    sample_indices = sorted({0, frame_count // 4, frame_count // 2, 3 * frame_count // 4})
+    sample_frames = [frame.copy() for frame in sampler.iter_frames(
+        angles[sample_indices], scales[sample_indices], opacities[sample_indices])]
+    writer.prepare(sample_frames, frame_count)
+    chunks = [slice(start, start + chunk_frames) for start in range(0, frame_count, chunk_frames)]
+    if max_workers == 0:
+        _init_animation_worker(geometry, size, background, writer.encoder)
+        for chunk in chunks:
+            for payload in _render_animation_chunk(angles[chunk], scales[chunk], opacities[chunk]):
+                writer.write(payload)
+        return writer.close()
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_animation_worker,
+                             initargs=(geometry, size, background, writer.encoder)) as executor:
+        limit = max_in_flight or 2 * (max_workers or os.cpu_count() or 1)
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= limit:
+                for payload in pending.popleft().result():
+                    writer.write(payload)
+            pending.append(executor.submit(_render_animation_chunk, angles[chunk], scales[chunk], opacities[chunk]))
+        while pending:
+            for payload in pending.popleft().result():
+                writer.write(payload)
+    return writer.close()
+
+class _SinkFile:
+    """Arquivo aberto por um ArtifactSink: conta os bytes e avisa o sink ao fechar"""
+    def __init__(self, raw, on_close):
+        self._raw = raw
+        self._on_close = on_close
+        self.bytes_written = 0
+
+    def write(self, data):
+        count = self._raw.write(data)
+        self.bytes_written += len(data) if count is None else count
+        return count
+
+    def seekable(self):
+        return self._raw.seekable()
+
+    def tell(self):
+        return self._raw.tell()
+
+    def seek(self, *args):
+        return self._raw.seek(*args)
+
+    def flush(self):
+        self._raw.flush()
+
+    def close(self):
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ArtifactSink:
+    """Destino dos artefatos de uma execução (diretório, memória ou pacote zip/tar)
+
+    ``open(nome)`` devolve um arquivo binário de escrita; ``write_bytes``
+    grava um conteúdo pronto; ``location(nome)`` é a referência devolvida no
+    resumo da manifestação. ``sizes`` guarda os bytes gravados por artefato.
+    """
+    def __init__(self):
+        self.sizes = {}
+        self._lock = threading.Lock()
+
+    def _open_raw(self, name):
+        raise NotImplementedError
+
+    def _finish(self, name, sink_file):
+        self.sizes[name] = sink_file.bytes_written
+
+    def open(self, name):
+        raw = self._open_raw(name)
+        return _SinkFile(raw, lambda sink_file: self._finish(name, sink_file))
+
+    def write_bytes(self, name, data):
+        with self.open(name) as f:
+            f.write(data)
+        return len(data)
+
+    def location(self, name):
+        return name
+
+    def stored_size(self, name):
+        """Tamanho de um artefato já persistido por execuções anteriores (None se não houver)"""
+        return None
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class DirectorySink(ArtifactSink):
+    """Grava cada artefato como arquivo em ``directory`` (comportamento histórico com '.')"""
+    def __init__(self, directory='.'):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def location(self, name):
+        return name if self.directory == '.' else os.path.join(self.directory, name)
+
+    def stored_size(self, name):
+        try:
+            return os.path.getsize(self.location(name))
+        except OSError:
+            return None
+
+    def _open_raw(self, name):
+        return open(self.location(name), 'wb')
+
+    def _finish(self, name, sink_file):
+        sink_file._raw.close()
+        super()._finish(name, sink_file)
+
+class MemorySink(ArtifactSink):
+    """Mantém os artefatos em memória: ``artifacts`` mapeia nome -> BytesIO"""
+    def __init__(self):
+        super().__init__()
+        self.artifacts = {}
+
+    def _open_raw(self, name):
+        buffer = BytesIO()
+        with self._lock:
+            self.artifacts[name] = buffer
+        return buffer
+
+    def getvalue(self, name):
+        return self.artifacts[name].getvalue()
+
+class ZipSink(ArtifactSink):
+    """Escreve os artefatos direto num zip (caminho ou arquivo, inclusive sem seek)
+
+    As entradas são gravadas em streaming, uma por vez; ``compression`` e
+    ``compresslevel`` seguem o zipfile. O padrão é ZIP_STORED: PNG já é
+    comprimido e as senoides dos WAVs quase não cedem ao deflate.
+    """
+    def __init__(self, target, compression=None, compresslevel=None):
+        super().__init__()
+        import zipfile
+        self.target = target
+        self._zip = zipfile.ZipFile(target, 'w', zipfile.ZIP_STORED if compression is None else compression,
+                                    compresslevel=compresslevel)
+
+    def location(self, name):
+        bundle = self.target if isinstance(self.target, (str, os.PathLike)) else 'bundle.zip'
+        return f'{bundle}:{name}'
+
+    def _open_raw(self, name):
+        # O zipfile só admite uma entrada aberta para escrita por vez
+        self._lock.acquire()
+        try:
+            return self._zip.open(name, 'w', force_zip64=True)
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def _finish(self, name, sink_file):
+        try:
+            sink_file._raw.close()
+        finally:
+            self._lock.release()
+        super()._finish(name, sink_file)
+
+    def close(self):
+        self._zip.close()
+
+class TarSink(ArtifactSink):
+    """Escreve os artefatos num tar em streaming (``mode`` 'w|' padrão, 'w|gz', ...)
+
+    O tar precisa do tamanho antes do conteúdo, então cada artefato passa por
+    um SpooledTemporaryFile (memória até ``spool_bytes``, disco acima disso).
+    """
+    def __init__(self, target, mode='w|', spool_bytes=8 * 1024 * 1024):
+        super().__init__()
+        import tarfile
+        self.target = target
+        self.spool_bytes = spool_bytes
+        if isinstance(target, (str, os.PathLike)):
+            self._tar = tarfile.open(target, mode)
+        else:
+            self._tar = tarfile.open(fileobj=target, mode=mode)
+
+    def location(self, name):
+        bundle = self.target if isinstance(self.target, (str, os.PathLike)) else 'bundle.tar'
+        return f'{bundle}:{name}'
+
+    def _open_raw(self, name):
+        return tempfile.SpooledTemporaryFile(max_size=self.spool_bytes)
+
+    def _finish(self, name, sink_file):
+        import tarfile
+        spool = sink_file._raw
+        info = tarfile.TarInfo(name)
+        info.size = spool.tell()
+        info.mtime = int(time.time())
+        spool.seek(0)
+        with self._lock:
+            self._tar.addfile(info, spool)
+        spool.close()
+        super()._finish(name, sink_file)
+
+    def close(self):
+        self._tar.close()
+
+def encode_png(img, compress_level=6):
+    """Codifica uma imagem PIL como PNG em memória"""
+    buffer = BytesIO()
+    img.save(buffer, format='PNG', compress_level=compress_level)
+    return buffer.getvalue()
+
+BUILD_INDEX_PATH = '.manifestation_build.sqlite'
+
+@functools.lru_cache(maxsize=1)
+def engine_fingerprint():
+    """SHA-256 do código-fonte deste módulo: qualquer mudança no motor invalida os artefatos"""
+    with open(__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class BuildIndex:
+    """Índice incremental (SQLite) dos artefatos já gerados, no estilo do make
+
+    Cada artefato persistido guarda o hash das entradas da etapa que o gerou
+    (nome da etapa, parâmetros e impressão digital do motor) e o tamanho
+    gravado. Uma etapa é reaproveitada quando o hash confere e todas as suas
+    saídas ainda existem no sink com o mesmo tamanho; sinks sem persistência
+    (memória, zip, tar) sempre refazem.
+    """
+    def __init__(self, path=BUILD_INDEX_PATH, fingerprint=None):
+        import sqlite3
+        self.path = path
+        self.fingerprint = fingerprint or engine_fingerprint()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS artifacts ('
+                             'location TEXT PRIMARY KEY, input_hash TEXT NOT NULL, '
+                             'size INTEGER NOT NULL, built_at TEXT NOT NULL)')
+
+    def input_hash(self, stage, **params):
+        """Hash estável das entradas de uma etapa"""
+        payload = json.dumps({'stage': stage, 'params': params, 'engine': self.fingerprint},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _key(sink, name):
+        return os.path.abspath(sink.location(name))
+
+    def is_fresh(self, sink, names, input_hash):
+        """True se todas as saídas existem no sink e foram geradas com estas entradas"""
+        for name in names:
+            size = sink.stored_size(name)
+            if size is None:
+                return False
+            with self._lock:
+                row = self._db.execute('SELECT input_hash, size FROM artifacts WHERE location = ?',
+                                       (self._key(sink, name),)).fetchone()
+            if row != (input_hash, size):
+                return False
+        return True
+
+    def record(self, sink, names, input_hash):
+        """Registra as saídas recém-gravadas de uma etapa"""
+        built_at = datetime.datetime.now().isoformat()
+        rows = []
+        for name in names:
+            size = sink.stored_size(name)
+            if size is not None:
+                rows.append((self._key(sink, name), input_hash, size, built_at))
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?)', rows)
+
+    def forget(self, sink=None, names=None):
+        """Remove entradas (todas, sem argumentos), forçando a reconstrução"""
+        with self._lock, self._db:
+            if names is None:
+                self._db.execute('DELETE FROM artifacts')
+            else:
+                self._db.executemany('DELETE FROM artifacts WHERE location = ?',
+                                     [(self._key(sink, name),) for name in names])
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _build_stage(build_index, report, stage, sink, names, input_hash):
+    """Consulta o índice para uma etapa e anota no relatório; True se ela precisa ser refeita"""
+    if build_index is not None and build_index.is_fresh(sink, names, input_hash):
+        report['reused'].append(stage)
+        return False
+    report['rebuilt'].append(stage)
+    return True
+
+def _code_suffix(quantum_code):
+    """Sufixo de arquivo derivado do código quântico"""
+    return quantum_code.replace("-", "_")
+
+def _announce_manifestation(encrypted_data, quantum_code):
+    """Verifica os dados recebidos e anuncia o processamento"""
     try:
-        decoded_data = base64.b64decode(encrypted_data).decode()
+        decoded_data = QuantumManifestationEngine().decrypt_manifestation_data(encrypted_data, quantum_code)
         print(f"Processando manifestação com código: {quantum_code}")
     except:
         print("Dados criptografados - processamento em modo seguro")
-    # Gerar artefatos visuais
-    flower_of_life = geometry.generate_flower_of_life()
-    flower_of_life.save(f'flower_of_life_{quantum_code.replace("-", "_")}.png')
-    merkaba = geometry.generate_merkaba()
-    merkaba.save(f'merkaba_{quantum_code.replace("-", "_")}.png')
-    sri_yantra = geometry.generate_sri_yantra()
-    sri_yantra.save(f'sri_yantra_{quantum_code.replace("-", "_")}.png')
-    metatron_star = geometry.generate_metatron_star()
-    metatron_star.save(f'metatron_star_{quantum_code.replace("-", "_")}.png')
-    # Gerar Pantáculo
-    pantacle_type = 'abundance'  # Simulação
-    pantacle = geometry.generate_pantacle(pantacle_type)
-    pantacle.save(f'pantacle_{pantacle_type}_{quantum_code.replace("-", "_")}.png')
-    # Gerar áudio
-    quantum_pulse = audio.generate_quantum_pulse(quantum_code)
-    audio.save_audio_wav(quantum_pulse, f'quantum_pulse_{quantum_code.replace("-", "_")}.wav')
-    gnostic_audio = gnostic_inducer.generate_theta_state_audio(duration=180)
-    audio.save_audio_wav(gnostic_audio, f'gnostic_induction_{quantum_code.replace("-", "_")}.wav')
-    scalar_pairs = [
-        {'freq1': 396, 'freq2': 576},
-        {'freq1': 528, 'freq2': 708},
-        {'freq1': 852, 'freq2': 1032}
-    ]
-    scalar_audio = audio.generate_scalar_waves(scalar_pairs, duration=30)
-    audio.save_audio_wav(scalar_audio, f'scalar_tesla_{quantum_code.replace("-", "_")}.wav')
-    combined_audio = quantum_pulse[:len(gnostic_audio)] * 0.5 + gnostic_audio * 0.3 + scalar_audio[:len(gnostic_audio)] * 0.2
-    audio.save_audio_wav(combined_audio, f'combined_manifestation_{quantum_code.replace("-", "_")}.wav')
+
+def _shared_visual_factories(geometry, pantacle_type, visual_format='png'):
+    """Nome -> (extensão, função sem argumentos) dos artefatos visuais que não dependem do código
+
+    Com ``visual_format='svg'`` os padrões geométricos saem como
+    GeometryDescription (sem rasterizar nem codificar PNG); o pantáculo
+    continua raster.
+    """
+    method = '{}_geometry' if visual_format == 'svg' else 'generate_{}'
+    extension = '.svg' if visual_format == 'svg' else '.png'
+    factories = {name: (extension, getattr(geometry, method.format(name)))
+                 for name in ('flower_of_life', 'merkaba', 'sri_yantra', 'metatron_star')}
+    factories[f'pantacle_{pantacle_type}'] = ('.png', functools.partial(geometry.generate_pantacle, pantacle_type))
+    return factories
+
+def _render_shared_visuals(geometry, pantacle_type, visual_format='png'):
+    """Gera os artefatos visuais que não dependem do código quântico"""
+    return {name: factory() for name, (_, factory)
+            in _shared_visual_factories(geometry, pantacle_type, visual_format).items()}
+
+def _visual_extension(artifact):
+    return '.svg' if isinstance(artifact, GeometryDescription) else '.png'
+
+def _save_visual(artifact, path):
+    """Grava um artefato visual (SVG para GeometryDescription, PNG para imagens)"""
+    if isinstance(artifact, GeometryDescription):
+        artifact.save_svg(path)
+    else:
+        artifact.save(path)
+
+def _encode_visual(artifact, compress_level=6):
+    """Bytes de um artefato visual: SVG para GeometryDescription, PNG para imagens"""
+    if isinstance(artifact, GeometryDescription):
+        return artifact.to_svg().encode('utf-8')
+    return encode_png(artifact, compress_level)
+
+def _render_code_artifacts(quantum_code, sink=None, compress_level=6, build_index=None, report=None):
+    """Gera os artefatos de áudio e do campo quântico que dependem do código
+
+    Com ``build_index`` (BuildIndex) as etapas 'audio' e 'quantum_field'
+    cujas saídas estão atualizadas são puladas e anotadas em ``report``.
+    """
+    sink = sink or DirectorySink()
+    report = report if report is not None else {'rebuilt': [], 'reused': []}
+    audio = AudioFrequencyGenerator()
+    viz = VisualizationEngine()
+    gnostic_inducer = GnosticStateInducer(audio)
+    suffix = _code_suffix(quantum_code)
+    # Grafo de áudio: cada faixa é sintetizada uma vez e alimenta o próprio WAV e a mixagem
+    quantum_pulse = SourceNode(lambda: audio.generate_quantum_pulse(quantum_code), 'quantum_pulse')
+    gnostic_audio = SourceNode(lambda: gnostic_inducer.generate_theta_state_audio(duration=180, stereo=True),
+                               'gnostic_induction')
+    scalar_audio = SourceNode(lambda: audio.generate_scalar_waves(SCALAR_TESLA_PAIRS, duration=30), 'scalar_tesla')
+    # Faixas mais curtas que a indução gnóstica entram apenas no trecho inicial;
+    # as faixas mono são somadas aos dois canais da indução binaural
+    combined_audio = MixNode(GainNode(quantum_pulse, 0.5), GainNode(gnostic_audio, 0.3), GainNode(scalar_audio, 0.2))
+    outputs = [(quantum_pulse, f'quantum_pulse_{suffix}.wav'),
+               (gnostic_audio, f'gnostic_induction_{suffix}.wav'),
+               (scalar_audio, f'scalar_tesla_{suffix}.wav'),
+               (combined_audio, f'combined_manifestation_{suffix}.wav')]
+    audio_names = [filename for _, filename in outputs]
+    audio_hash = build_index and build_index.input_hash('audio', quantum_code=quantum_code)
+    if _build_stage(build_index, report, 'audio', sink, audio_names, audio_hash):
+        graph = AudioGraph()
+        for node, filename in outputs:
+            graph.sink(node, functools.partial(_save_traced_wav, audio, filename=filename, sink=sink))
+        with get_tracer().stage('audio_graph'):
+            graph.run()
+        if build_index is not None:
+            build_index.record(sink, audio_names, audio_hash)
     # Criar visualização do campo
-    field_image = viz.create_quantum_field_visualization(quantum_code)
+    field_name = f'quantum_field_{suffix}.png'
+    field_hash = build_index and build_index.input_hash('quantum_field', quantum_code=quantum_code,
+                                                        compress_level=compress_level)
+    if not _build_stage(build_index, report, 'quantum_field', sink, [field_name], field_hash):
+        return sink.location(field_name)
+    with get_tracer().stage('quantum_field') as stage:
+        field_image = viz.create_quantum_field_visualization(quantum_code, output_path=field_name, sink=sink,
+                                                             compress_level=compress_level)
+        stage.record_bytes(sink.sizes.get(field_name, 0))
+    if build_index is not None:
+        build_index.record(sink, [field_name], field_hash)
+    return field_image
+
+def _save_traced_wav(audio, audio_data, filename, sink):
+    """Grava um WAV do grafo de áudio como etapa própria do tracer"""
+    with get_tracer().stage('encode_wav', file=filename) as stage, sink.open(filename) as f:
+        audio.save_audio_wav(audio_data, f)
+        stage.record_bytes(f.bytes_written)
+
+def _manifestation_result(quantum_code, visual_files, field_image, sink=None):
+    """Monta o resumo de artefatos de uma manifestação"""
+    sink = sink or DirectorySink()
+    suffix = _code_suffix(quantum_code)
     return {
-        'visual_artifacts': [
-            f'flower_of_life_{quantum_code.replace("-", "_")}.png',
-            f'merkaba_{quantum_code.replace("-", "_")}.png',
-            f'sri_yantra_{quantum_code.replace("-", "_")}.png',
-            f'metatron_star_{quantum_code.replace("-", "_")}.png',
-            f'pantacle_{pantacle_type}_{quantum_code.replace("-", "_")}.png',
-            field_image
-        ],
-        'audio_artifacts': [
-            f'quantum_pulse_{quantum_code.replace("-", "_")}.wav',
-            f'gnostic_induction_{quantum_code.replace("-", "_")}.wav',
-            f'scalar_tesla_{quantum_code.replace("-", "_")}.wav',
-            f'combined_manifestation_{quantum_code.replace("-", "_")}.wav'
-        ],
+        'visual_artifacts': list(visual_files) + [field_image],
+        'audio_artifacts': [sink.location(f'{name}_{suffix}.wav')
+                            for name in ('quantum_pulse', 'gnostic_induction', 'scalar_tesla',
+                                         'combined_manifestation')],
         'quantum_code': quantum_code,
         'timestamp': datetime.datetime.now().isoformat()
     }
 
-if __name__ == "__main__":
+def _link_or_copy(source, destination, link=True):
+    """Replica um artefato compartilhado via hard link, com cópia como fallback"""
+    if os.path.exists(destination):
+        os.remove(destination)
+    if link:
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            pass
+    shutil.copyfile(source, destination)
+
+def process_manifestation_data(encrypted_data, quantum_code, tracer=None, geometry=None, visual_format='png',
+                               sink=None, compress_level=6, encode_workers=4, build_index=None):
+    """Processa dados de manifestação para o workflow
+
+    ``tracer`` (ex.: StageTracer) mede cada etapa desta execução; sem ele é
+    usado o tracer do processo (ver set_tracer), que por padrão não faz nada.
+    ``geometry`` permite reaproveitar um SacredGeometryGenerator (e o seu
+    ArtifactCache) entre execuções num processo de longa duração.
+    ``visual_format='svg'`` grava os padrões geométricos como SVG.
+    ``sink`` (ArtifactSink) recebe todos os artefatos; o padrão é o
+    diretório atual. Os PNGs são codificados com ``compress_level`` num pool
+    de ``encode_workers`` threads, em paralelo com a síntese de áudio.
+    ``build_index`` (BuildIndex) torna a execução incremental: etapas cujas
+    entradas não mudaram e cujas saídas ainda existem são reaproveitadas, e
+    o resumo ganha ``build`` com as etapas refeitas e reaproveitadas.
+    """
+    previous = set_tracer(tracer) if tracer is not None else None
+    try:
+        active = get_tracer()
+        with active.run('process_manifestation_data', quantum_code=quantum_code):
+            geometry = geometry or SacredGeometryGenerator()
+            with active.stage('announce'):
+                _announce_manifestation(encrypted_data, quantum_code)
+            # Gerar artefatos visuais
+            pantacle_type = 'abundance'  # Simulação
+            sink = sink or DirectorySink()
+            report = {'rebuilt': [], 'reused': []}
+            pending = {}
+            visual_files = []
+            for name, (extension, factory) in _shared_visual_factories(geometry, pantacle_type,
+                                                                       visual_format).items():
+                filename = f'{name}_{_code_suffix(quantum_code)}{extension}'
+                visual_files.append(sink.location(filename))
+                input_hash = build_index and build_index.input_hash(
+                    'visual', name=name, visual_format=visual_format, compress_level=compress_level,
+                    pantacle_url=geometry.pantacle_urls.get(pantacle_type) if name.startswith('pantacle_') else None)
+                if _build_stage(build_index, report, filename, sink, [filename], input_hash):
+                    pending[filename] = (factory, input_hash)
+            with active.stage('shared_visuals'):
+                visuals = {filename: factory() for filename, (factory, _) in pending.items()}
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=encode_workers) as encoder:
+                encoded = {filename: encoder.submit(_encode_visual, artifact, compress_level)
+                           for filename, artifact in visuals.items()}
+                # Gerar áudio e campo quântico enquanto os PNGs são codificados
+                with active.stage('code_artifacts'):
+                    field_image = _render_code_artifacts(quantum_code, sink, compress_level, build_index, report)
+                for filename, future in encoded.items():
+                    with active.stage(f'write_{filename.rsplit(".", 1)[1]}', file=filename) as stage:
+                        stage.record_bytes(sink.write_bytes(filename, future.result()))
+                    if build_index is not None:
+                        build_index.record(sink, [filename], pending[filename][1])
+            result = _manifestation_result(quantum_code, visual_files, field_image, sink)
+            if build_index is not None:
+                result['build'] = report
+            return result
+    finally:
+        if previous is not None:
+            set_tracer(previous)
+
+def _batch_code_artifacts(quantum_code, directory, compress_level=6, build_index_path=None, fingerprint=None):
+    """Artefatos de um código num processo do pool de process_manifestation_batch; devolve o relatório"""
+    report = {'rebuilt': [], 'reused': []}
+    sink = DirectorySink(directory)
+    if build_index_path is None:
+        _render_code_artifacts(quantum_code, sink, compress_level, None, report)
+        return report
+    with BuildIndex(build_index_path, fingerprint) as build_index:
+        _render_code_artifacts(quantum_code, sink, compress_level, build_index, report)
+    return report
+
+def _code_artifact_names(quantum_code):
+    """Arquivos gerados por _render_code_artifacts para um código"""
+    suffix = _code_suffix(quantum_code)
+    return [f'{name}_{suffix}.wav' for name in ('quantum_pulse', 'gnostic_induction', 'scalar_tesla',
+                                                'combined_manifestation')] + [f'quantum_field_{suffix}.png']
+
+def process_manifestation_batch(manifestations, max_workers=None, link=True, visual_format='png', sink=None,
+                                tracer=None, build_index=None, compress_level=6):
+    """Processa vários pares (dados criptografados, código quântico) de uma vez
+
+    A geometria sagrada e o pantáculo são desenhados e codificados uma única
+    vez e replicados para cada código (hard link com ``link`` num
+    DirectorySink); áudio e campo quântico rodam num pool de
+    ``max_workers`` processos (``max_workers=0`` processa no próprio
+    processo). ``sink``, ``tracer`` e ``build_index`` funcionam como em
+    process_manifestation_data. Códigos repetidos são processados uma vez
+    (vale o primeiro par) e cada entrada recebe o seu resumo, na ordem.
+    """
+    manifestations = list(manifestations)
+    if not manifestations:
+        return []
+    unique = {}
+    for encrypted_data, quantum_code in manifestations:
+        unique.setdefault(quantum_code, encrypted_data)
+    previous = set_tracer(tracer) if tracer is not None else None
+    try:
+        active = get_tracer()
+        with active.run('process_manifestation_batch', codes=len(unique)):
+            geometry = SacredGeometryGenerator()
+            pantacle_type = 'abundance'  # Simulação
+            sink = sink or DirectorySink()
+            reports = {quantum_code: {'rebuilt': [], 'reused': []} for quantum_code in unique}
+            visual_files = {quantum_code: [] for quantum_code in unique}
+            with active.stage('announce'):
+                for quantum_code, encrypted_data in unique.items():
+                    _announce_manifestation(encrypted_data, quantum_code)
+            for name, (extension, factory) in _shared_visual_factories(geometry, pantacle_type,
+                                                                       visual_format).items():
+                input_hash = build_index and build_index.input_hash(
+                    'visual', name=name, visual_format=visual_format, compress_level=compress_level,
+                    pantacle_url=geometry.pantacle_urls.get(pantacle_type) if name.startswith('pantacle_') else None)
+                pending = []
+                for quantum_code in unique:
+                    filename = f'{name}_{_code_suffix(quantum_code)}{extension}'
+                    visual_files[quantum_code].append(sink.location(filename))
+                    if _build_stage(build_index, reports[quantum_code], filename, sink, [filename], input_hash):
+                        pending.append(filename)
+                if not pending:
+                    continue
+                with active.stage('shared_visuals', visual=name):
+                    data = _encode_visual(factory(), compress_level)
+                for filename in pending:
+                    with active.stage(f'write_{extension[1:]}', file=filename) as stage:
+                        if isinstance(sink, DirectorySink) and link and filename != pending[0]:
+                            _link_or_copy(sink.location(pending[0]), sink.location(filename), link)
+                            sink.sizes[filename] = len(data)
+                        else:
+                            stage.record_bytes(sink.write_bytes(filename, data))
+                    if build_index is not None:
+                        build_index.record(sink, [filename], input_hash)
+            with active.stage('code_artifacts'):
+                if max_workers == 0:
+                    for quantum_code in unique:
+                        _render_code_artifacts(quantum_code, sink, compress_level, build_index,
+                                               reports[quantum_code])
+                else:
+                    _batch_code_artifacts_in_pool(unique, sink, max_workers, compress_level, build_index, reports)
+            results = {}
+            for quantum_code in unique:
+                field_image = sink.location(f'quantum_field_{_code_suffix(quantum_code)}.png')
+                results[quantum_code] = _manifestation_result(quantum_code, visual_files[quantum_code],
+                                                              field_image, sink)
+                if build_index is not None:
+                    results[quantum_code]['build'] = reports[quantum_code]
+            return [dict(results[quantum_code]) for _, quantum_code in manifestations]
+    finally:
+        if previous is not None:
+            set_tracer(previous)
+
+def _batch_code_artifacts_in_pool(codes, sink, max_workers, compress_level, build_index, reports):
+    """Gera os artefatos de cada código num pool de processos e os entrega ao ``sink``
+
+    Num DirectorySink os processos gravam direto no diretório (e consultam o
+    mesmo BuildIndex); nos demais sinks gravam num diretório temporário de
+    onde cada arquivo é copiado em fluxo para o sink e removido.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    direct = isinstance(sink, DirectorySink)
+    directory = os.path.abspath(sink.directory) if direct else tempfile.mkdtemp(prefix='.manifestation_batch_')
+    index_args = (build_index.path, build_index.fingerprint) if direct and build_index is not None else (None, None)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {quantum_code: executor.submit(_batch_code_artifacts, quantum_code, directory,
+                                                     compress_level, *index_args)
+                       for quantum_code in codes}
+            for quantum_code, future in futures.items():
+                report = future.result()
+                for key in ('rebuilt', 'reused'):
+                    reports[quantum_code][key].extend(report[key])
+                for name in _code_artifact_names(quantum_code):
+                    if direct:
+                        sink.sizes[name] = os.path.getsize(sink.location(name))
+                        continue
+                    path = os.path.join(directory, name)
+                    with open(path, 'rb') as source, sink.open(name) as target:
+                        shutil.copyfileobj(source, target)
+                    os.remove(path)
+    finally:
+        if not direct:
+            shutil.rmtree(directory, ignore_errors=True)
+
+LUNAR_PHASE_NAMES = (
+    (0, 45, 'Nova'),
+    (45, 90, 'Crescente'),
+    (90, 135, 'Quarto Crescente'),
+    (135, 180, 'Gibosa Crescente'),
+    (180, 225, 'Cheia'),
+    (225, 270, 'Gibosa Minguante'),
+    (270, 315, 'Quarto Minguante'),
+    (315, 360, 'Minguante')
+)
+
+RADIONIC_PATTERNS = ('merkaba', 'flower_of_life', 'sri_yantra', 'torus', 'metatron_star')
+
+def lunar_phase_name(degrees):
+    """Nome da fase lunar para um ângulo em graus"""
+    for start, end, name in LUNAR_PHASE_NAMES:
+        if start <= degrees < end:
+            return name
+    return 'Nova'
+
+def energy_frequencies(now=None):
+    """Tabela de frequências do ciclo de energização (formato de energy_frequencies.json)"""
+    timestamp = (now or datetime.datetime.now()).timestamp()
+    base_freq = int(timestamp) % 1000
+    return {
+        'solfeggio': dict(QuantumManifestationEngine().solfeggio_frequencies),
+        'harmonics': [round(base_freq * (1.618 ** i) % 1000 + 200, 2) for i in range(7)],
+        'binaural': {'base': 200, 'beat': 4},
+        'scalar_pairs': [dict(pair) for pair in SCALAR_TESLA_PAIRS],
+        'base_frequency': base_freq,
+        'timestamp': timestamp
+    }
+
+def tesla_numbers(now=None):
+    """Matriz 3-6-9, soma Tesla do timestamp, ressonância escalar e Fibonacci(15)"""
+    tesla_matrix = []
+    for i in range(3):
+        row = []
+        for j in range(3):
+            value = ((i + 1) * (j + 1) * 3) % 10
+            if value in (3, 6, 9):
+                value = value * 9
+            row.append(value)
+        tesla_matrix.append(row)
+    fib = [0, 1]
+    for i in range(2, 15):
+        fib.append(fib[i-1] + fib[i-2])
+    timestamp = int((now or datetime.datetime.now()).timestamp())
+    tesla_sum = sum(int(d) for d in str(timestamp) if int(d) in (3, 6, 9))
+    return {'matrix': tesla_matrix, 'sum': tesla_sum, 'scalar_resonance': tesla_sum * 180, 'fib_15': fib[14]}
+
+class PipelineRunner:
+    """Executa etapas do ciclo de energização num único processo e monta o manifesto das saídas
+
+    Cada etapa grava os arquivos no ``sink`` (diretório atual por padrão) e
+    devolve valores no formato CHAVE=valor usado nas saídas do GitHub Actions.
+    """
+    STAGES = ('lunar', 'frequencies', 'tesla', 'energy-pattern', 'audio', 'radionic', 'pantacles',
+              'manifestation')
+    DEFAULT_STAGES = STAGES[:-1]
+
+    def __init__(self, sink=None, now=None, size=(800, 800), visual_format='png', compress_level=6,
+                 quantum_code=None, encrypted_data=None, pantacle_store=None):
+        self.sink = sink or DirectorySink()
+        self.now = now or datetime.datetime.now()
+        self.size = tuple(size)
+        self.visual_format = visual_format
+        self.compress_level = compress_level
+        self.quantum_code = quantum_code
+        self.encrypted_data = encrypted_data
+        self.engine = QuantumManifestationEngine()
+        self.geometry = SacredGeometryGenerator(pantacle_store=pantacle_store)
+        self._frequencies = None
+
+    @property
+    def frequencies(self):
+        if self._frequencies is None:
+            self._frequencies = energy_frequencies(self.now)
+        return self._frequencies
+
+    def _write_visuals(self, artifacts):
+        """Codifica as imagens num pool de threads e grava no sink; retorna as referências"""
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=4) as encoder:
+            futures = {name: encoder.submit(_encode_visual, artifact, self.compress_level)
+                       for name, artifact in artifacts.items()}
+            locations = []
+            for name, future in futures.items():
+                self.sink.write_bytes(name, future.result())
+                locations.append(self.sink.location(name))
+        return locations
+
+    def stage_lunar(self):
+        degrees = self.engine.calculate_lunar_phase(self.now)
+        return {'LUNAR_PHASE': lunar_phase_name(degrees), 'LUNAR_DEGREES': f'{degrees:.1f}'}, []
+
+    def stage_frequencies(self):
+        self.sink.write_bytes('energy_frequencies.json', json.dumps(self.frequencies).encode())
+        return {'FREQ_GENERATED': 'true'}, [self.sink.location('energy_frequencies.json')]
+
+    def stage_tesla(self):
+        tesla = tesla_numbers(self.now)
+        return {
+            'TESLA_MATRIX': tesla['matrix'],
+            'TESLA_SUM': tesla['sum'],
+            'SCALAR_RESONANCE': tesla['scalar_resonance'],
+            'FIB_15': tesla['fib_15']
+        }, []
+
+    def stage_energy_pattern(self):
+        img = VisualizationEngine().render_scalar_energy_pattern(self.frequencies['scalar_pairs'],
+                                                                 t=self.frequencies['timestamp'] * 0.001)
+        return {}, self._write_visuals({'quantum_energy_pattern.png': img})
+
+    def stage_audio(self):
+        audio = AudioFrequencyGenerator()
+        with self.sink.open('solfeggio_binaural_scalar.wav') as f:
+            audio.save_audio_wav(audio.generate_energy_mix(self.frequencies, duration=30), f)
+        return {}, [self.sink.location('solfeggio_binaural_scalar.wav')]
+
+    def stage_radionic(self, patterns=RADIONIC_PATTERNS):
+        artifacts = {}
+        for name in patterns:
+            if self.visual_format == 'svg':
+                artifacts[f'radionic_{name}.svg'] = getattr(self.geometry, f'{name}_geometry')(self.size)
+            else:
+                artifacts[f'radionic_{name}.png'] = getattr(self.geometry, f'generate_{name}')(size=self.size)
+        return {}, self._write_visuals(artifacts)
+
+    def stage_pantacles(self):
+        store = self.geometry.pantacle_store or get_default_pantacle_store()
+        if not store.offline:
+            store.prefetch(self.geometry.pantacle_urls)
+        artifacts = {f'pantacle_{name}.png': self.geometry.generate_pantacle(name, self.size)
+                     for name in self.geometry.pantacle_urls}
+        return {}, self._write_visuals(artifacts)
+
+    def stage_manifestation(self):
+        if not self.quantum_code or self.encrypted_data is None:
+            raise ValueError("A etapa 'manifestation' requer código quântico e dados criptografados")
+        result = process_manifestation_data(self.encrypted_data, self.quantum_code, geometry=self.geometry,
+                                            visual_format=self.visual_format, sink=self.sink,
+                                            compress_level=self.compress_level)
+        return {'QUANTUM_CODE': self.quantum_code}, result['visual_artifacts'] + result['audio_artifacts']
+
+    def run(self, stages=None):
+        """Executa as etapas na ordem pedida e retorna o manifesto (dict serializável em JSON)"""
+        stages = list(stages or self.DEFAULT_STAGES)
+        unknown = [stage for stage in stages if stage not in self.STAGES]
+        if unknown:
+            raise ValueError(f"Etapas desconhecidas: {', '.join(unknown)} (disponíveis: {', '.join(self.STAGES)})")
+        manifest = {'created': datetime.datetime.now().isoformat(), 'now': self.now.isoformat(),
+                    'stages': {}, 'outputs': {}, 'files': []}
+        for stage in stages:
+            started = time.perf_counter()
+            with get_tracer().stage(f'cli:{stage}'):
+                outputs, files = getattr(self, 'stage_' + stage.replace('-', '_'))()
+            manifest['stages'][stage] = {'outputs': outputs, 'files': files,
+                                         'duration_s': round(time.perf_counter() - started, 4)}
+            manifest['outputs'].update(outputs)
+            manifest['files'].extend(files)
+        return manifest
+
+def _open_sink(output_dir=None, bundle=None):
+    """Sink da linha de comando: pacote .zip/.tar[.gz] em ``bundle`` ou o diretório ``output_dir``"""
+    if bundle:
+        if bundle.endswith('.zip'):
+            return ZipSink(bundle)
+        return TarSink(bundle, 'w|gz' if bundle.endswith(('.tar.gz', '.tgz')) else 'w|')
+    return DirectorySink(output_dir or '.')
+
+def _write_github_output(path, outputs):
+    with open(path, 'a', encoding='utf-8') as f:
+        for key, value in outputs.items():
+            f.write(f'{key}={value}\n')
+
+def _print_json(data):
+    print(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+
+def _parse_now(value):
+    return datetime.datetime.fromisoformat(value) if value else None
+
+def _legacy_demo():
     engine = QuantumManifestationEngine()
     numerology = engine.calculate_advanced_numerology("João Silva", "15/08/1990")
     quantum_code = engine.generate_quantum_code("Eu sou próspero e abundante", "João Silva", "15/08/1990")
@@ -576,3 +3660,151 @@ if __name__ == "__main__":
     print(f"Fase Lunar: {engine.calculate_lunar_phase():.1f}°")
     sigil = engine.generate_austin_spare_sigil("Eu sou próspero e abundante")
     print(f"Sigilo: {sigil}")
+
+def main(argv=None):
+    """Linha de comando: ``python -m quantum_manifestation_engine <subcomando>`` (sem argumentos: demonstração)"""
+    import argparse
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv:
+        _legacy_demo()
+        return 0
+    parser = argparse.ArgumentParser(prog='python -m quantum_manifestation_engine',
+                                     description='Sistema Avançado de Tecnomagia Quântica')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    lunar = commands.add_parser('lunar', help='Fase lunar atual (ou de --now)')
+    lunar.add_argument('--now', help='Data/hora ISO 8601 fixa')
+    lunar.add_argument('--github-output', help='Acrescenta LUNAR_PHASE/LUNAR_DEGREES neste arquivo')
+
+    numerology = commands.add_parser('numerology', help='Numerologia cabalística de um nome')
+    numerology.add_argument('name')
+    numerology.add_argument('birth_date', help='DD/MM/AAAA')
+
+    code = commands.add_parser('code', help='Gera um código quântico')
+    code.add_argument('intention')
+    code.add_argument('name')
+    code.add_argument('birth_date')
+    code.add_argument('--now', help='Data/hora ISO 8601 fixa (saída reprodutível)')
+
+    geometry = commands.add_parser('geometry', help='Padrões de geometria sagrada')
+    geometry.add_argument('--patterns', default=','.join(RADIONIC_PATTERNS))
+    geometry.add_argument('--size', type=int, default=800)
+    geometry.add_argument('--format', choices=('png', 'svg'), default='png')
+    geometry.add_argument('--output-dir', default='.')
+    geometry.add_argument('--bundle', help='Grava num único .zip/.tar[.gz]')
+
+    audio = commands.add_parser('audio', help='Síntese de áudio')
+    audio.add_argument('--kind', choices=('energy', 'solfeggio', 'binaural', 'theta', 'scalar'), default='energy')
+    audio.add_argument('--duration', type=float, default=30)
+    audio.add_argument('--output', help='Arquivo WAV (padrão: <kind>.wav)')
+    audio.add_argument('--sample-format', choices=('int16', 'int24', 'float32'), default='int16')
+    audio.add_argument('--now', help='Data/hora ISO 8601 fixa para as frequências do ciclo')
+
+    pipeline = commands.add_parser('pipeline', help='Processamento completo de uma manifestação')
+    pipeline.add_argument('encrypted_data')
+    pipeline.add_argument('quantum_code')
+    pipeline.add_argument('--format', choices=('png', 'svg'), default='png')
+    pipeline.add_argument('--output-dir', default='.')
+    pipeline.add_argument('--bundle', help='Grava num único .zip/.tar[.gz]')
+    pipeline.add_argument('--build-index', nargs='?', const=BUILD_INDEX_PATH,
+                          help=f'Índice SQLite para execução incremental (padrão: {BUILD_INDEX_PATH})')
+
+    run = commands.add_parser('run', help='Executa etapas escolhidas num único processo')
+    run.add_argument('--stages', default=','.join(PipelineRunner.DEFAULT_STAGES),
+                     help=f"Lista separada por vírgulas entre: {', '.join(PipelineRunner.STAGES)}")
+    run.add_argument('--now', help='Data/hora ISO 8601 fixa')
+    run.add_argument('--size', type=int, default=800)
+    run.add_argument('--format', choices=('png', 'svg'), default='png')
+    run.add_argument('--compress-level', type=int, default=6)
+    run.add_argument('--output-dir', default='.')
+    run.add_argument('--bundle', help='Grava num único .zip/.tar[.gz]')
+    run.add_argument('--manifest', help='Grava o manifesto JSON neste arquivo')
+    run.add_argument('--github-output', help='Acrescenta as saídas CHAVE=valor neste arquivo')
+    run.add_argument('--quantum-code', help="Código para a etapa 'manifestation'")
+    run.add_argument('--encrypted-data', help="Dados criptografados para a etapa 'manifestation'")
+
+    jitter = commands.add_parser('stream-jitter', help='Mede o jitter do fluxo theta em tempo real (relógio simulado)')
+    jitter.add_argument('--block', type=int, default=512, help='Quadros por bloco (256-1024)')
+    jitter.add_argument('--blocks', type=int, default=2000)
+    jitter.add_argument('--beat-change', type=float, default=6.0,
+                        help='Novo batimento aplicado na metade da sessão (0 desativa)')
+
+    budget = commands.add_parser('import-budget', help='Verifica o custo de importar este módulo')
+    budget.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    budget.add_argument('--attempts', type=int, default=3,
+                        help='Medidas no máximo; vale a mais rápida (absorve ruído da máquina)')
+    budget.add_argument('--report-only', action='store_true',
+                        help='Apenas informa o tempo medido, sem falhar acima do orçamento')
+
+    args = parser.parse_args(argv)
+    if args.command == 'lunar':
+        outputs, _ = PipelineRunner(now=_parse_now(args.now)).stage_lunar()
+        if args.github_output:
+            _write_github_output(args.github_output, outputs)
+        _print_json(outputs)
+    elif args.command == 'numerology':
+        _print_json(QuantumManifestationEngine().calculate_advanced_numerology(args.name, args.birth_date))
+    elif args.command == 'code':
+        engine = QuantumManifestationEngine()
+        _print_json({'quantum_code': engine.generate_quantum_code(args.intention, args.name, args.birth_date,
+                                                                  now=_parse_now(args.now))})
+    elif args.command == 'geometry':
+        with _open_sink(args.output_dir, args.bundle) as sink:
+            runner = PipelineRunner(sink=sink, size=(args.size, args.size), visual_format=args.format)
+            _, files = runner.stage_radionic([name.strip() for name in args.patterns.split(',') if name.strip()])
+        _print_json({'files': files})
+    elif args.command == 'audio':
+        generator = AudioFrequencyGenerator()
+        output = args.output or f'{args.kind}.wav'
+        if args.kind == 'energy':
+            audio_data = generator.generate_energy_mix(energy_frequencies(_parse_now(args.now)), args.duration)
+        elif args.kind == 'solfeggio':
+            audio_data = generator.generate_solfeggio_sequence(args.duration)
+        elif args.kind == 'binaural':
+            audio_data = generator.generate_binaural_beats(duration=args.duration, stereo=True)
+        elif args.kind == 'theta':
+            audio_data = GnosticStateInducer(generator).generate_theta_state_audio(args.duration, stereo=True)
+        else:
+            audio_data = generator.generate_scalar_waves(SCALAR_TESLA_PAIRS, args.duration)
+        generator.save_audio_wav(audio_data, output, sample_format=args.sample_format)
+        _print_json({'files': [output]})
+    elif args.command == 'pipeline':
+        build_index = BuildIndex(args.build_index) if args.build_index else None
+        try:
+            with _open_sink(args.output_dir, args.bundle) as sink:
+                result = process_manifestation_data(args.encrypted_data, args.quantum_code,
+                                                    visual_format=args.format, sink=sink, build_index=build_index)
+        finally:
+            if build_index is not None:
+                build_index.close()
+        _print_json(result)
+    elif args.command == 'run':
+        stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+        with _open_sink(args.output_dir, args.bundle) as sink:
+            runner = PipelineRunner(sink=sink, now=_parse_now(args.now), size=(args.size, args.size),
+                                    visual_format=args.format, compress_level=args.compress_level,
+                                    quantum_code=args.quantum_code, encrypted_data=args.encrypted_data)
+            manifest = runner.run(stages)
+        if args.manifest:
+            with open(args.manifest, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+        if args.github_output:
+            _write_github_output(args.github_output, manifest['outputs'])
+        _print_json(manifest)
+    elif args.command == 'stream-jitter':
+        stream = GnosticStateInducer(AudioFrequencyGenerator()).open_theta_stream(max_block=max(args.block, 1024))
+        changes = {args.blocks // 2: {'beat_freq': args.beat_change}} if args.beat_change else None
+        report = measure_stream_jitter(stream, args.block, args.blocks, changes)
+        _print_json(report)
+        return 1 if report['underruns'] or report['max_step_ratio'] > 1.01 else 0
+    elif args.command == 'import-budget':
+        if args.report_only:
+            report = measure_import_time()
+            report.update(budget_ms=args.budget_ms, within_budget=report['total_ms'] <= args.budget_ms)
+            _print_json(report)
+        else:
+            _print_json(check_import_budget(args.budget_ms, attempts=args.attempts))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
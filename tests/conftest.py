@@ -0,0 +1,9 @@
+import os
+import sys
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'modules')
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+
+# Os testes nunca baixam pantáculos: sem pacote local o pipeline usa o fallback
+os.environ.setdefault('PANTACLE_OFFLINE', '1')
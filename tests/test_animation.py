@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+import quantum_manifestation_engine as qme
+
+SIZE = (96, 96)
+FRAMES = 12
+
+@pytest.fixture(scope='module')
+def geometry():
+    return qme.SacredGeometryGenerator().merkaba_geometry(size=SIZE)
+
+def _writer(kind, path):
+    return qme.ApngStreamWriter(path, SIZE, fps=12) if kind == 'apng' else qme.GifStreamWriter(path, fps=12)
+
+@pytest.mark.parametrize('kind', ['apng', 'gif'])
+@pytest.mark.parametrize('max_workers', [0, 2])
+def test_animation_opens_with_every_frame(tmp_path, geometry, kind, max_workers):
+    path = str(tmp_path / f'merkaba.{"png" if kind == "apng" else "gif"}')
+    result = qme.render_animation(geometry, _writer(kind, path), duration=1, fps=FRAMES,
+                                  max_workers=max_workers, chunk_frames=5, max_in_flight=2)
+    assert result == path
+    with Image.open(path) as animation:
+        assert animation.format == ('PNG' if kind == 'apng' else 'GIF')
+        assert animation.n_frames == FRAMES
+        assert animation.size == SIZE
+        frames = [np.asarray(frame.convert('RGBA')) for frame in ImageSequence.Iterator(animation)]
+    assert len(frames) == FRAMES
+    # A geometria gira: o primeiro e o quarto quadros diferem
+    assert not np.array_equal(frames[0], frames[3])
+
+@pytest.mark.parametrize('kind', ['apng', 'gif'])
+def test_pool_and_inline_outputs_match(tmp_path, geometry, kind):
+    outputs = []
+    for max_workers in (0, 2):
+        path = str(tmp_path / f'{max_workers}.{kind}')
+        qme.render_animation(geometry, _writer(kind, path), duration=1, fps=FRAMES, max_workers=max_workers)
+        with open(path, 'rb') as f:
+            outputs.append(f.read())
+    assert outputs[0] == outputs[1]
+
+@pytest.mark.parametrize('kind', ['apng', 'gif'])
+def test_frame_count_mismatch_raises(tmp_path, geometry, kind):
+    writer = _writer(kind, str(tmp_path / f'curta.{kind}'))
+    frames = list(qme.GeometryAnimator(geometry, SIZE, writer.background).iter_frames(
+        np.zeros(2), np.ones(2), np.ones(2)))
+    writer.prepare([frame.copy() for frame in frames[:1]], 3)
+    encoder = writer.encoder
+    for frame in frames:
+        writer.write(encoder(frame))
+    with pytest.raises(ValueError, match='declarou 3 quadros mas recebeu 2'):
+        writer.close()
@@ -0,0 +1,57 @@
+from PIL import Image
+
+import quantum_manifestation_engine as qme
+
+def _image(color, size=(10, 10)):
+    return Image.new('RGBA', size, color)
+
+def test_lru_evicts_by_bytes_and_counts():
+    cache = qme.ArtifactCache(max_bytes=2 * 10 * 10 * 4)
+    keys = [qme.ArtifactCache.make_key('m', {'n': n}) for n in range(3)]
+    cache.put(keys[0], _image((255, 0, 0, 255)))
+    cache.put(keys[1], _image((0, 255, 0, 255)))
+    assert cache.get(keys[0]).getpixel((0, 0)) == (255, 0, 0, 255)
+    # keys[1] é o menos usado e sai para caber keys[2]
+    cache.put(keys[2], _image((0, 0, 255, 255)))
+    assert cache.get(keys[1]) is None
+    assert cache.stats() == {'hits': 1, 'disk_hits': 0, 'misses': 1, 'evictions': 1, 'entries': 2,
+                             'bytes': 2 * 400, 'max_bytes': 800}
+    # Maior que o cache inteiro: não é armazenado nem expulsa ninguém
+    cache.put(qme.ArtifactCache.make_key('m', {'n': 'grande'}), _image((0, 0, 0, 255), (20, 20)))
+    assert cache.stats()['entries'] == 2 and cache.stats()['evictions'] == 1
+
+def test_returned_images_are_copies():
+    cache = qme.ArtifactCache()
+    key = qme.ArtifactCache.make_key('m', {})
+    cache.put(key, _image((1, 2, 3, 255)))
+    cache.get(key).putpixel((0, 0), (9, 9, 9, 255))
+    assert cache.get(key).getpixel((0, 0)) == (1, 2, 3, 255)
+
+def test_disk_hit_after_clear(tmp_path):
+    cache = qme.ArtifactCache(disk_dir=str(tmp_path))
+    key = qme.ArtifactCache.make_key('generate_merkaba', {'size': [8, 8]})
+    calls = []
+    def factory():
+        calls.append(1)
+        return _image((10, 20, 30, 255))
+    cache.get_or_create(key, factory)
+    cache.clear()
+    assert cache.get_or_create(key, factory).getpixel((0, 0)) == (10, 20, 30, 255)
+    assert len(calls) == 1
+    assert cache.stats()['disk_hits'] == 1
+    # Outro processo com o mesmo diretório também aproveita
+    assert qme.ArtifactCache(disk_dir=str(tmp_path)).get(key) is not None
+
+def test_engine_change_invalidates_disk_tier(tmp_path):
+    key = qme.ArtifactCache.make_key('generate_merkaba', {'size': [8, 8]})
+    qme.ArtifactCache(disk_dir=str(tmp_path), fingerprint='motor-antigo').put(key, _image((1, 1, 1, 255)))
+    assert qme.ArtifactCache(disk_dir=str(tmp_path), fingerprint='motor-antigo').get(key) is not None
+    assert qme.ArtifactCache(disk_dir=str(tmp_path)).get(key) is None
+
+def test_generator_uses_cache():
+    cache = qme.ArtifactCache()
+    geometry = qme.SacredGeometryGenerator(cache=cache)
+    first = geometry.generate_merkaba(size=(64, 64))
+    second = geometry.generate_merkaba(size=(64, 64))
+    assert first.tobytes() == second.tobytes()
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
@@ -0,0 +1,68 @@
+import numpy as np
+
+import quantum_manifestation_engine as qme
+
+def _counting_source(values, name='fonte'):
+    calls = []
+    def factory():
+        calls.append(1)
+        return np.array(values, dtype=np.float64)
+    return qme.SourceNode(factory, name), calls
+
+def _collect(graph, node, results, key):
+    graph.sink(node, lambda array: results.__setitem__(key, array.copy()))
+
+def test_shared_source_renders_once():
+    source, calls = _counting_source([1.0, 2.0, 3.0])
+    graph = qme.AudioGraph()
+    results = {}
+    _collect(graph, source, results, 'fonte')
+    _collect(graph, qme.GainNode(source, 2.0), results, 'ganho')
+    _collect(graph, qme.MixNode(qme.GainNode(source, 0.5), qme.SliceNode(source, 0, 2)), results, 'mix')
+    graph.run()
+    assert len(calls) == 1
+    np.testing.assert_array_equal(results['fonte'], [1, 2, 3])
+    np.testing.assert_array_equal(results['ganho'], [2, 4, 6])
+    np.testing.assert_array_equal(results['mix'], [1.5, 3, 1.5])
+
+def test_unused_source_is_never_rendered():
+    used, used_calls = _counting_source([1.0])
+    unused, unused_calls = _counting_source([1.0])
+    qme.GainNode(unused, 2.0)
+    qme.AudioGraph().sink(qme.GainNode(used, 2.0), lambda array: None).run()
+    assert (len(used_calls), len(unused_calls)) == (1, 0)
+
+def test_gain_does_not_mutate_buffer_read_by_another_consumer():
+    source, _ = _counting_source([1.0, -1.0, 0.5])
+    seen = {}
+    graph = qme.AudioGraph()
+    _collect(graph, qme.GainNode(source, 10.0), seen, 'primeiro')
+    _collect(graph, qme.GainNode(source, 3.0), seen, 'segundo')
+    _collect(graph, qme.MixNode(source, source), seen, 'repetida')
+    graph.run()
+    np.testing.assert_array_equal(seen['primeiro'], [10, -10, 5])
+    np.testing.assert_array_equal(seen['segundo'], [3, -3, 1.5])
+    np.testing.assert_array_equal(seen['repetida'], [2, -2, 1])
+
+def test_sole_consumer_works_in_place():
+    buffer = np.array([1.0, 2.0])
+    outputs = []
+    qme.AudioGraph().sink(qme.GainNode(qme.SourceNode(lambda: buffer), 4.0), outputs.append).run()
+    assert outputs[0] is buffer
+    np.testing.assert_array_equal(buffer, [4, 8])
+
+def test_mix_pads_short_and_mono_inputs_to_stereo():
+    audio = qme.AudioFrequencyGenerator(sample_rate=8000)
+    pulse = audio.generate_quantum_pulse('3691-2580-7410', duration=1)
+    gnostic = qme.GnosticStateInducer(audio).generate_theta_state_audio(duration=2, stereo=True)
+    scalar = audio.generate_scalar_waves(qme.SCALAR_TESLA_PAIRS, duration=0.5)
+    mixed = []
+    combined = qme.MixNode(qme.GainNode(qme.SourceNode(lambda: pulse.copy()), 0.5),
+                           qme.GainNode(qme.SourceNode(lambda: gnostic.copy()), 0.3),
+                           qme.GainNode(qme.SourceNode(lambda: scalar.copy()), 0.2))
+    qme.AudioGraph().sink(combined, mixed.append).run()
+    expected = 0.3 * gnostic
+    expected[:len(pulse)] += 0.5 * pulse[:, None]
+    expected[:len(scalar)] += 0.2 * scalar[:, None]
+    assert mixed[0].shape == gnostic.shape
+    np.testing.assert_allclose(mixed[0], expected, rtol=0, atol=1e-12)
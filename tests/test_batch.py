@@ -0,0 +1,37 @@
+import os
+
+import quantum_manifestation_engine as qme
+
+PAIRS = [('dados-a', '1111-2222-3333'), ('dados-b', '4444-5555-6666'), ('dados-a', '1111-2222-3333')]
+
+def test_duplicate_codes_are_processed_once(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    sink = qme.MemorySink()
+    results = qme.process_manifestation_batch(PAIRS, max_workers=0, sink=sink)
+    assert [result['quantum_code'] for result in results] == [code for _, code in PAIRS]
+    assert results[0] == results[2] and results[0] is not results[2]
+    # 5 visuais + 4 WAVs + campo quântico por código distinto, nada no diretório atual
+    assert len(sink.artifacts) == 2 * 10
+    assert os.listdir(tmp_path) == []
+
+def test_batch_matches_single_code_path(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    batch = qme.MemorySink()
+    qme.process_manifestation_batch(PAIRS[:1], max_workers=0, sink=batch)
+    single = qme.MemorySink()
+    qme.process_manifestation_data(*PAIRS[0], sink=single)
+    assert sorted(batch.artifacts) == sorted(single.artifacts)
+    for name in single.artifacts:
+        assert batch.getvalue(name) == single.getvalue(name), name
+
+def test_pool_writes_into_sink_and_reuses_build_index(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    sink = qme.DirectorySink(str(tmp_path / 'out'))
+    with qme.BuildIndex(str(tmp_path / 'build.db')) as build_index:
+        first = qme.process_manifestation_batch(PAIRS, max_workers=1, sink=sink, build_index=build_index)
+        second = qme.process_manifestation_batch(PAIRS, max_workers=1, sink=sink, build_index=build_index)
+    assert 'audio' in first[0]['build']['rebuilt']
+    assert all(not result['build']['rebuilt'] for result in second)
+    for path in first[1]['visual_artifacts'] + first[1]['audio_artifacts']:
+        assert os.path.exists(path)
+    assert sorted(os.listdir(tmp_path)) == ['build.db', 'out']
@@ -0,0 +1,37 @@
+import os
+
+import quantum_manifestation_engine as qme
+
+CODE = '3691-2580-7410'
+
+def _run(tmp_path, build_index):
+    return qme.process_manifestation_data('dados', CODE, sink=qme.DirectorySink(str(tmp_path / 'out')),
+                                          build_index=build_index)
+
+def test_second_run_skips_unchanged_stages(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with qme.BuildIndex(str(tmp_path / 'build.db')) as build_index:
+        first = _run(tmp_path, build_index)
+        assert first['build']['reused'] == []
+        stat = {path: os.stat(path).st_mtime_ns for path in first['audio_artifacts']}
+        second = _run(tmp_path, build_index)
+    assert second['build']['rebuilt'] == []
+    assert sorted(second['build']['reused']) == sorted(first['build']['rebuilt'])
+    assert {path: os.stat(path).st_mtime_ns for path in second['audio_artifacts']} == stat
+
+def test_missing_output_rebuilds_only_its_stage(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with qme.BuildIndex(str(tmp_path / 'build.db')) as build_index:
+        first = _run(tmp_path, build_index)
+        os.remove(first['visual_artifacts'][-1])
+        os.remove(first['visual_artifacts'][0])
+        second = _run(tmp_path, build_index)
+    assert sorted(second['build']['rebuilt']) == ['flower_of_life_3691_2580_7410.png', 'quantum_field']
+    assert all(os.path.exists(path) for path in second['visual_artifacts'])
+
+def test_engine_fingerprint_change_rebuilds_everything(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with qme.BuildIndex(str(tmp_path / 'build.db'), fingerprint='a') as build_index:
+        _run(tmp_path, build_index)
+    with qme.BuildIndex(str(tmp_path / 'build.db'), fingerprint='b') as build_index:
+        assert _run(tmp_path, build_index)['build']['reused'] == []
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+import quantum_manifestation_engine as qme
+
+CODE = '3691-2580-7410'
+DATA = {'intent': 'Abundância e saúde', 'name': 'José Ñuñez', 'birthDate': '15/08/1990',
+        'notes': ['linha'] * 500, 'emoji': '🌌'}
+
+def test_round_trip_with_ensure_ascii():
+    engine = qme.QuantumManifestationEngine()
+    encrypted = engine.encrypt_manifestation_data(DATA, CODE, ensure_ascii=True)
+    assert engine.decrypt_manifestation_data(encrypted, CODE) == DATA
+
+@pytest.mark.parametrize('ensure_ascii', [False, True])
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 65536])
+def test_streaming_encrypt_equals_whole_buffer(ensure_ascii, chunk_size):
+    engine = qme.QuantumManifestationEngine()
+    whole = engine.encrypt_manifestation_data(DATA, CODE, ensure_ascii)
+    chunks = list(engine.iter_encrypt_manifestation_data(DATA, CODE, ensure_ascii, chunk_size))
+    assert ''.join(chunks) == whole
+
+@pytest.mark.parametrize('piece', [1, 3, 5, 1000])
+def test_streaming_decrypt_equals_whole_buffer(piece):
+    engine = qme.QuantumManifestationEngine()
+    encrypted = engine.encrypt_manifestation_data(DATA, CODE, ensure_ascii=True)
+    pieces = [encrypted[i:i + piece] for i in range(0, len(encrypted), piece)]
+    text = ''.join(engine.iter_decrypt_manifestation_data(pieces, CODE))
+    assert json.loads(text) == engine.decrypt_manifestation_data(encrypted, CODE) == DATA
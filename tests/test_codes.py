@@ -0,0 +1,31 @@
+import datetime
+
+import pytest
+
+import quantum_manifestation_engine as qme
+
+NOW = datetime.datetime(2024, 3, 21, 12, 0, 0)
+ITEMS = [('Paz', 'Maria', '15/08/1990'), ('Paz', 'Maria', '15/08/1990'), ('Saúde', 'João', '01/01/2000')]
+
+def _minter(path):
+    return qme.QuantumCodeMinter(clock=lambda: NOW, index=qme.CodeIndex(path))
+
+def test_codes_are_unique_across_reopened_index(tmp_path):
+    path = str(tmp_path / 'codes.log')
+    first = _minter(path).mint_batch(ITEMS)
+    # Mesmo relógio e mesmos pedidos: só o índice reaberto evita a repetição
+    reopened = _minter(path)
+    second = reopened.mint_batch(ITEMS)
+    codes = first + second
+    assert len(set(codes)) == len(codes)
+    assert reopened.collisions >= len(ITEMS)
+    assert len(qme.CodeIndex(path)) == len(codes)
+
+def test_index_is_flushed_when_batch_fails(tmp_path):
+    path = str(tmp_path / 'codes.log')
+    minter = _minter(path)
+    minter.max_attempts = 0
+    # O segundo pedido repete o primeiro e esgota as tentativas
+    with pytest.raises(RuntimeError):
+        minter.mint_batch(ITEMS)
+    assert len(qme.CodeIndex(path)) == 1
@@ -0,0 +1,66 @@
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+import quantum_manifestation_engine as qme
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+SVG_TAGS = {'ellipse': 'ellipse', 'polygon': 'polygon', 'line': 'polyline'}
+GEOMETRIES = ['flower_of_life', 'merkaba', 'sri_yantra', 'metatron_star', 'torus']
+
+@pytest.fixture(scope='module')
+def generator():
+    return qme.SacredGeometryGenerator()
+
+def _geometry(generator, name, size=(200, 200)):
+    return getattr(generator, f'{name}_geometry')(size)
+
+@pytest.mark.parametrize('name', GEOMETRIES)
+def test_svg_is_well_formed_with_one_element_per_primitive(generator, name):
+    description = _geometry(generator, name)
+    root = ET.fromstring(description.to_svg())
+    assert root.tag == f'{SVG_NS}svg'
+    assert root.get('viewBox') == '0 0 200 200'
+    assert (root.get('width'), root.get('height')) == ('200', '200')
+    tags = [child.tag for child in root]
+    expected = [f'{SVG_NS}{SVG_TAGS[kind]}' for kind, *_ in description.primitives]
+    assert description.primitives
+    assert tags == expected
+
+def test_svg_size_changes_only_width_and_height(generator, tmp_path):
+    description = _geometry(generator, 'merkaba')
+    root = ET.fromstring(description.to_svg((640, 480)))
+    assert (root.get('width'), root.get('height')) == ('640', '480')
+    assert root.get('viewBox') == '0 0 200 200'
+    path = description.save_svg(str(tmp_path / 'merkaba.svg'))
+    assert len(ET.parse(path).getroot()) == len(description.primitives)
+
+def test_svg_background_adds_a_rect_before_the_primitives():
+    description = qme.GeometryDescription((10, 10), background=(0, 0, 0, 128))
+    description.ellipse([1, 1, 9, 9], fill=(255, 0, 0))
+    description.line([0, 0, 10, 10], fill=(0, 255, 0), width=2)
+    root = ET.fromstring(description.to_svg())
+    assert [child.tag for child in root] == [f'{SVG_NS}rect', f'{SVG_NS}ellipse', f'{SVG_NS}polyline']
+    assert root[0].get('fill-opacity') is not None
+    assert root[2].get('stroke') == '#00ff00' and root[2].get('fill') == 'none'
+
+@pytest.mark.parametrize('name', GEOMETRIES)
+def test_rasterize_scales_consistently(generator, name):
+    description = _geometry(generator, name)
+    small = description.rasterize((200, 200))
+    large = description.rasterize((400, 400))
+    assert small.size == (200, 200) and large.size == (400, 400)
+    # A caixa envolvente dobra (a menos do arredondamento dos traços)
+    for a, b in zip(small.getbbox(), large.getbbox()):
+        assert abs(2 * a - b) <= 2
+    # A fração de pixels cobertos é praticamente a mesma nos dois tamanhos
+    coverage_small = (np.asarray(small)[..., 3] > 0).mean()
+    coverage_large = (np.asarray(large)[..., 3] > 0).mean()
+    assert coverage_small > 0
+    assert abs(coverage_large - coverage_small) / coverage_small < 0.1
+
+def test_rasterize_at_reference_size_is_the_default(generator):
+    description = _geometry(generator, 'torus')
+    assert np.array_equal(np.asarray(description.rasterize()),
+                          np.asarray(description.rasterize((200, 200))))
@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import quantum_manifestation_engine as qme
+
+def test_bare_import_fits_the_budget():
+    report = qme.check_import_budget(attempts=5)
+    assert report['total_ms'] <= qme.IMPORT_BUDGET_MS
+
+def test_over_budget_import_fails():
+    with pytest.raises(RuntimeError, match='orçamento'):
+        qme.check_import_budget(budget_ms=0.001, attempts=2)
+
+def test_bare_import_does_not_load_heavy_backends():
+    code = ('import sys, quantum_manifestation_engine; '
+            'print(sorted(m for m in ("numpy", "PIL", "matplotlib", "requests") if m in sys.modules))')
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                               cwd=os.path.dirname(os.path.abspath(qme.__file__)))
+    assert completed.stdout.strip() == '[]'
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import manifestation_intake as intake
+
+NOW = '2024-03-21T12:00:00'
+
+class Interrupted(Exception):
+    pass
+
+@pytest.fixture
+def requests_file(tmp_path):
+    path = tmp_path / 'pedidos.jsonl'
+    lines = [json.dumps({'id': f'r{i}', 'intent': 'Paz', 'name': f'Pessoa {i % 2}', 'birthDate': '15/08/1990'})
+             for i in range(6)]
+    lines.insert(3, '{ não é json')
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+def _run(requests_file, tmp_path, tag):
+    output = str(tmp_path / f'{tag}.jsonl')
+    intake.run_intake(requests_file, output, output_dir=str(tmp_path / tag), max_workers=0, checkpoint_every=2,
+                      code_index=str(tmp_path / f'{tag}.codes'), clock=intake._parse_now(NOW), verbose=False)
+    with open(output, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def _summary(results):
+    return [(result['offset'], result['id'], result['status'], result.get('quantum_code')) for result in results]
+
+def test_resume_matches_clean_run(monkeypatch, requests_file, tmp_path):
+    clean = _run(requests_file, tmp_path, 'clean')
+    iter_lines = intake.iter_lines
+    def crashing_lines(path, offset=0):
+        for count, line in enumerate(iter_lines(path, offset)):
+            if count == 5:
+                raise Interrupted
+            yield line
+    monkeypatch.setattr(intake, 'iter_lines', crashing_lines)
+    with pytest.raises(Interrupted):
+        _run(requests_file, tmp_path, 'resumed')
+    checkpoint = intake.IntakeCheckpoint(str(tmp_path / 'resumed.jsonl.checkpoint')).state
+    # O último pedido preparado ficou além do checkpoint, com o código já gravado
+    assert checkpoint['minted']
+    monkeypatch.setattr(intake, 'iter_lines', iter_lines)
+    resumed = _run(requests_file, tmp_path, 'resumed')
+    assert _summary(resumed) == _summary(clean)
+    assert [result['status'] for result in clean].count('failed') == 1
+    assert intake.IntakeCheckpoint(str(tmp_path / 'resumed.jsonl.checkpoint')).state['minted'] == {}
+
+def test_limit_processes_in_slices(requests_file, tmp_path):
+    output = str(tmp_path / 'sliced.jsonl')
+    kwargs = dict(output_dir=str(tmp_path / 'sliced'), max_workers=0, clock=intake._parse_now(NOW), verbose=False)
+    first = intake.run_intake(requests_file, output, limit=4, **kwargs)
+    assert first['done'] + first['failed'] == 4
+    final = intake.run_intake(requests_file, output, **kwargs)
+    assert (final['done'], final['failed']) == (6, 1)
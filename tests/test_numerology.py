@@ -0,0 +1,24 @@
+import quantum_manifestation_engine as qme
+
+ROWS = [
+    ('Maria Silva', '15/08/1990'),
+    ('José da Conceição', '01/01/2000'),
+    ('ÂNGELA ÑUÑEZ', '1985-12-31'),
+    ('', '29/02/1996'),
+    ('Ana', 'data inválida'),
+    ('Maria Silva', '15/08/1990'),
+]
+
+def test_bulk_equals_scalar():
+    engine = qme.QuantumManifestationEngine()
+    bulk = engine.calculate_numerology_bulk(ROWS)
+    for i, (name, birth_date) in enumerate(ROWS):
+        scalar = engine.calculate_advanced_numerology(name, birth_date)
+        assert set(bulk) == set(scalar)
+        assert {key: int(values[i]) for key, values in bulk.items()} == scalar, (name, birth_date)
+
+def test_bulk_accepts_iterators():
+    engine = qme.QuantumManifestationEngine()
+    from_list = engine.calculate_numerology_bulk(ROWS)
+    from_iter = engine.calculate_numerology_bulk(iter(ROWS))
+    assert all((from_list[key] == from_iter[key]).all() for key in from_list)
@@ -0,0 +1,64 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import quantum_manifestation_engine as qme
+
+SAMPLE_RATE = 44100
+STEP = 1 / SAMPLE_RATE
+PARTIALS = [(963, 0.5, 0.3), (396, 0.3, 1.0), (528.5, 0.2, -np.pi / 2)]
+
+def _direct(start, count, dtype):
+    t = np.arange(start, start + count, dtype=np.float64) * STEP
+    return sum(a * np.sin(2 * np.pi * f * t + phase) for f, a, phase in PARTIALS).astype(dtype)
+
+# Tolerâncias documentadas em OscillatorBank
+@pytest.mark.parametrize('dtype, seconds, tolerance', [
+    ('float64', 0, 1e-9), ('float64', 14 * 60, 1e-9), ('float64', 3500, 1e-8), ('float64', 7000, 1e-8),
+    ('float32', 0, 1e-5), ('float32', 3500, 1e-5),
+])
+def test_render_matches_direct_sin(dtype, seconds, tolerance):
+    bank = qme.OscillatorBank(dtype=dtype)
+    start = seconds * SAMPLE_RATE + 123
+    rendered = bank.render(PARTIALS, STEP, start, 50000)
+    assert rendered.dtype == np.dtype(dtype)
+    assert np.max(np.abs(rendered - _direct(start, 50000, dtype))) < tolerance
+
+def test_long_stream_is_bounded_by_the_segment():
+    bank = qme.OscillatorBank()
+    segment = 65536
+    late_start = 3600 * SAMPLE_RATE
+    bank.render(PARTIALS[:1], STEP, 0, segment)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        bank.render(PARTIALS[:1], STEP, late_start, segment)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Uma hora depois do início o segmento custa o mesmo que o primeiro
+    assert peak - baseline < 3 * segment * 8
+    assert all(len(table) == bank.block_size for table in bank._tables.values())
+
+def test_segments_equal_single_render():
+    bank = qme.OscillatorBank(block_size=256)
+    whole = bank.render(PARTIALS, STEP, 1000, 5000)
+    pieces = [bank.render(PARTIALS, STEP, 1000 + start, 700) for start in range(0, 5000, 700)]
+    np.testing.assert_allclose(np.concatenate(pieces)[:5000], whole, atol=1e-12)
+
+def test_table_cache_is_lru_bounded():
+    bank = qme.OscillatorBank(block_size=64, max_tables=2)
+    for frequency in (100, 200, 100, 300):
+        bank.render([(frequency, 1.0, 0.0)], STEP, 0, 64)
+    assert list(bank._tables) == [(100, STEP), (300, STEP)]
+
+@pytest.mark.parametrize('dtype, tolerance', [('float64', 1e-9), ('float32', 1e-5)])
+def test_streamed_generators_match_whole_buffer(dtype, tolerance):
+    audio = qme.AudioFrequencyGenerator(dtype=dtype)
+    solfeggio = np.concatenate(list(audio.iter_solfeggio_sequence(duration=3, block_size=10000)))
+    np.testing.assert_allclose(solfeggio, audio.generate_solfeggio_sequence(duration=3), rtol=0, atol=tolerance)
+    pulse = np.concatenate(list(audio.iter_quantum_pulse('3691-2580-7410', duration=3, block_size=7777)))
+    np.testing.assert_allclose(pulse, audio.generate_quantum_pulse('3691-2580-7410', duration=3),
+                               rtol=0, atol=tolerance)
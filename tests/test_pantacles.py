@@ -0,0 +1,64 @@
+import http.server
+import threading
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import quantum_manifestation_engine as qme
+
+@pytest.fixture
+def pantacle_server():
+    """Servidor HTTP local no lugar do host dos pantáculos; conta os downloads"""
+    buffer = BytesIO()
+    Image.new('RGBA', (32, 32), (200, 160, 40, 255)).save(buffer, format='PNG')
+    png = buffer.getvalue()
+    hits = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if self.path != '/abundance.png':
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(png)))
+            self.end_headers()
+            self.wfile.write(png)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', hits
+    server.shutdown()
+    server.server_close()
+
+def test_fetches_once_then_serves_from_cache(pantacle_server, tmp_path):
+    base_url, hits = pantacle_server
+    urls = {'abundance': f'{base_url}/abundance.png'}
+    store = qme.PantacleStore(cache_dir=str(tmp_path), urls=urls)
+    image = store.get_image('abundance', size=(64, 64))
+    assert image.size == (64, 64) and image.mode == 'RGBA'
+    store.get_image('abundance', size=(48, 48))
+    assert hits == ['/abundance.png']
+    assert (tmp_path / 'abundance.png').exists() and (tmp_path / 'abundance_64x64.png').exists()
+    # Um novo processo offline reaproveita o cache sem tocar na rede
+    offline = qme.PantacleStore(cache_dir=str(tmp_path), urls=urls, offline=True)
+    assert offline.get_image('abundance', size=(64, 64)).size == (64, 64)
+    assert offline.load_source('abundance')[1] == 'png'
+    assert hits == ['/abundance.png']
+
+def test_prefetch_reports_failures(pantacle_server, tmp_path):
+    base_url, _ = pantacle_server
+    store = qme.PantacleStore(cache_dir=str(tmp_path), urls={'abundance': f'{base_url}/abundance.png',
+                                                             'protection': f'{base_url}/missing.png'})
+    assert store.prefetch() == {'abundance': True, 'protection': False}
+
+def test_offline_without_bundle_raises(tmp_path):
+    store = qme.PantacleStore(cache_dir=str(tmp_path), offline=True)
+    with pytest.raises(FileNotFoundError):
+        store.load_source('abundance')
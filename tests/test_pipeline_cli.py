@@ -0,0 +1,65 @@
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import quantum_manifestation_engine as qme
+
+NOW = '2024-03-21T12:00:00'
+
+def _expected_outputs():
+    now = datetime.datetime.fromisoformat(NOW)
+    degrees = qme.QuantumManifestationEngine().calculate_lunar_phase(now)
+    tesla = qme.tesla_numbers(now)
+    return {'LUNAR_PHASE': qme.lunar_phase_name(degrees), 'LUNAR_DEGREES': f'{degrees:.1f}',
+            'TESLA_MATRIX': str(tesla['matrix']), 'TESLA_SUM': str(tesla['sum']),
+            'SCALAR_RESONANCE': str(tesla['scalar_resonance']), 'FIB_15': str(tesla['fib_15'])}
+
+def _read_github_output(path):
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert all('=' in line for line in lines)
+    return dict(line.split('=', 1) for line in lines)
+
+def _check_manifest(path):
+    manifest = json.loads(path.read_text(encoding='utf-8'))
+    assert list(manifest['stages']) == ['lunar', 'tesla']
+    assert manifest['now'] == NOW
+    assert manifest['files'] == []
+    assert {key: str(value) for key, value in manifest['outputs'].items()} == _expected_outputs()
+    for stage in manifest['stages'].values():
+        assert stage['files'] == [] and stage['duration_s'] >= 0
+    return manifest
+
+def test_run_subcommand_mirrors_the_workflow_step(tmp_path):
+    """Mesmo comando do passo 'pipeline' do workflow, num subprocesso com PYTHONPATH=modules"""
+    github_output = tmp_path / 'github_output'
+    github_output.write_text('EARLIER=kept\n', encoding='utf-8')
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(qme.__file__)), PANTACLE_OFFLINE='1')
+    completed = subprocess.run([sys.executable, '-m', 'quantum_manifestation_engine', 'run',
+                                '--stages', 'lunar,tesla', '--now', NOW,
+                                '--github-output', str(github_output), '--manifest', 'manifest.json'],
+                               capture_output=True, text=True, cwd=tmp_path, env=env)
+    assert completed.returncode == 0, completed.stderr
+    outputs = _read_github_output(github_output)
+    # O arquivo do GITHUB_OUTPUT é acrescido, nunca sobrescrito
+    assert outputs.pop('EARLIER') == 'kept'
+    assert outputs == _expected_outputs()
+    manifest = _check_manifest(tmp_path / 'manifest.json')
+    assert json.loads(completed.stdout) == manifest
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['github_output', 'manifest.json']
+
+def test_run_subcommand_in_process(tmp_path, capsys):
+    github_output = tmp_path / 'github_output'
+    assert qme.main(['run', '--stages', 'lunar, tesla', '--now', NOW, '--output-dir', str(tmp_path),
+                     '--github-output', str(github_output), '--manifest', str(tmp_path / 'manifest.json')]) == 0
+    assert _read_github_output(github_output) == _expected_outputs()
+    assert json.loads(capsys.readouterr().out) == _check_manifest(tmp_path / 'manifest.json')
+
+def test_run_rejects_unknown_stages(tmp_path):
+    with pytest.raises(ValueError, match='desconhecidas: moon'):
+        qme.main(['run', '--stages', 'lunar,moon', '--output-dir', str(tmp_path),
+                  '--github-output', str(tmp_path / 'github_output')])
+    assert not (tmp_path / 'github_output').exists()
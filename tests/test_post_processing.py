@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+import quantum_manifestation_engine as qme
+
+def _random_image(seed=3, size=(23, 17)):
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 256, (size[1], size[0], 4), dtype=np.uint8)
+    # Valores exatamente no limiar e logo acima, para testar a borda
+    arr[0, :, :3] = 200
+    arr[1, :, :3] = 201
+    arr[2, :, :3] = (201, 201, 200)
+    arr[3, :, :3] = 255
+    return Image.fromarray(arr, 'RGBA')
+
+def _loop_white_key(img):
+    """Laço por pixel original de generate_pantacle"""
+    img = img.copy()
+    pixels = img.load()
+    for y in range(img.height):
+        for x in range(img.width):
+            item = pixels[x, y]
+            if len(item) >= 3 and item[0] > 200 and item[1] > 200 and item[2] > 200:
+                pixels[x, y] = (255, 255, 255, 0)
+    return img
+
+def _loop_chroma_key(img, color, tolerance, replace):
+    img = img.copy()
+    pixels = img.load()
+    for y in range(img.height):
+        for x in range(img.width):
+            r, g, b, a = pixels[x, y]
+            if max(abs(r - color[0]), abs(g - color[1]), abs(b - color[2])) <= tolerance:
+                pixels[x, y] = tuple(replace or (r, g, b)) + (0,)
+    return img
+
+def test_threshold_key_matches_original_loop():
+    img = _random_image()
+    expected = np.asarray(_loop_white_key(img))
+    assert np.array_equal(np.asarray(qme.ImagePostProcessor().threshold_key(200)(img)), expected)
+    assert np.array_equal(qme.threshold_key_array(np.array(img)), expected)
+
+def test_pantacle_keying_matches_original_loop(tmp_path):
+    source = _random_image(seed=5, size=(40, 40))
+    source.save(tmp_path / 'abundance.png')
+    store = qme.PantacleStore(bundle_dir=str(tmp_path), offline=True)
+    geometry = qme.SacredGeometryGenerator(pantacle_store=store)
+    keyed = geometry.generate_pantacle('abundance', size=(32, 32))
+    expected = _loop_white_key(store.get_image('abundance', (32, 32)))
+    assert np.array_equal(np.asarray(keyed), np.asarray(expected))
+
+@pytest.mark.parametrize('replace', [None, (0, 0, 0)])
+def test_chroma_key_matches_loop(replace):
+    img = _random_image(seed=11)
+    color, tolerance = (120, 60, 200), 70
+    expected = np.asarray(_loop_chroma_key(img, color, tolerance, replace))
+    result = qme.chroma_key_array(np.array(img), color, tolerance=tolerance, replace=replace)
+    assert np.array_equal(result, expected)
+    assert (result[..., 3] == 0).any() and (result[..., 3] != 0).any()
+
+def test_feathered_key_ramps_alpha():
+    img = _random_image(seed=7)
+    arr = np.array(img)
+    result = qme.threshold_key_array(arr.copy(), threshold=200, feather=40, replace=None)
+    darkest = arr[..., :3].min(axis=2).astype(np.int64)
+    ramp = np.clip((200 - darkest + 1) / 40, 0, 1)
+    expected = np.rint(ramp * arr[..., 3])
+    assert np.max(np.abs(result[..., 3] - expected)) <= 1
+    assert np.array_equal(result[..., :3], arr[..., :3])
+    assert (result[darkest > 200, 3] == 0).all()
+
+def test_tint_matches_per_pixel_blend():
+    img = _random_image(seed=13)
+    arr = np.array(img)
+    result = qme.tint_array(arr.copy(), (255, 215, 0), 0.3)
+    expected = [[tuple(round(c * 0.7 + t * 0.3) for c, t in zip(pixel[:3], (255, 215, 0))) for pixel in row]
+                for row in arr.tolist()]
+    assert np.max(np.abs(result[..., :3].astype(int) - np.array(expected))) <= 1
+    assert np.array_equal(result[..., 3], arr[..., 3])
+
+def test_composite_matches_pillow_alpha_composite():
+    base, top = _random_image(seed=17), _random_image(seed=19)
+    result = np.asarray(qme.composite_layers([base, top])).astype(int)
+    expected = np.asarray(Image.alpha_composite(base, top)).astype(int)
+    assert np.max(np.abs(result - expected)) <= 1
+
+def test_composite_opacity_and_validation():
+    opaque = Image.new('RGBA', (4, 4), (200, 0, 0, 255))
+    blue = Image.new('RGBA', (4, 4), (0, 0, 200, 255))
+    assert qme.composite_layers([opaque, blue], [1.0, 0.5]).getpixel((0, 0)) == (100, 0, 100, 255)
+    with pytest.raises(ValueError):
+        qme.composite_layers([])
+    with pytest.raises(ValueError):
+        qme.composite_layers([opaque, Image.new('RGBA', (5, 4))])
+
+def test_processor_chain_equals_steps():
+    img = _random_image(seed=23)
+    chained = qme.ImagePostProcessor().threshold_key(180, feather=10).tint((0, 128, 255), 0.25)(img)
+    manual = qme.tint_array(qme.threshold_key_array(np.array(img), 180, feather=10), (0, 128, 255), 0.25)
+    assert np.array_equal(np.asarray(chained), manual)
+    assert qme.ImagePostProcessor()(img) is img
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+import manifestation_server as ms
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+async def _post_raw(port, body):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'POST /jobs HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n' % len(body) + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    writer.close()
+    return status
+
+async def _wait_finished(job):
+    while job.status not in ms.TERMINAL_STATUSES:
+        await asyncio.sleep(0.05)
+
+@pytest.mark.parametrize('body', [b'[]', b'"x"', b'42', b'null', b'{', b'{}',
+                                  b'{"quantum_code": 1, "encrypted_data": "x"}',
+                                  b'{"quantum_code": "1111-2222-3333", "encrypted_data": null}',
+                                  b'{"quantum_code": "", "encrypted_data": "x"}',
+                                  b'{"quantum_code": "1-2", "encrypted_data": "x"}',
+                                  b'{"quantum_code": "../../etc/passwd", "encrypted_data": "x"}',
+                                  b'{"quantum_code": "1111/2222-3333", "encrypted_data": "x"}',
+                                  b'{"quantum_code": "1111-2222-3333\\n", "encrypted_data": "x"}',
+                                  '{"quantum_code": "١١١١-٢٢٢٢-٣٣٣٣", "encrypted_data": "x"}'.encode(),
+                                  b'{"quantum_code": "1111-2222-3333", "encrypted_data": "x", "visual_format": "gif"}'])
+def test_bad_bodies_return_400(tmp_path, body):
+    async def scenario():
+        server = await ms.ManifestationJobServer(1, 2, str(tmp_path)).start(port=0)
+        try:
+            return await _post_raw(server.addresses[0][1], body), server.health()['jobs']
+        finally:
+            await server.drain()
+    assert _run(scenario()) == (400, 0)
+
+def test_finished_jobs_are_evicted(tmp_path):
+    async def scenario():
+        server = await ms.ManifestationJobServer(1, 4, str(tmp_path), finished_ttl=3600,
+                                                 max_finished=1).start()
+        try:
+            first, _ = server.submit('1111-2222-3333', 'dados')
+            await _wait_finished(first)
+            assert server.submit('1111-2222-3333', 'dados') == (first, True)
+            second, _ = server.submit('4444-5555-6666', 'dados')
+            await _wait_finished(second)
+            # Só cabe um job concluído: o mais antigo sai e o código pode rodar de novo
+            assert list(server.jobs) == ['4444-5555-6666']
+            again, deduplicated = server.submit('1111-2222-3333', 'dados')
+            assert again is not first and not deduplicated
+            await _wait_finished(again)
+            server.finished_ttl = 0
+            server._evict_finished()
+            assert server.jobs == {}
+        finally:
+            await server.drain()
+    _run(scenario())
+
+def test_fake_feed_deduplicates_repeated_codes(tmp_path):
+    async def scenario():
+        server = await ms.ManifestationJobServer(1, 8, str(tmp_path)).start(port=0)
+        try:
+            client = ms.ManifestationClient(port=server.addresses[0][1])
+            issues = list(ms.FakeIssueFeed(count=3, duplicate_every=3).issues())
+            last_events = await ms.feed_issues(client, issues)
+            return issues, last_events, server.health()
+        finally:
+            await server.drain()
+    issues, last_events, health = _run(scenario())
+    assert [event['status'] for event in last_events] == ['done'] * 3
+    assert last_events[2]['job'] == last_events[1]['job']
+    assert health['jobs'] == 2
+    assert sorted(path.name for path in tmp_path.iterdir() if path.name.startswith('quantum_field_')) == \
+        sorted(f"quantum_field_{event['job'].replace('-', '_')}.png" for event in last_events[:2])
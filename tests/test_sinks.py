@@ -0,0 +1,84 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+import quantum_manifestation_engine as qme
+
+CODE = '3691-2580-7410'
+EXPECTED = sorted(
+    [f'{name}_3691_2580_7410.png' for name in ('flower_of_life', 'merkaba', 'sri_yantra', 'metatron_star',
+                                               'pantacle_abundance', 'quantum_field')]
+    + [f'{name}_3691_2580_7410.wav' for name in ('quantum_pulse', 'gnostic_induction', 'scalar_tesla',
+                                                 'combined_manifestation')])
+
+class _Pipe(io.RawIOBase):
+    """Destino só de escrita e sem seek, como um pipe ou um socket"""
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def getvalue(self):
+        return b''.join(self.chunks)
+
+@pytest.fixture(scope='module')
+def reference():
+    """Artefatos de referência gerados num MemorySink"""
+    sink = qme.MemorySink()
+    qme.process_manifestation_data('dados', CODE, sink=sink)
+    return {name: sink.getvalue(name) for name in sink.artifacts}
+
+def _check(sink, members, reference):
+    assert sorted(members) == EXPECTED == sorted(reference)
+    assert sink.sizes == {name: len(data) for name, data in members.items()}
+    assert members == reference
+
+def test_zip_sink_on_path(tmp_path, reference):
+    path = tmp_path / 'bundle.zip'
+    with qme.ZipSink(str(path)) as sink:
+        result = qme.process_manifestation_data('dados', CODE, sink=sink)
+    assert result['visual_artifacts'][0] == f'{path}:flower_of_life_3691_2580_7410.png'
+    with zipfile.ZipFile(path) as bundle:
+        assert bundle.testzip() is None
+        _check(sink, {name: bundle.read(name) for name in bundle.namelist()}, reference)
+
+def test_zip_sink_on_unseekable_stream(reference):
+    pipe = _Pipe()
+    with qme.ZipSink(pipe, compression=zipfile.ZIP_DEFLATED) as sink:
+        qme.process_manifestation_data('dados', CODE, sink=sink)
+    with zipfile.ZipFile(io.BytesIO(pipe.getvalue())) as bundle:
+        _check(sink, {name: bundle.read(name) for name in bundle.namelist()}, reference)
+
+@pytest.mark.parametrize('mode', ['w|', 'w|gz'])
+def test_tar_sink_streaming(mode, reference):
+    pipe = _Pipe()
+    with qme.TarSink(pipe, mode=mode, spool_bytes=64 * 1024) as sink:
+        result = qme.process_manifestation_data('dados', CODE, sink=sink)
+    assert result['audio_artifacts'][0] == 'bundle.tar:quantum_pulse_3691_2580_7410.wav'
+    with tarfile.open(fileobj=io.BytesIO(pipe.getvalue()), mode='r:*') as bundle:
+        members = {member.name: bundle.extractfile(member).read() for member in bundle.getmembers()}
+    _check(sink, members, reference)
+
+def test_directory_sink_sizes_match_files(tmp_path, reference):
+    sink = qme.DirectorySink(str(tmp_path / 'out'))
+    qme.process_manifestation_data('dados', CODE, sink=sink)
+    members = {name: (tmp_path / 'out' / name).read_bytes() for name in os.listdir(tmp_path / 'out')}
+    _check(sink, members, reference)
+    assert all(sink.stored_size(name) == len(data) for name, data in members.items())
+
+def test_sink_file_counts_bytes():
+    sink = qme.MemorySink()
+    with sink.open('a.bin') as f:
+        f.write(b'abc')
+        f.write(memoryview(b'defgh'))
+        assert f.bytes_written == 8
+    assert sink.sizes == {'a.bin': 8} and sink.getvalue('a.bin') == b'abcdefgh'
+    assert sink.write_bytes('b.bin', b'xy') == 2 and sink.sizes['b.bin'] == 2
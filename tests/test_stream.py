@@ -0,0 +1,31 @@
+import tracemalloc
+
+import quantum_manifestation_engine as qme
+
+def test_parameter_changes_do_not_click():
+    stream = qme.BinauralStream(base_freq=200, beat_freq=4, gain=0.5)
+    report = qme.measure_stream_jitter(stream, block_frames=256, blocks=200, warmup=8, alloc_blocks=32,
+                                       changes={40: {'beat_freq': 10}, 80: {'base_freq': 432, 'gain': 0.8},
+                                                81: {'gain': 0.2}})
+    assert report['max_step_ratio'] <= 1.01
+    # Nenhum array por bloco: o pico fica muito abaixo do tamanho de um bloco em float32
+    assert report['alloc_peak_bytes'] < 256 * 2 * 4
+
+def test_ramp_ends_on_its_own_target():
+    stream = qme.BinauralStream(base_freq=200, beat_freq=4, gain=0.5, ramp_s=0.01)
+    stream.set_params(beat_freq=10, gain=0.25)
+    stream.read(64)
+    # Um set_params no meio da rampa não muda o ponto final dela
+    stream._targets = (999, 999, 1.0)
+    for _ in range(10):
+        stream.read(64)
+    assert stream._omega == [stream._angular(200), stream._angular(210)]
+    assert stream._gain == 0.25
+
+def test_jitter_harness_keeps_outer_tracing():
+    tracemalloc.start()
+    try:
+        qme.measure_stream_jitter(qme.BinauralStream(), blocks=40, warmup=4, alloc_blocks=8)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
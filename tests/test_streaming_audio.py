@@ -0,0 +1,82 @@
+import io
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import quantum_manifestation_engine as qme
+
+@pytest.mark.parametrize('synthesis', ['bank', 'direct'])
+@pytest.mark.parametrize('stereo', [False, True])
+def test_binaural_blocks_are_phase_continuous(synthesis, stereo):
+    audio = qme.AudioFrequencyGenerator(synthesis=synthesis)
+    whole = audio.generate_binaural_beats(duration=2, stereo=stereo)
+    blocks = list(audio.iter_binaural_beats(duration=2, block_size=3001, stereo=stereo))
+    assert [len(block) for block in blocks[:-1]] == [3001] * (len(blocks) - 1)
+    np.testing.assert_allclose(np.concatenate(blocks), whole, rtol=0, atol=1e-9)
+
+def test_scalar_and_theta_blocks_match_whole_buffer():
+    audio = qme.AudioFrequencyGenerator()
+    whole = audio.generate_scalar_waves(qme.SCALAR_TESLA_PAIRS, duration=2)
+    blocks = np.concatenate(list(audio.iter_scalar_waves(qme.SCALAR_TESLA_PAIRS, duration=2, block_size=4096)))
+    np.testing.assert_allclose(blocks, whole, rtol=0, atol=1e-9)
+    inducer = qme.GnosticStateInducer(audio)
+    theta = np.concatenate(list(inducer.iter_theta_state_audio(duration=2, block_size=5000, stereo=True)))
+    np.testing.assert_allclose(theta, inducer.generate_theta_state_audio(duration=2, stereo=True),
+                               rtol=0, atol=1e-9)
+
+def test_streamed_wav_equals_whole_buffer_wav():
+    audio = qme.AudioFrequencyGenerator()
+    whole, streamed = io.BytesIO(), io.BytesIO()
+    audio.save_audio_wav(audio.generate_quantum_pulse('3691-2580-7410', duration=2), whole)
+    audio.save_audio_wav_stream(audio.iter_quantum_pulse('3691-2580-7410', duration=2, block_size=10000),
+                                streamed)
+    assert streamed.getvalue() == whole.getvalue()
+
+def _streamed_peak(duration, block_size):
+    audio = qme.AudioFrequencyGenerator()
+    # Aquece o banco de osciladores e o cache de fasores fora da medida
+    audio.save_audio_wav_stream(audio.iter_binaural_beats(duration=1, block_size=block_size, stereo=True),
+                                io.BytesIO())
+    target = io.BytesIO()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        audio.save_audio_wav_stream(audio.iter_binaural_beats(duration=duration, block_size=block_size,
+                                                              stereo=True), _Discard())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+class _Discard(io.RawIOBase):
+    """Destino com seek que descarta os bytes: mede só a memória da síntese"""
+    def __init__(self):
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def write(self, data):
+        size = memoryview(data).nbytes
+        self.position += size
+        return size
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=0):
+        self.position = offset
+        return offset
+
+def test_streamed_render_memory_is_bounded_by_block():
+    block_size = 4096
+    short = _streamed_peak(10, block_size)
+    long = _streamed_peak(1200, block_size)
+    # Vinte minutos de estéreo float64 teriam ~850 MB; o pico segue o bloco, não a duração
+    assert long < 64 * block_size * 8
+    assert long < 1.25 * short + 64 * 1024
@@ -0,0 +1,77 @@
+import json
+import pstats
+import threading
+
+import quantum_manifestation_engine as qme
+
+def _read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_json_lines_exporter_records_duration_bytes_and_peak(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    tracer = qme.StageTracer(qme.JsonLinesExporter(str(path)))
+    try:
+        with tracer.run('execucao', quantum_code='1-2-3'):
+            with tracer.stage('aloca', file='a.bin') as stage:
+                buffer = bytearray(2 * 1024 * 1024)
+                stage.record_bytes(len(buffer))
+                del buffer
+            with tracer.stage('grava') as stage:
+                stage.record_bytes(10)
+    finally:
+        tracer.close()
+    stage_record, write_record, run_record = _read_records(path)
+    assert (stage_record['stage'], stage_record['parent'], stage_record['attrs']) == \
+        ('aloca', 'execucao', {'file': 'a.bin'})
+    assert stage_record['duration_s'] > 0 and stage_record['cpu_s'] >= 0
+    assert stage_record['bytes_written'] == 2 * 1024 * 1024
+    assert stage_record['peak_bytes'] >= 2 * 1024 * 1024
+    assert write_record['peak_bytes'] < 1024 * 1024
+    assert run_record['parent'] is None and run_record['attrs'] == {'quantum_code': '1-2-3'}
+    assert run_record['bytes_written'] == 2 * 1024 * 1024 + 10
+    assert run_record['peak_bytes'] >= 2 * 1024 * 1024
+    assert {record['run'] for record in (stage_record, write_record, run_record)} == {run_record['run']}
+    assert all(record['error'] is None for record in (stage_record, write_record, run_record))
+
+def test_profile_file_is_written_per_run(tmp_path):
+    tracer = qme.StageTracer(track_memory=False, profile=True, profile_dir=str(tmp_path))
+    with tracer.run('perfil'):
+        sum(i * i for i in range(10000))
+    record = tracer.records[-1]
+    assert record['profile'] == str(tmp_path / f"{record['run']}.prof")
+    assert pstats.Stats(record['profile']).total_calls > 0
+
+def test_overlapping_runs_keep_their_own_id():
+    tracer = qme.StageTracer(track_memory=False)
+    barrier = threading.Barrier(2)
+    def run(name):
+        with tracer.run(name):
+            barrier.wait()
+            with tracer.stage('etapa', owner=name):
+                barrier.wait()
+    threads = [threading.Thread(target=run, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    runs = {record['stage']: record['run'] for record in tracer.records if record['parent'] is None}
+    assert runs['a'] != runs['b']
+    for record in tracer.records:
+        if record['stage'] == 'etapa':
+            assert record['run'] == runs[record['attrs']['owner']]
+
+def test_manifestation_run_is_traced():
+    tracer = qme.StageTracer()
+    try:
+        qme.process_manifestation_data('dados', '3691-2580-7410', tracer=tracer, sink=qme.MemorySink())
+    finally:
+        tracer.close()
+    stages = {record['stage'] for record in tracer.records}
+    assert {'process_manifestation_data', 'announce', 'shared_visuals', 'code_artifacts', 'audio_graph',
+            'encode_wav', 'quantum_field', 'write_png'} <= stages
+    assert len({record['run'] for record in tracer.records}) == 1
+    run_record = tracer.records[-1]
+    assert run_record['stage'] == 'process_manifestation_data'
+    assert run_record['bytes_written'] == sum(record['bytes_written'] for record in tracer.records
+                                              if record['parent'] == 'process_manifestation_data')
@@ -0,0 +1,109 @@
+import io
+import struct
+import wave
+import zipfile
+
+import numpy as np
+import pytest
+
+import quantum_manifestation_engine as qme
+
+SCALES = {'int16': 32767.0, 'int24': 8388607.0}
+
+def _read_wav(data):
+    """Lê um WAV (PCM, float ou EXTENSIBLE) em (cabeçalho fmt, chunks, amostras como float64/int)"""
+    assert data[:4] == b'RIFF' and data[8:12] == b'WAVE'
+    assert struct.unpack('<I', data[4:8])[0] == len(data) - 8
+    chunks = {}
+    pos = 12
+    while pos < len(data):
+        name, size = data[pos:pos + 4], struct.unpack('<I', data[pos + 4:pos + 8])[0]
+        chunks[name] = data[pos + 8:pos + 8 + size]
+        pos += 8 + size + (size & 1)
+    tag, channels, rate, byte_rate, block_align, bits = struct.unpack('<HHIIHH', chunks[b'fmt '][:16])
+    subtype = tag
+    if tag == qme.WavWriter.FORMAT_EXTENSIBLE:
+        cb_size, valid_bits, mask = struct.unpack('<HHI', chunks[b'fmt '][16:24])
+        assert cb_size == 22 and valid_bits == bits and len(chunks[b'fmt ']) == 40
+        subtype = struct.unpack('<I', chunks[b'fmt '][24:28])[0]
+        assert chunks[b'fmt '][28:] == qme.WavWriter.SUBFORMAT_SUFFIX
+    assert block_align == channels * bits // 8 and byte_rate == rate * block_align
+    raw = chunks[b'data']
+    if subtype == 3:
+        samples = np.frombuffer(raw, dtype='<f4')
+    elif bits == 16:
+        samples = np.frombuffer(raw, dtype='<i2')
+    else:
+        padded = np.zeros((len(raw) // 3, 4), dtype=np.uint8)
+        padded[:, 1:] = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        samples = padded.view('<i4').ravel() >> 8
+    return {'tag': tag, 'subtype': subtype, 'channels': channels, 'rate': rate, 'bits': bits,
+            'chunks': chunks}, samples.reshape(-1, channels)
+
+def _signal(frames, channels):
+    t = np.arange(frames) / 8000
+    return np.stack([0.9 * np.sin(2 * np.pi * (220 + 110 * c) * t) for c in range(channels)], axis=1)
+
+@pytest.mark.parametrize('sample_format', ['int16', 'int24', 'float32'])
+@pytest.mark.parametrize('channels', [1, 2, 6])
+def test_round_trip(sample_format, channels):
+    signal = _signal(1001, channels)
+    audio = qme.AudioFrequencyGenerator(sample_rate=8000)
+    buffer = io.BytesIO()
+    audio.save_audio_wav(signal if channels > 1 else signal[:, 0], buffer, sample_format=sample_format)
+    header, samples = _read_wav(buffer.getvalue())
+    assert (header['channels'], header['rate'], len(samples)) == (channels, 8000, 1001)
+    assert header['tag'] == (qme.WavWriter.FORMAT_EXTENSIBLE if channels > 2 or sample_format == 'int24'
+                             else header['subtype'])
+    if sample_format == 'float32':
+        assert header['subtype'] == 3
+        assert struct.unpack('<I', header['chunks'][b'fact'])[0] == 1001
+        np.testing.assert_array_equal(samples, signal.astype(np.float32))
+    else:
+        assert header['subtype'] == 1 and b'fact' not in header['chunks']
+        np.testing.assert_array_equal(samples, (signal * SCALES[sample_format]).astype(np.int64))
+
+@pytest.mark.parametrize('sample_format', ['int16', 'int24'])
+def test_dither_stays_within_bounds(sample_format):
+    signal = _signal(20000, 2)
+    signal[:100] = 1.0
+    buffer = io.BytesIO()
+    with qme.WavWriter(buffer, 8000, channels=2, sample_format=sample_format, dither=True, seed=7) as writer:
+        writer.write(signal)
+    _, samples = _read_wav(buffer.getvalue())
+    scale = SCALES[sample_format]
+    error = samples - signal * scale
+    # TPDF de ±1 LSB mais o arredondamento, saturado na escala
+    assert np.max(np.abs(error)) <= 1.5 + 1e-9
+    assert samples.max() <= scale and abs(float(np.mean(error))) < 0.05
+
+def test_stdlib_wave_reads_classic_pcm():
+    buffer = io.BytesIO()
+    qme.AudioFrequencyGenerator(sample_rate=8000).save_audio_wav(_signal(500, 2), buffer)
+    buffer.seek(0)
+    with wave.open(buffer) as reader:
+        assert (reader.getnchannels(), reader.getsampwidth(), reader.getnframes()) == (2, 2, 500)
+
+def test_streamed_blocks_into_non_seekable_zip_entry(tmp_path):
+    audio = qme.AudioFrequencyGenerator(sample_rate=8000)
+    signal = _signal(3000, 2)
+    blocks = [signal[i:i + 700] for i in range(0, 3000, 700)]
+    path = tmp_path / 'bundle.zip'
+    with qme.ZipSink(str(path)) as sink:
+        with sink.open('stream.wav') as f:
+            audio.save_audio_wav_stream(blocks, f, sample_format='float32', total_frames=3000)
+        with pytest.raises(ValueError, match='total_frames'):
+            with sink.open('sem_total.wav') as f:
+                audio.save_audio_wav_stream(blocks, f)
+    with zipfile.ZipFile(path) as bundle:
+        header, samples = _read_wav(bundle.read('stream.wav'))
+    assert struct.unpack('<I', header['chunks'][b'fact'])[0] == 3000
+    np.testing.assert_array_equal(samples, signal.astype(np.float32))
+
+def test_seekable_stream_fixes_header():
+    buffer = io.BytesIO()
+    audio = qme.AudioFrequencyGenerator(sample_rate=8000)
+    audio.save_audio_wav_stream((block for block in np.array_split(_signal(999, 6), 4)), buffer,
+                                sample_format='int24')
+    header, samples = _read_wav(buffer.getvalue())
+    assert len(samples) == 999 and header['channels'] == 6